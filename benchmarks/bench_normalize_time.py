@@ -0,0 +1,93 @@
+"""Compare the vectorized _normalize_time_to_hhmm with the previous row-wise version.
+
+Usage:
+    python -m benchmarks.bench_normalize_time --rows 10000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.utils.io_utils import _normalize_time_to_hhmm
+
+
+def _normalize_time_to_hhmm_rowwise(s: pd.Series) -> pd.Series:
+    def fix(x):
+        if x is None or pd.isna(x):
+            return pd.NA
+        t = str(x).strip()
+        if not t:
+            return pd.NA
+        parts = t.split(":")
+        if len(parts) not in (2, 3):
+            return pd.NA
+        if any(p.strip() == "" for p in parts):
+            return pd.NA
+        if not all(p.isdigit() for p in parts):
+            return pd.NA
+        hh = int(parts[0])
+        mm = int(parts[1])
+        if not (0 <= hh <= 23 and 0 <= mm <= 59):
+            return pd.NA
+        if len(parts) == 3:
+            ss = int(parts[2])
+            if not (0 <= ss <= 59):
+                return pd.NA
+            return f"{hh:02d}:{mm:02d}:{ss:02d}"
+        return f"{hh:02d}:{mm:02d}"
+
+    return s.apply(fix).astype("string")
+
+
+def make_time_series(rows: int, seed: int = 42) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    hh = rng.integers(0, 26, rows)
+    mm = rng.integers(0, 62, rows)
+    ss = rng.integers(0, 62, rows)
+
+    values = pd.Series(hh.astype(str), dtype=object) + ":" + pd.Series(mm.astype(str), dtype=object)
+    with_seconds = rng.random(rows) < 0.2
+    values[with_seconds] = values[with_seconds] + ":" + pd.Series(ss.astype(str))[with_seconds]
+
+    noise = rng.random(rows)
+    values[noise < 0.02] = None
+    values[(noise >= 0.02) & (noise < 0.03)] = "  "
+    values[(noise >= 0.03) & (noise < 0.04)] = "12:"
+    padded = (noise >= 0.04) & (noise < 0.10)
+    values[padded] = " " + values[padded] + " "
+    return values
+
+
+def _time(fn, s: pd.Series) -> tuple[float, pd.Series]:
+    start = time.perf_counter()
+    out = fn(s)
+    return time.perf_counter() - start, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-rowwise", action="store_true", help="Only time the vectorized version.")
+    args = parser.parse_args()
+
+    s = make_time_series(args.rows, seed=args.seed)
+    print(f"rows={args.rows:,}")
+
+    vec_s, vec_out = _time(_normalize_time_to_hhmm, s)
+    print(f"vectorized: {vec_s:.2f}s ({args.rows / vec_s:,.0f} rows/s)")
+
+    if args.skip_rowwise:
+        return
+
+    row_s, row_out = _time(_normalize_time_to_hhmm_rowwise, s)
+    print(f"row-wise:   {row_s:.2f}s ({args.rows / row_s:,.0f} rows/s)")
+    print(f"speedup:    {row_s / vec_s:.1f}x")
+
+    pd.testing.assert_series_equal(vec_out, row_out)
+    print("outputs identical")
+
+
+if __name__ == "__main__":
+    main()
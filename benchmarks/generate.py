@@ -0,0 +1,138 @@
+"""Deterministic generator of synthetic Bronze NYC vehicles CSVs.
+
+Usage:
+    python -m benchmarks.generate data/bronze/vehicles/bench/vehicles_raw_20260101.csv --rows 1000000
+"""
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    "UNIQUE_ID",
+    "COLLISION_ID",
+    "CRASH_DATE",
+    "CRASH_TIME",
+    "VEHICLE_ID",
+    "STATE_REGISTRATION",
+    "VEHICLE_TYPE",
+    "VEHICLE_MAKE",
+    "VEHICLE_MODEL",
+    "VEHICLE_YEAR",
+    "TRAVEL_DIRECTION",
+    "VEHICLE_OCCUPANTS",
+    "DRIVER_SEX",
+    "DRIVER_LICENSE_STATUS",
+]
+
+VEHICLE_TYPES = [
+    "Sedan", "Station Wagon/Sport Utility Vehicle", "SPORT UTILITY / STATION WAGON", "Taxi",
+    "PASSENGER VEHICLE", "Pick-up Truck", "Box Truck", "Bus", "Bike", "Motorcycle", "Van", "4 dr sedan",
+]
+VEHICLE_MAKES = ["TOYOTA", "HONDA", "FORD", "NISSAN", "CHEVROLET", "BMW", "ME/BE", "JEEP", "HYUNDAI", "KIA"]
+STATES = ["NY", "NJ", "PA", "CT", "FL"]
+DIRECTIONS = ["North", "South", "East", "West", "Unknown"]
+CRASH_DATES = pd.date_range("2013-01-01", periods=365 * 12, freq="D").strftime("%m/%d/%Y").to_numpy()
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    rows: int = 100_000
+    seed: int = 42
+    null_rate: float = 0.02
+    bad_year_rate: float = 0.01
+    whitespace_rate: float = 0.05
+
+
+# Rows are generated in fixed-size blocks, each seeded from (seed, block index),
+# so the file is identical regardless of how it is written and any block can be
+# regenerated on its own.
+BLOCK_ROWS = 100_000
+
+
+def _with_nulls(rng, values: np.ndarray, rate: float) -> np.ndarray:
+    values = values.astype(object)
+    values[rng.random(len(values)) < rate] = None
+    return values
+
+
+def _with_whitespace(rng, values: np.ndarray, rate: float) -> np.ndarray:
+    values = values.astype(object)
+    mask = rng.random(len(values)) < rate
+    values[mask] = np.array(["  " + str(v) + " " if v is not None else None for v in values[mask]], dtype=object)
+    return values
+
+
+def make_block(config: GeneratorConfig, block: int) -> pd.DataFrame:
+    start = block * BLOCK_ROWS
+    rows = max(0, min(BLOCK_ROWS, config.rows - start))
+    rng = np.random.default_rng([config.seed, block])
+    ids = np.arange(start + 1, start + rows + 1)
+
+    years = rng.integers(1995, 2026, rows).astype(object)
+    bad = rng.random(rows) < config.bad_year_rate
+    years[bad] = rng.choice([1800, 1111, 9999, 0, "UNKNOWN"], bad.sum())
+
+    frame = {
+        "UNIQUE_ID": _with_nulls(rng, ids, config.null_rate / 4),
+        "COLLISION_ID": _with_nulls(rng, 4_000_000 + ids // 2, config.null_rate / 4),
+        "CRASH_DATE": CRASH_DATES[rng.integers(0, len(CRASH_DATES), rows)],
+        "CRASH_TIME": np.char.add(
+            np.char.add(rng.integers(0, 24, rows).astype(str), ":"),
+            np.char.zfill(rng.integers(0, 60, rows).astype(str), 2),
+        ),
+        "VEHICLE_ID": rng.integers(1, 10**9, rows),
+        "STATE_REGISTRATION": _with_nulls(rng, rng.choice(STATES, rows), config.null_rate),
+        "VEHICLE_TYPE": _with_whitespace(
+            rng, _with_nulls(rng, rng.choice(VEHICLE_TYPES, rows), config.null_rate), config.whitespace_rate
+        ),
+        "VEHICLE_MAKE": _with_whitespace(
+            rng, _with_nulls(rng, rng.choice(VEHICLE_MAKES, rows), config.null_rate), config.whitespace_rate
+        ),
+        "VEHICLE_MODEL": _with_nulls(rng, rng.choice(["", "CAMRY", "CIVIC", "F-150"], rows), config.null_rate),
+        "VEHICLE_YEAR": _with_whitespace(rng, _with_nulls(rng, years, config.null_rate), config.whitespace_rate),
+        "TRAVEL_DIRECTION": rng.choice(DIRECTIONS, rows),
+        "VEHICLE_OCCUPANTS": rng.integers(0, 6, rows),
+        "DRIVER_SEX": rng.choice(["M", "F", "U"], rows),
+        "DRIVER_LICENSE_STATUS": rng.choice(["Licensed", "Unlicensed", "Permit"], rows),
+    }
+    return pd.DataFrame(frame, columns=COLUMNS)
+
+
+def generate_vehicles_csv(path, config: GeneratorConfig = GeneratorConfig()) -> Path:
+    """Write ``config.rows`` synthetic Bronze rows to ``path`` in bounded chunks."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    blocks = max(1, -(-config.rows // BLOCK_ROWS))
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for block in range(blocks):
+            make_block(config, block).to_csv(f, index=False, header=block == 0)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--null-rate", type=float, default=0.02)
+    parser.add_argument("--bad-year-rate", type=float, default=0.01)
+    parser.add_argument("--whitespace-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    config = GeneratorConfig(
+        rows=args.rows,
+        seed=args.seed,
+        null_rate=args.null_rate,
+        bad_year_rate=args.bad_year_rate,
+        whitespace_rate=args.whitespace_rate,
+    )
+    out = generate_vehicles_csv(args.path, config)
+    print(f"Wrote {config.rows:,} rows to {out} ({out.stat().st_size / 1e6:,.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Benchmark harness for the Silver vehicles v1 pipeline.
+
+Usage:
+    python -m benchmarks.run_benchmarks run --rows 1000000
+    python -m benchmarks.run_benchmarks compare benchmarks/results/a.json benchmarks/results/b.json
+
+Each case is timed ``--repeat`` times (best run is kept) and run once more
+under tracemalloc to record its Python/NumPy allocation peak (Arrow buffers
+are not visible to tracemalloc; peak_rss_mb is the process high-water mark
+and covers them coarsely). Results are
+written as JSON named after the timestamp and git commit so runs can be
+compared across commits.
+"""
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.generate import GeneratorConfig, generate_vehicles_csv
+from src.dq.silver.vehicles.v1.dq import apply_quality_rules_vehicles
+from src.silver.vehicles.v1.ingest import read_vehicles
+from src.utils.id_index import IdIndex
+from src.utils.instrumentation import _peak_rss_mb
+from src.silver.vehicles.v1.run import ROW_GROUP_ROWS, SORT_KEY
+from src.utils.io_utils import _normalize_time_to_hhmm, ParquetAppendWriter
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parent,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(name: str, fn, rows: int, repeat: int = 3) -> dict:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "name": name,
+        "rows": rows,
+        "seconds": best,
+        "seconds_all": timings,
+        "rows_per_sec": rows / best if best > 0 else None,
+        "tracemalloc_peak_mb": peak / (1024 * 1024),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _dedup_in_batches(index_dir: Path, ids, batches: int = 20) -> None:
+    """What --dedup does per --chunk-size batch: probe the ids, then add them."""
+    index = IdIndex(index_dir)
+    for part in np.array_split(ids, batches):
+        index.add(part[~index.contains(part)])
+
+
+def _write_partition(out_dir: Path, df: pd.DataFrame) -> None:
+    """What a silver run writes for one Bronze file: a sorted part file."""
+    writer = ParquetAppendWriter(
+        out_dir / "part-bench.parquet", drop_columns=["run_date"], sort_by=list(SORT_KEY), row_group_size=ROW_GROUP_ROWS
+    )
+    writer.write(df)
+    writer.close()
+
+
+def run_suite(config: GeneratorConfig, repeat: int, work_dir: Path) -> dict:
+    bronze_file = work_dir / "vehicles_raw_bench.csv"
+    gen_start = time.perf_counter()
+    generate_vehicles_csv(bronze_file, config)
+    print(f"Generated {config.rows:,} rows in {time.perf_counter() - gen_start:.1f}s")
+
+    df = read_vehicles(bronze_file, engine="pandas")
+    crash_time = pd.read_csv(bronze_file, usecols=["CRASH_TIME"], dtype="string")["CRASH_TIME"]
+    clean_df = apply_quality_rules_vehicles(df, run_date_str="2026-01-01").clean_df
+    out_dir = work_dir / "silver"
+    unique_ids = df["unique_id"].to_numpy(dtype="int64", na_value=0)
+
+    cases = [
+        ("ingest_pandas", lambda: read_vehicles(bronze_file, engine="pandas")),
+        ("ingest_arrow", lambda: read_vehicles(bronze_file, engine="arrow")),
+        ("apply_quality_rules_vehicles", lambda: apply_quality_rules_vehicles(df, run_date_str="2026-01-01")),
+        ("id_index_dedup_batches", lambda: _dedup_in_batches(work_dir / "index", unique_ids)),
+        ("normalize_time_to_hhmm", lambda: _normalize_time_to_hhmm(crash_time)),
+        ("write_silver_partition", lambda: _write_partition(out_dir, clean_df)),
+    ]
+
+    results = []
+    for name, fn in cases:
+        result = measure(name, fn, config.rows, repeat=repeat)
+        results.append(result)
+        print(
+            f"{name:<30} {result['seconds']:8.3f}s {result['rows_per_sec']:>14,.0f} rows/s "
+            f"{result['tracemalloc_peak_mb']:9.1f} MB peak"
+        )
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "pyarrow": pa.__version__,
+            "machine": platform.machine(),
+            "bronze_bytes": bronze_file.stat().st_size,
+            "generator": asdict(config),
+            "repeat": repeat,
+        },
+        "cases": results,
+    }
+
+
+def compare(baseline_path: Path, candidate_path: Path) -> pd.DataFrame:
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    candidate = json.loads(Path(candidate_path).read_text(encoding="utf-8"))
+
+    base = pd.DataFrame(baseline["cases"]).set_index("name")
+    cand = pd.DataFrame(candidate["cases"]).set_index("name")
+    joined = base[["seconds", "tracemalloc_peak_mb"]].join(
+        cand[["seconds", "tracemalloc_peak_mb"]], lsuffix="_base", rsuffix="_new", how="outer"
+    )
+    joined["speedup"] = joined["seconds_base"] / joined["seconds_new"]
+    joined["memory_ratio"] = joined["tracemalloc_peak_mb_new"] / joined["tracemalloc_peak_mb_base"]
+    return joined
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Generate data and run the benchmark cases.")
+    run_p.add_argument("--rows", type=int, default=100_000)
+    run_p.add_argument("--seed", type=int, default=42)
+    run_p.add_argument("--null-rate", type=float, default=0.02)
+    run_p.add_argument("--bad-year-rate", type=float, default=0.01)
+    run_p.add_argument("--whitespace-rate", type=float, default=0.05)
+    run_p.add_argument("--repeat", type=int, default=3)
+    run_p.add_argument("--output", type=Path, default=RESULTS_DIR)
+
+    cmp_p = sub.add_parser("compare", help="Compare two result files.")
+    cmp_p.add_argument("baseline", type=Path)
+    cmp_p.add_argument("candidate", type=Path)
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        print(compare(args.baseline, args.candidate).to_string(float_format=lambda v: f"{v:.3f}"))
+        return
+
+    config = GeneratorConfig(
+        rows=args.rows,
+        seed=args.seed,
+        null_rate=args.null_rate,
+        bad_year_rate=args.bad_year_rate,
+        whitespace_rate=args.whitespace_rate,
+    )
+    with tempfile.TemporaryDirectory(prefix="silver-bench-") as tmp:
+        report = run_suite(config, args.repeat, Path(tmp))
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out_path = args.output / f"{stamp}-{report['meta']['commit']}-{args.rows}.json"
+    out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
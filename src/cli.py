@@ -1,29 +1,268 @@
+import inspect
 import typer
-from datetime import date
+from datetime import date, datetime
 from typing import Optional
 
-from src.silver.vehicles.v1.run import run as run_silver_vehicles_v1
+from src.config import BRONZE_CACHE_MAX_BYTES
+from src.pipelines import PIPELINES, load_pipeline, pipeline_key
 
 app = typer.Typer(help="crashes-data-project CLI")
 silver_app = typer.Typer(help="Run SILVER pipelines")
+gold_app = typer.Typer(help="Run GOLD pipelines")
+metrics_app = typer.Typer(help="Query the historical metrics store")
+
+# Pipeline keyword -> CLI parameter, where the two names differ.
+_CLI_PARAMS = {"run_date_str": "run_date", "cache_max_bytes": "cache_max_gb"}
+
+def _pipeline_options(ctx: typer.Context, pipeline, options: dict) -> dict:
+    """Keep the options ``pipeline`` accepts; fail on others given on the command line."""
+    accepted = inspect.signature(pipeline).parameters
+    flags = {p.name: p.opts[0] for p in ctx.command.params}
+    unsupported = []
+    for name in options:
+        param = _CLI_PARAMS.get(name, name)
+        source = ctx.get_parameter_source(param)
+        # Compared by name: typer may bundle its own copy of click's ParameterSource.
+        if name not in accepted and source is not None and source.name != "DEFAULT":
+            unsupported.append(flags[param])
+    if unsupported:
+        raise typer.BadParameter(f"Not supported by this pipeline: {', '.join(unsupported)}")
+    return {name: value for name, value in options.items() if name in accepted}
 
 @silver_app.command("run")
 def run(
+    ctx: typer.Context,
     dataset: str = typer.Option("vehicles", "--dataset", "-d"),
     version: str = typer.Option("v1", "--version", "-v"),
     variant: str = typer.Option("full", "--variant"),
     run_date: Optional[str] = typer.Option(None, "--run-date"),
     dry_run: bool = typer.Option(False, "--dry-run"),
+    chunk_size: Optional[int] = typer.Option(
+        None, "--chunk-size", min=1, help="Stream Bronze in batches of N rows to bound memory."
+    ),
+    incremental: bool = typer.Option(
+        False, "--incremental", help="Only process new/changed Bronze files and replace the run_date partition."
+    ),
+    engine: str = typer.Option(
+        "pandas", "--engine", help="Bronze CSV ingest engine: pandas, arrow (multithreaded pyarrow.csv) or stream (arrow in bounded batches)."
+    ),
+    files_glob: Optional[str] = typer.Option(
+        None, "--files", help="Process every Bronze CSV matching this glob instead of only the latest."
+    ),
+    from_date: Optional[datetime] = typer.Option(
+        None, "--from-date", formats=["%Y-%m-%d"], help="Only Bronze drops dated (YYYYMMDD in the file name) on/after this date."
+    ),
+    to_date: Optional[datetime] = typer.Option(
+        None, "--to-date", formats=["%Y-%m-%d"], help="Only Bronze drops dated on/before this date."
+    ),
+    workers: int = typer.Option(1, "--workers", "-w", min=1, help="Process Bronze files in parallel on N processes."),
+    compression: str = typer.Option("snappy", "--compression", help="Parquet codec: snappy, zstd, gzip or none."),
+    row_group_size: Optional[int] = typer.Option(
+        None, "--row-group-size", min=1, help="Maximum rows per Parquet row group."
+    ),
+    trace_memory: bool = typer.Option(
+        False, "--trace-memory", help="Record tracemalloc peaks per stage (slower)."
+    ),
+    profile: bool = typer.Option(False, "--profile", help="Dump a cProfile of the run under logs/profiles/."),
+    cache: bool = typer.Option(
+        False, "--cache", help="Parse each Bronze file once into a memory-mapped Arrow cache under data/cache/."
+    ),
+    cache_max_gb: float = typer.Option(
+        BRONZE_CACHE_MAX_BYTES / 1024**3, "--cache-max-gb", min=0, help="Evict least recently used cache entries above this size."
+    ),
+    dedup: bool = typer.Option(
+        False, "--dedup", help="Discard rows whose unique_id is already in another Silver run_date partition."
+    ),
+    check_collisions: bool = typer.Option(
+        False, "--check-collisions", help="Quarantine vehicles whose collision_id is not in crashes Silver."
+    ),
+    full_scan: bool = typer.Option(
+        False, "--full-scan", help="With --dry-run, run DQ over every row instead of estimating from a sample."
+    ),
+    sample_rows: int = typer.Option(
+        20_000, "--sample-rows", min=1, help="Bronze rows sampled by a --dry-run preview."
+    ),
+    sort_by: str = typer.Option(
+        "collision_id,unique_id", "--sort-by", help="Comma-separated key the clean rows are sorted by within each write batch; 'none' keeps Bronze order."
+    ),
+    bloom_filters: bool = typer.Option(
+        False, "--bloom-filters", help="Write Parquet bloom filters on collision_id and unique_id."
+    ),
+    rescan: bool = typer.Option(
+        False, "--rescan", help="Re-stat every Bronze file instead of trusting the Bronze catalog (files rewritten in place)."
+    ),
+):
+    run_date_str = run_date or date.today().isoformat()
+
+    key = pipeline_key("silver", dataset, version)
+    if key not in PIPELINES:
+        raise typer.BadParameter(f"Pipeline não encontrada: {key}")
+
+    # Imported here so --help and argument validation never load pandas/pyarrow.
+    from src.utils.instrumentation import profiled
+
+    run_pipeline = load_pipeline(key)
+    options = _pipeline_options(
+        ctx,
+        run_pipeline,
+        dict(
+            run_date_str=run_date_str,
+            variant=variant,
+            dry_run=dry_run,
+            chunk_size=chunk_size,
+            incremental=incremental,
+            engine=engine,
+            files_glob=files_glob,
+            from_date=from_date.date() if from_date else None,
+            to_date=to_date.date() if to_date else None,
+            workers=workers,
+            compression=compression,
+            row_group_size=row_group_size,
+            trace_memory=trace_memory,
+            cache=cache,
+            cache_max_bytes=int(cache_max_gb * 1024**3),
+            dedup=dedup,
+            check_collisions=check_collisions,
+            full_scan=full_scan,
+            sample_rows=sample_rows,
+            sort_by=tuple(c.strip() for c in sort_by.split(",") if c.strip() and sort_by.strip().lower() != "none"),
+            bloom_filters=bloom_filters,
+            rescan=rescan,
+        ),
+    )
+    with profiled(f"silver_{dataset}_{version}_{run_date_str}", enabled=profile):
+        run_pipeline(**options)
+
+@silver_app.command("backfill")
+def backfill(
+    from_date: datetime = typer.Option(..., "--from", formats=["%Y-%m-%d"], help="First run_date to load."),
+    to_date: datetime = typer.Option(..., "--to", formats=["%Y-%m-%d"], help="Last run_date to load."),
+    dataset: str = typer.Option("vehicles", "--dataset", "-d"),
+    version: str = typer.Option("v1", "--version", "-v"),
+    variant: str = typer.Option("full", "--variant"),
+    files_glob: Optional[str] = typer.Option(
+        None, "--files", help="Only load the dated Bronze drops matching this glob."
+    ),
+    chunk_size: Optional[int] = typer.Option(
+        None, "--chunk-size", min=1, help="Run DQ on each run_date in batches of N rows."
+    ),
+    workers: int = typer.Option(1, "--workers", "-w", min=1, help="Load run_dates in parallel on N processes."),
+    compression: str = typer.Option("snappy", "--compression", help="Parquet codec: snappy, zstd, gzip or none."),
+    row_group_size: Optional[int] = typer.Option(
+        None, "--row-group-size", min=1, help="Maximum rows per Parquet row group."
+    ),
+    trace_memory: bool = typer.Option(
+        False, "--trace-memory", help="Record tracemalloc peaks per stage (slower)."
+    ),
+    restart: bool = typer.Option(
+        False, "--restart", help="Ignore the checkpoint of an earlier backfill and start over."
+    ),
+):
+    """Load a range of run_dates, each from the Bronze drop dated that day."""
+    key = pipeline_key("silver-backfill", dataset, version)
+    if key not in PIPELINES:
+        raise typer.BadParameter(f"Pipeline não encontrada: {key}")
+
+    run_backfill = load_pipeline(key)
+    run_backfill(
+        from_date=from_date.date(),
+        to_date=to_date.date(),
+        variant=variant,
+        files_glob=files_glob,
+        chunk_size=chunk_size,
+        workers=workers,
+        compression=compression,
+        row_group_size=row_group_size,
+        trace_memory=trace_memory,
+        restart=restart,
+    )
+
+@gold_app.command("run")
+def run_gold(
+    dataset: str = typer.Option("vehicles", "--dataset", "-d"),
+    version: str = typer.Option("v1", "--version", "-v"),
+    run_date: Optional[str] = typer.Option(None, "--run-date", help="Label for the stage metrics (defaults to today)."),
+    dry_run: bool = typer.Option(False, "--dry-run"),
+    full_refresh: bool = typer.Option(
+        False, "--full-refresh", help="Recompute every Silver partition instead of only new/changed ones."
+    ),
+    compression: str = typer.Option("snappy", "--compression", help="Parquet codec: snappy, zstd, gzip or none."),
+    trace_memory: bool = typer.Option(
+        False, "--trace-memory", help="Record tracemalloc peaks per stage (slower)."
+    ),
+    profile: bool = typer.Option(False, "--profile", help="Dump a cProfile of the run under logs/profiles/."),
+    merge: str = typer.Option(
+        "latest", "--merge", help="Merged tables: latest (run_dates are full snapshots) or sum (run_dates are increments)."
+    ),
 ):
     run_date_str = run_date or date.today().isoformat()
 
-    if dataset == "vehicles" and version == "v1":
-        run_silver_vehicles_v1(run_date_str=run_date_str, variant=variant, dry_run=dry_run)
+    key = pipeline_key("gold", dataset, version)
+    if key not in PIPELINES:
+        raise typer.BadParameter(f"Pipeline não encontrada: {key}")
+
+    from src.utils.instrumentation import profiled
+
+    run_pipeline = load_pipeline(key)
+    with profiled(f"gold_{dataset}_{version}_{run_date_str}", enabled=profile):
+        run_pipeline(
+            run_date_str=run_date_str,
+            dry_run=dry_run,
+            full_refresh=full_refresh,
+            compression=compression,
+            trace_memory=trace_memory,
+            merge=merge,
+        )
+
+@metrics_app.command("query")
+def metrics_query(
+    dataset: Optional[str] = typer.Option("vehicles", "--dataset", "-d"),
+    version: Optional[str] = typer.Option("v1", "--version", "-v"),
+    metric: Optional[list[str]] = typer.Option(None, "--metric", "-m", help="Metric name; repeat for several."),
+    reason: Optional[str] = typer.Option(None, "--reason", help="Only this DQ reason (for dq_reason_count)."),
+    from_date: Optional[datetime] = typer.Option(None, "--from-date", formats=["%Y-%m-%d"]),
+    to_date: Optional[datetime] = typer.Option(None, "--to-date", formats=["%Y-%m-%d"]),
+    wide: bool = typer.Option(False, "--wide", help="One row per run_date, one column per metric."),
+    csv: bool = typer.Option(False, "--csv", help="Print CSV instead of a table."),
+):
+    from src.config import metrics_store_path
+    from src.metrics.store import query_metrics
+
+    df = query_metrics(
+        metrics_store_path(),
+        dataset=dataset,
+        version=version,
+        metrics=metric or None,
+        reason=reason,
+        start=from_date.date() if from_date else None,
+        end=to_date.date() if to_date else None,
+    )
+    if df.empty:
+        print("No metrics found.")
         return
 
-    raise typer.BadParameter(f"Pipeline não encontrada: silver/{dataset}/{version}")
+    if wide:
+        df["metric"] = df["metric"].where(df["reason"] == "", df["metric"] + ":" + df["reason"])
+        df = df.pivot_table(index="run_date", columns="metric", values="value", aggfunc="sum").reset_index()
+        df.columns.name = None
+
+    print(df.to_csv(index=False) if csv else df.to_string(index=False))
+
+@metrics_app.command("import")
+def metrics_import(
+    dataset: str = typer.Option("vehicles", "--dataset", "-d"),
+    version: str = typer.Option("v1", "--version", "-v"),
+):
+    """Load the existing per-run metrics.csv files of a Silver table into the store."""
+    from src.config import metrics_store_path, silver_metrics_path
+    from src.metrics.store import import_metrics_csvs
+
+    written = import_metrics_csvs(metrics_store_path(), silver_metrics_path(dataset, version), dataset, version)
+    print(f"Imported {written} metric rows into {metrics_store_path()}")
 
 app.add_typer(silver_app, name="silver")
+app.add_typer(gold_app, name="gold")
+app.add_typer(metrics_app, name="metrics")
 
 if __name__ == "__main__":
     app()
\ No newline at end of file
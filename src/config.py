@@ -9,13 +9,22 @@ DATA_DIR = BASE_DIR / "data"
 BRONZE_DIR = DATA_DIR / "bronze"
 SILVER_DIR = DATA_DIR / "silver"
 SILVER_QUARANTINE_DIR = DATA_DIR / "silver_quarantine"
+GOLD_DIR = DATA_DIR / "gold"
 METRICS_DIR = DATA_DIR / "metrics"
+MANIFESTS_DIR = DATA_DIR / "manifests"
+CACHE_DIR = DATA_DIR / "cache"
+INDEXES_DIR = DATA_DIR / "indexes"
 LOGS_DIR = BASE_DIR / "logs"
 
+BRONZE_CACHE_MAX_BYTES = 20 * 1024**3
+
 
 def bronze_path(dataset: str, variant: str = "full") -> Path:
     return BRONZE_DIR / dataset / variant
 
+def bronze_cache_path(dataset: str, variant: str = "full") -> Path:
+    return CACHE_DIR / "bronze" / dataset / variant
+
 def silver_path(dataset: str, version: str) -> Path:
     return SILVER_DIR / dataset / version
 
@@ -23,4 +32,34 @@ def quarantine_path(dataset: str, version: str) -> Path:
     return SILVER_QUARANTINE_DIR / dataset / version
 
 def silver_metrics_path(dataset: str, version: str) -> Path:
-    return METRICS_DIR / "silver" / dataset / version
\ No newline at end of file
+    return METRICS_DIR / "silver" / dataset / version
+
+def metrics_store_path() -> Path:
+    return METRICS_DIR / "metrics.sqlite"
+
+def bronze_catalog_path(dataset: str, variant: str = "full") -> Path:
+    return MANIFESTS_DIR / "bronze" / dataset / variant / "catalog.json"
+
+def silver_manifest_path(dataset: str, version: str) -> Path:
+    return MANIFESTS_DIR / "silver" / dataset / version / "bronze_manifest.json"
+
+def silver_bronze_schema_path(dataset: str, version: str) -> Path:
+    return MANIFESTS_DIR / "silver" / dataset / version / "bronze_schema.json"
+
+def silver_id_index_path(dataset: str, version: str, column: str) -> Path:
+    return INDEXES_DIR / "silver" / dataset / version / column
+
+def silver_vocabulary_path(dataset: str, version: str) -> Path:
+    return MANIFESTS_DIR / "silver" / dataset / version / "vocabulary.json"
+
+def silver_backfill_checkpoint_path(dataset: str, version: str) -> Path:
+    return MANIFESTS_DIR / "silver" / dataset / version / "backfill.json"
+
+def gold_path(dataset: str, version: str) -> Path:
+    return GOLD_DIR / dataset / version
+
+def gold_metrics_path(dataset: str, version: str) -> Path:
+    return METRICS_DIR / "gold" / dataset / version
+
+def gold_manifest_path(dataset: str, version: str) -> Path:
+    return MANIFESTS_DIR / "gold" / dataset / version / "silver_partitions.json"
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+import numpy as np
+import pandas as pd
+
+from src.dq.rules import RuleRegistry
+
+
+@dataclass(frozen=True)
+class DQResult:
+    """Outcome of the DQ rules over one frame.
+
+    Only the annotated input (``frame``, a shallow copy plus ``run_date``) and
+    positional row indices per bucket are held; ``clean_df``, ``quarantine_df``
+    and ``discard_df`` are materialized on each access, and ``batches`` yields
+    a bucket in slices so writers never need a full copy of it.
+    """
+
+    frame: pd.DataFrame
+    reason_codes: np.ndarray
+    clean_idx: np.ndarray
+    quarantine_idx: np.ndarray
+    discard_idx: np.ndarray
+    rules: RuleRegistry
+    metrics_summary: pd.DataFrame
+    metrics_by_reason: pd.DataFrame
+    metrics_by_rule: pd.DataFrame
+    run_date: str
+
+    def _take(self, idx: np.ndarray, with_reasons: bool) -> pd.DataFrame:
+        part = self.frame.take(idx)
+        if with_reasons:
+            part.insert(
+                self.frame.columns.get_loc("run_date"),
+                "dq_reasons",
+                pd.Series(self.rules.decode(self.reason_codes[idx]), index=part.index, dtype=object).astype(str),
+            )
+        return part
+
+    @property
+    def clean_df(self) -> pd.DataFrame:
+        return self._take(self.clean_idx, with_reasons=False)
+
+    @property
+    def quarantine_df(self) -> pd.DataFrame:
+        return self._take(self.quarantine_idx, with_reasons=True)
+
+    @property
+    def discard_df(self) -> pd.DataFrame:
+        return self._take(self.discard_idx, with_reasons=True)
+
+    def batches(self, bucket: str, batch_rows: int = 500_000, order_by: list[str] | None = None):
+        """Yield ``bucket`` in slices of ``batch_rows``, optionally ordered by ``order_by``.
+
+        Ordering permutes the bucket's row indices (only the key columns are
+        read), so consecutive slices cover consecutive key ranges.
+        """
+        idx = {"clean": self.clean_idx, "quarantine": self.quarantine_idx, "discard": self.discard_idx}[bucket]
+        if order_by and len(idx) > 1:
+            import pyarrow as pa
+
+            from src.utils.io_utils import _sort_indices
+
+            keys = pa.Table.from_pandas(self.frame[list(order_by)].take(idx), preserve_index=False)
+            idx = idx[_sort_indices(keys, list(order_by)).to_numpy()]
+        if len(idx) == 0:
+            yield self._take(idx, with_reasons=bucket != "clean")
+            return
+        for start in range(0, len(idx), batch_rows):
+            yield self._take(idx[start:start + batch_rows], with_reasons=bucket != "clean")
+
+
+def apply_rules(df: pd.DataFrame, rules: RuleRegistry, run_date_str: str | None = None) -> DQResult:
+    """Evaluate ``rules`` over ``df`` and split its rows into clean/quarantine/discard."""
+    run_date_str = run_date_str or date.today().isoformat()
+
+    # Shallow copy: the input's column buffers are shared, only run_date is new.
+    out = df.copy(deep=False)
+    out["run_date"] = run_date_str
+
+    evaluation = rules.evaluate(out)
+    codes = evaluation.codes
+    discard_mask = evaluation.discard_mask
+
+    has_reasons = codes != 0
+    quarantine_mask = has_reasons & (~discard_mask)
+    clean_mask = (~has_reasons) & (~discard_mask)
+
+    clean_idx = np.flatnonzero(clean_mask)
+    quarantine_idx = np.flatnonzero(quarantine_mask)
+    discard_idx = np.flatnonzero(discard_mask)
+
+    total_read = len(out)
+    total_clean = len(clean_idx)
+    total_quarantine = len(quarantine_idx)
+    total_discard = len(discard_idx)
+
+    metrics_summary = pd.DataFrame(
+        [
+            {"run_date": run_date_str, "metric": "total_rows_read", "value": total_read},
+            {"run_date": run_date_str, "metric": "total_clean", "value": total_clean},
+            {"run_date": run_date_str, "metric": "total_quarantine", "value": total_quarantine},
+            {"run_date": run_date_str, "metric": "total_discard", "value": total_discard},
+        ]
+    )
+
+    reason_counts = {r: c for r, c in rules.count(codes).items() if c > 0}
+    if reason_counts:
+        metrics_by_reason = (
+            pd.Series(reason_counts, name="count")
+            .sort_values(ascending=False, kind="stable")
+            .rename_axis("reason")
+            .reset_index()
+        )
+        metrics_by_reason.insert(0, "run_date", run_date_str)
+    else:
+        metrics_by_reason = pd.DataFrame(columns=["run_date", "reason", "count"])
+
+    metrics_by_rule = evaluation.timings.copy()
+    metrics_by_rule.insert(0, "run_date", run_date_str)
+
+    return DQResult(
+        frame=out,
+        reason_codes=codes,
+        clean_idx=clean_idx,
+        quarantine_idx=quarantine_idx,
+        discard_idx=discard_idx,
+        rules=rules,
+        metrics_summary=metrics_summary,
+        metrics_by_reason=metrics_by_reason,
+        metrics_by_rule=metrics_by_rule,
+        run_date=run_date_str,
+    )
+
+
+def merge_dq_metrics(
+    metrics_summaries: list[pd.DataFrame],
+    metrics_by_reasons: list[pd.DataFrame],
+    run_date_str: str,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    if metrics_summaries:
+        summary = pd.concat(metrics_summaries, ignore_index=True)
+        metrics_summary = (
+            summary.groupby("metric", sort=False)["value"].sum().reset_index()
+        )
+    else:
+        metrics_summary = pd.DataFrame(
+            {"metric": ["total_rows_read", "total_clean", "total_quarantine", "total_discard"], "value": 0}
+        )
+    metrics_summary.insert(0, "run_date", run_date_str)
+
+    non_empty = [m for m in metrics_by_reasons if m is not None and not m.empty]
+    if non_empty:
+        by_reason = pd.concat(non_empty, ignore_index=True)
+        metrics_by_reason = (
+            by_reason.groupby("reason", sort=False)["count"].sum()
+            .sort_values(ascending=False, kind="stable")
+            .reset_index()
+        )
+        metrics_by_reason.insert(0, "run_date", run_date_str)
+    else:
+        metrics_by_reason = pd.DataFrame(columns=["run_date", "reason", "count"])
+
+    return metrics_summary, metrics_by_reason
+
+
+def merge_rule_metrics(metrics_by_rules: list[pd.DataFrame], run_date_str: str) -> pd.DataFrame:
+    non_empty = [m for m in metrics_by_rules if m is not None and not m.empty]
+    if not non_empty:
+        return pd.DataFrame(columns=["run_date", "rule", "severity", "reason", "flagged", "seconds"])
+
+    by_rule = pd.concat(non_empty, ignore_index=True)
+    merged = (
+        by_rule.groupby(["rule", "severity"], sort=False, dropna=False)
+        .agg(reason=("reason", "first"), flagged=("flagged", "sum"), seconds=("seconds", "sum"))
+        .reset_index()
+    )
+    merged.insert(0, "run_date", run_date_str)
+    return merged
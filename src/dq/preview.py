@@ -0,0 +1,59 @@
+"""Sample-based DQ estimates for dry runs.
+
+Bucket and reason rates measured on a random sample of Bronze rows, with
+Wilson score intervals: unlike the normal approximation they stay inside
+[0, 1] and remain usable for the rare reasons (a handful of hits in the
+sample) that matter most when checking a new drop.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+Z_95 = 1.959963984540054
+
+PREVIEW_COLUMNS = ["metric", "reason", "sample_count", "rate", "ci_low", "ci_high", "estimated_count"]
+
+
+def wilson_interval(k, n: int, z: float = Z_95) -> tuple[np.ndarray, np.ndarray]:
+    """Wilson score interval for ``k`` successes out of ``n`` (vectorized over ``k``)."""
+    k = np.asarray(k, dtype=float)
+    if n == 0:
+        return np.zeros_like(k), np.ones_like(k)
+    p = k / n
+    denom = 1 + z**2 / n
+    center = (p + z**2 / (2 * n)) / denom
+    half = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denom
+    return np.clip(center - half, 0, 1), np.clip(center + half, 0, 1)
+
+
+def estimate_rates(
+    metrics_summary: pd.DataFrame,
+    metrics_by_reason: pd.DataFrame,
+    estimated_rows: int,
+    z: float = Z_95,
+) -> pd.DataFrame:
+    """Turn the DQ metrics of a sample into rates, intervals and estimated counts.
+
+    One row per bucket (``total_clean``/``total_quarantine``/``total_discard``)
+    and one per ``dq_reason_count`` reason. Counts are the sample counts
+    scaled to ``estimated_rows``.
+    """
+    summary = dict(zip(metrics_summary["metric"], metrics_summary["value"]))
+    n = int(summary.get("total_rows_read", 0))
+
+    rows = [
+        (metric, "", int(summary.get(metric, 0)))
+        for metric in ("total_clean", "total_quarantine", "total_discard")
+    ]
+    if metrics_by_reason is not None and not metrics_by_reason.empty:
+        rows += [
+            ("dq_reason_count", str(reason), int(count))
+            for reason, count in zip(metrics_by_reason["reason"], metrics_by_reason["count"])
+        ]
+
+    out = pd.DataFrame(rows, columns=["metric", "reason", "sample_count"])
+    out["rate"] = out["sample_count"] / n if n else 0.0
+    out["ci_low"], out["ci_high"] = wilson_interval(out["sample_count"].to_numpy(), n, z)
+    out["estimated_count"] = (out["rate"] * estimated_rows).round().astype("int64")
+    return out[PREVIEW_COLUMNS]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+QUARANTINE = "quarantine"
+DISCARD = "discard"
+SEVERITIES = (QUARANTINE, DISCARD)
+
+
+@dataclass(frozen=True)
+class DQRule:
+    """A vectorized DQ check.
+
+    ``predicate`` receives the frame being validated and returns a boolean mask
+    (Series or array) that is True for the rows failing the rule. When one of
+    ``columns`` is absent the rule is skipped, unless ``missing_reason`` is set,
+    in which case every row is flagged with that reason instead. With
+    ``needs_codes`` the predicate is called as ``predicate(df, codes)``, with
+    the reason codes set by the rules registered before it.
+    """
+
+    name: str
+    columns: tuple[str, ...]
+    severity: str
+    predicate: Callable[[pd.DataFrame], pd.Series | np.ndarray]
+    missing_reason: str | None = None
+    needs_codes: bool = False
+
+
+@dataclass(frozen=True)
+class RuleEvaluation:
+    codes: np.ndarray
+    discard_mask: np.ndarray
+    timings: pd.DataFrame
+
+
+def _to_bool_array(mask) -> np.ndarray:
+    if isinstance(mask, pd.Series):
+        return mask.to_numpy(dtype=bool, na_value=False)
+    return np.asarray(mask, dtype=bool)
+
+
+class RuleRegistry:
+    """Ordered set of DQ rules evaluated into one int64 reason code per row.
+
+    Every reason (rule name or missing-column reason) owns one bit, assigned in
+    registration order; that order is also the order reasons are listed in the
+    human-readable ``dq_reasons`` string.
+    """
+
+    def __init__(self, rules: list[DQRule] | None = None):
+        self.rules: list[DQRule] = []
+        self.reasons: list[str] = []
+        self.severity_by_reason: dict[str, str] = {}
+        for rule in rules or []:
+            self.register(rule)
+
+    def register(self, rule: DQRule) -> DQRule:
+        if rule.severity not in SEVERITIES:
+            raise ValueError(f"Unknown severity {rule.severity!r} for rule {rule.name!r}")
+
+        for reason in (rule.name, rule.missing_reason):
+            if reason is None:
+                continue
+            if reason in self.severity_by_reason:
+                raise ValueError(f"Duplicate DQ reason: {reason}")
+            if len(self.reasons) >= 63:
+                raise ValueError("A RuleRegistry supports at most 63 reasons")
+            self.reasons.append(reason)
+            self.severity_by_reason[reason] = rule.severity
+
+        self.rules.append(rule)
+        return rule
+
+    def bit(self, reason: str) -> int:
+        return 1 << self.reasons.index(reason)
+
+    def _severity_bits(self, severity: str) -> int:
+        bits = 0
+        for reason, sev in self.severity_by_reason.items():
+            if sev == severity:
+                bits |= self.bit(reason)
+        return bits
+
+    def evaluate(self, df: pd.DataFrame) -> RuleEvaluation:
+        n = len(df)
+        codes = np.zeros(n, dtype=np.int64)
+        timings = []
+
+        for rule in self.rules:
+            start = time.perf_counter()
+            if all(c in df.columns for c in rule.columns):
+                reason = rule.name
+                mask = _to_bool_array(rule.predicate(df, codes) if rule.needs_codes else rule.predicate(df))
+            elif rule.missing_reason is not None:
+                reason = rule.missing_reason
+                mask = np.ones(n, dtype=bool)
+            else:
+                reason = None
+                mask = None
+
+            if mask is not None:
+                codes[mask] |= self.bit(reason)
+            timings.append(
+                {
+                    "rule": rule.name,
+                    "severity": rule.severity,
+                    "reason": reason,
+                    "flagged": int(mask.sum()) if mask is not None else 0,
+                    "seconds": time.perf_counter() - start,
+                }
+            )
+
+        discard_mask = (codes & self._severity_bits(DISCARD)) != 0
+        return RuleEvaluation(
+            codes=codes,
+            discard_mask=discard_mask,
+            timings=pd.DataFrame(timings, columns=["rule", "severity", "reason", "flagged", "seconds"]),
+        )
+
+    def decode(self, codes: np.ndarray) -> list[str]:
+        uniques, inverse = np.unique(codes, return_inverse=True)
+        labels = [
+            ";".join(r for r in self.reasons if int(code) & self.bit(r))
+            for code in uniques
+        ]
+        return [labels[i] for i in inverse.ravel()]
+
+    def count(self, codes: np.ndarray) -> dict[str, int]:
+        return {r: int(np.count_nonzero(codes & self.bit(r))) for r in self.reasons}
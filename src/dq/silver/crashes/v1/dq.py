@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import date
+import pandas as pd
+
+from src.dq.apply import DQResult, apply_rules
+from src.dq.rules import DISCARD, QUARANTINE, DQRule, RuleRegistry
+
+
+def _invalid_crash_date(df: pd.DataFrame) -> pd.Series:
+    cd = df["crash_date"]
+    return cd.isna() | (cd > pd.Timestamp(date.today()))
+
+
+def _invalid_crash_time(df: pd.DataFrame) -> pd.Series:
+    return df["crash_time"].isna()
+
+
+def _missing_collision_id(df: pd.DataFrame) -> pd.Series:
+    return df["collision_id"].isna()
+
+
+CRASH_RULES = RuleRegistry(
+    [
+        DQRule(
+            name="invalid_crash_date",
+            columns=("crash_date",),
+            severity=QUARANTINE,
+            predicate=_invalid_crash_date,
+            missing_reason="No_crash_date",
+        ),
+        DQRule(
+            name="invalid_crash_time",
+            columns=("crash_time",),
+            severity=QUARANTINE,
+            predicate=_invalid_crash_time,
+            missing_reason="No_crash_time",
+        ),
+        DQRule(
+            name="discard_missing_collision_id",
+            columns=("collision_id",),
+            severity=DISCARD,
+            predicate=_missing_collision_id,
+        ),
+    ]
+)
+
+
+def apply_quality_rules_crashes(
+    df: pd.DataFrame,
+    run_date_str: str | None = None,
+    rules: RuleRegistry = CRASH_RULES,
+) -> DQResult:
+    return apply_rules(df, rules, run_date_str)
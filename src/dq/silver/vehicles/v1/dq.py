@@ -1,97 +1,115 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from datetime import date
+import numpy as np
 import pandas as pd
 
+from src.dq.apply import DQResult, apply_rules, merge_dq_metrics, merge_rule_metrics  # noqa: F401
+from src.dq.rules import DISCARD, QUARANTINE, DQRule, RuleRegistry
+from src.utils.id_index import IdIndex, to_int64_ids
+
+
+def _invalid_vehicle_year(df: pd.DataFrame) -> pd.Series:
+    current_year = date.today().year
+    vy = df["vehicle_year"]
+    return vy.isna() | (vy < 1900) | (vy > current_year + 1)
+
+
+def _missing_id(df: pd.DataFrame) -> pd.Series:
+    return df["unique_id"].isna() | df["collision_id"].isna()
+
+
+VEHICLE_RULES = RuleRegistry(
+    [
+        DQRule(
+            name="invalid_vehicle_year_range",
+            columns=("vehicle_year",),
+            severity=QUARANTINE,
+            predicate=_invalid_vehicle_year,
+            missing_reason="No_vehicle_year",
+        ),
+        DQRule(
+            name="discard_missing_id",
+            columns=("unique_id", "collision_id"),
+            severity=DISCARD,
+            predicate=_missing_id,
+        ),
+    ]
+)
+
+
+def _duplicate_id(seen_ids: IdIndex):
+    def predicate(df: pd.DataFrame, codes: np.ndarray) -> np.ndarray:
+        ids = df["unique_id"]
+        valid = ids.notna().to_numpy()
+        values = ids.to_numpy(dtype="int64", na_value=0)[valid]
+
+        # A repeat only counts against an earlier row that ends up clean (no
+        # other reason), as seen_ids only receives the clean ids of earlier
+        # batches; otherwise the outcome would depend on the batch size.
+        positions = np.arange(len(values))
+        candidate = codes[valid] == 0
+        first_clean = pd.Series(positions[candidate], index=values[candidate])
+        first_clean = first_clean[~first_clean.index.duplicated()]
+        repeated = first_clean.reindex(values).to_numpy() < positions
+
+        dup = np.zeros(len(df), dtype=bool)
+        dup[valid] = repeated | seen_ids.contains(values)
+        return dup
+
+    return predicate
+
+
+def _orphan_collision_id(crash_ids: IdIndex):
+    def predicate(df: pd.DataFrame) -> np.ndarray:
+        ids, valid = to_int64_ids(df["collision_id"])
+        known = np.zeros(len(df), dtype=bool)
+        known[valid] = crash_ids.contains(ids[valid])
+        # Missing ids are left to discard_missing_id.
+        return df["collision_id"].notna().to_numpy() & ~known
+
+    return predicate
+
+
+def vehicle_rules(seen_ids: IdIndex | None = None, crash_ids: IdIndex | None = None) -> RuleRegistry:
+    """VEHICLE_RULES plus the rules backed by persistent id indexes.
+
+    * ``orphan_collision_id`` (quarantine, with ``crash_ids``): the
+      collision_id is not in the crashes Silver collision_id index.
+    * ``duplicate_unique_id`` (discard, with ``seen_ids``): the unique_id is
+      already in ``seen_ids`` or belongs to an earlier row of the same frame
+      that no other rule flags, so the first clean occurrence is kept. It is
+      registered last so it sees the outcome of every other rule.
+    """
+    extra = []
+    if crash_ids is not None:
+        extra.append(
+            DQRule(
+                name="orphan_collision_id",
+                columns=("collision_id",),
+                severity=QUARANTINE,
+                predicate=_orphan_collision_id(crash_ids),
+            )
+        )
+    if seen_ids is not None:
+        extra.append(
+            DQRule(
+                name="duplicate_unique_id",
+                columns=("unique_id",),
+                severity=DISCARD,
+                predicate=_duplicate_id(seen_ids),
+                needs_codes=True,
+            )
+        )
+    if not extra:
+        return VEHICLE_RULES
 
-@dataclass(frozen=True)
-class DQResult:
-    clean_df: pd.DataFrame
-    quarantine_df: pd.DataFrame
-    discard_df: pd.DataFrame
-    metrics_summary: pd.DataFrame
-    metrics_by_reason: pd.DataFrame
-    run_date: str
-
-
-def _append_reason(df: pd.DataFrame, mask: pd.Series, reason: str) -> None:
-    df.loc[mask, "dq_reasons"] = df.loc[mask, "dq_reasons"].where(
-        df.loc[mask, "dq_reasons"].isna() | (df.loc[mask, "dq_reasons"] == ""),
-        df.loc[mask, "dq_reasons"] + ";" + reason,
-    )
-    df.loc[mask & (df["dq_reasons"].isna() | (df["dq_reasons"] == "")), "dq_reasons"] = reason
-
-
-def apply_quality_rules_vehicles(df: pd.DataFrame, run_date_str: str | None = None) -> DQResult:
-    run_date_str = run_date_str or date.today().isoformat()
-
-    out = df.copy()
-
-    out["dq_reasons"] = ""
-    out["run_date"] = run_date_str
-
-    if "vehicle_year" in out.columns:
-        current_year = date.today().year
-        vy = out["vehicle_year"]
-        mask = vy.isna() | (vy < 1900) | (vy > current_year + 1)
-        _append_reason(out, mask, "invalid_vehicle_year_range")
-    else:
-        mask = pd.Series(True, index=out.index)
-        _append_reason(out, mask, "No_vehicle_year")
-
-    discard_mask = pd.Series([False] * len(out), index=out.index)
+    return RuleRegistry(VEHICLE_RULES.rules + extra)
 
-    if "unique_id" in out.columns and "collision_id" in out.columns:
-        discard_mask = (
-            out["unique_id"].isna() |
-            out["collision_id"].isna()
-        )
 
-    if discard_mask.any():
-        _append_reason(out, discard_mask, "discard_missing_id")
-
-    discard_df = out[discard_mask].copy()
-
-    has_reasons = out["dq_reasons"].notna() & (out["dq_reasons"].str.len() > 0)
-    quarantine_mask = has_reasons & (~discard_mask)
-    quarantine_df = out[quarantine_mask].copy()
-
-    clean_mask = (~has_reasons) & (~discard_mask)
-    clean_df = out[clean_mask].copy()
-    clean_df = clean_df.drop(columns=["dq_reasons"])
-
-    total_read = len(out)
-    total_clean = len(clean_df)
-    total_quarantine = len(quarantine_df)
-    total_discard = len(discard_df)
-
-    metrics_summary = pd.DataFrame(
-        [
-            {"run_date": run_date_str, "metric": "total_rows_read", "value": total_read},
-            {"run_date": run_date_str, "metric": "total_clean", "value": total_clean},
-            {"run_date": run_date_str, "metric": "total_quarantine", "value": total_quarantine},
-            {"run_date": run_date_str, "metric": "total_discard", "value": total_discard},
-        ]
-    )
-
-    if total_quarantine + total_discard > 0:
-        reason_series = out.loc[has_reasons, "dq_reasons"].astype("string")
-        exploded = reason_series.str.split(";").explode()
-        metrics_by_reason = (
-            exploded.value_counts(dropna=True)
-            .rename_axis("reason")
-            .reset_index(name="count")
-        )
-        metrics_by_reason.insert(0, "run_date", run_date_str)
-    else:
-        metrics_by_reason = pd.DataFrame(columns=["run_date", "reason", "count"])
-
-    return DQResult(
-        clean_df=clean_df,
-        quarantine_df=quarantine_df,
-        discard_df=discard_df,
-        metrics_summary=metrics_summary,
-        metrics_by_reason=metrics_by_reason,
-        run_date=run_date_str,
-    )
\ No newline at end of file
+def apply_quality_rules_vehicles(
+    df: pd.DataFrame,
+    run_date_str: str | None = None,
+    rules: RuleRegistry = VEHICLE_RULES,
+) -> DQResult:
+    return apply_rules(df, rules, run_date_str)
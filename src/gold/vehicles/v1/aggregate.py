@@ -0,0 +1,73 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from src.silver.vehicles.v1.ingest import CATEGORICAL_COLUMNS, SILVER_SCHEMA
+
+PARTITION_COL = "run_date"
+
+# Only these Silver columns are read; the rest are never decoded.
+SCAN_COLUMNS = ["collision_id", "vehicle_type", "vehicle_make", "vehicle_year"]
+
+COUNT_COL = "vehicles"
+
+# How the per-run_date aggregates combine into the merged Gold tables:
+# "latest" when every Silver run_date is a full snapshot (the default
+# `full` Bronze variant), "sum" when run_dates hold disjoint increments.
+MERGE_MODES = ("latest", "sum")
+
+# Gold table -> grouping key.
+AGGREGATES = {
+    "vehicles_per_collision": "collision_id",
+    "vehicle_type_counts": "vehicle_type",
+    "vehicle_make_counts": "vehicle_make",
+    "vehicle_year_distribution": "vehicle_year",
+}
+
+
+def silver_dataset(silver_dir) -> ds.Dataset:
+    """Open the run_date-partitioned Silver table as a pyarrow dataset.
+
+    The schema is pinned so partitions written with ``large_string`` columns
+    and empty partitions scan the same way. The category columns are read as
+    dictionaries, so grouping on them hashes small integer codes instead of
+    strings. ``_staging-*`` directories are skipped by pyarrow's default
+    ignore prefixes.
+    """
+    schema = SILVER_SCHEMA
+    for col in CATEGORICAL_COLUMNS:
+        i = schema.get_field_index(col)
+        schema = schema.set(i, schema.field(i).with_type(pa.dictionary(pa.int32(), pa.string())))
+    schema = schema.append(pa.field(PARTITION_COL, pa.string()))
+    partitioning = ds.partitioning(pa.schema([(PARTITION_COL, pa.string())]), flavor="hive")
+    return ds.dataset(silver_dir, format="parquet", partitioning=partitioning, schema=schema)
+
+
+def scan_partition(dataset: ds.Dataset, run_date_str: str) -> pa.Table:
+    """Read one run_date partition, projected to SCAN_COLUMNS.
+
+    The partition filter prunes every other run_date's files before any of
+    them is opened.
+    """
+    return dataset.to_table(columns=SCAN_COLUMNS, filter=pc.field(PARTITION_COL) == run_date_str)
+
+
+def _count_by(table: pa.Table, key: str) -> pa.Table:
+    counts = table.group_by(key).aggregate([([], "count_all")])
+    counts = counts.select([key, "count_all"]).rename_columns([key, COUNT_COL])
+    if pa.types.is_dictionary(counts.schema.field(key).type):
+        # The aggregate has one row per distinct value; decode it for sorting.
+        counts = counts.set_column(0, key, counts[key].cast(counts.schema.field(key).type.value_type))
+    return counts.sort_by([(COUNT_COL, "descending"), (key, "ascending")])
+
+
+def merge_counts(tables: list[pa.Table], key: str) -> pa.Table:
+    """Add up the counts of ``key`` from several per-run_date aggregates."""
+    merged = pa.concat_tables(tables).group_by(key).aggregate([(COUNT_COL, "sum")])
+    merged = merged.select([key, f"{COUNT_COL}_sum"]).rename_columns([key, COUNT_COL])
+    return merged.sort_by([(COUNT_COL, "descending"), (key, "ascending")])
+
+
+def aggregate_vehicles(table: pa.Table) -> dict[str, pa.Table]:
+    """Compute every Gold aggregate for one Silver partition."""
+    return {name: _count_by(table, key) for name, key in AGGREGATES.items()}
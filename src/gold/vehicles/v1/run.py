@@ -0,0 +1,189 @@
+import uuid
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config import (
+    silver_path,
+    gold_path,
+    gold_metrics_path,
+    gold_manifest_path,
+)
+from src.utils.io_utils import (
+    _commit_dirs,
+    _compression_arg,
+    _hive_partitions,
+    _rmtree_force,
+    _staging_path,
+)
+from src.gold.vehicles.v1.aggregate import (
+    AGGREGATES,
+    MERGE_MODES,
+    PARTITION_COL,
+    aggregate_vehicles,
+    merge_counts,
+    scan_partition,
+    silver_dataset,
+)
+from src.metrics.metrics import _write_stage_metrics_csv
+from src.utils.instrumentation import Instrumentation
+from src.utils.manifest import PartitionManifest
+
+DATASET = "vehicles"
+VERSION = "v1"
+MERGED_DIR = "merged"
+PART_FILE = "part-0.parquet"
+
+
+def _gold_partition_dir(gold_dir: Path, table: str, run_date_str: str) -> Path:
+    return gold_dir / table / f"{PARTITION_COL}={run_date_str}"
+
+
+def _merged_dir(gold_dir: Path, table: str) -> Path:
+    return gold_dir / MERGED_DIR / table
+
+
+def _publish_tables(targets: dict[Path, pa.Table], compression: str) -> int:
+    """Stage one Parquet file per target directory, then publish them all at once.
+
+    Returns the bytes written. Nothing is published unless every table was
+    staged, so a failure leaves the previous tables intact.
+    """
+    token = uuid.uuid4().hex
+    staged = {}
+    bytes_written = 0
+    try:
+        for target, table in targets.items():
+            staged_dir = _staging_path(target, token)
+            staged_dir.mkdir(parents=True)
+            staged[target] = staged_dir
+            out = staged_dir / PART_FILE
+            pq.write_table(table, out, compression=_compression_arg(compression))
+            bytes_written += out.stat().st_size
+
+        _commit_dirs([(staged_dir, target) for target, staged_dir in staged.items()])
+    finally:
+        for staged_dir in staged.values():
+            if staged_dir.exists():
+                _rmtree_force(staged_dir)
+
+    return bytes_written
+
+
+def _merge_partitions(gold_dir: Path, keys: list[str], merge: str) -> dict[str, pa.Table]:
+    """Merged Gold tables, built from the per-run_date aggregates (never from Silver).
+
+    With ``latest`` the newest run_date is the authoritative snapshot; with
+    ``sum`` every run_date contributes its counts.
+    """
+    contributing = sorted(keys)[-1:] if merge == "latest" else sorted(keys)
+    return {
+        name: merge_counts(
+            [pq.read_table(_gold_partition_dir(gold_dir, name, k) / PART_FILE) for k in contributing], key
+        )
+        for name, key in AGGREGATES.items()
+    }
+
+
+def _drop_partition(gold_dir: Path, run_date_str: str) -> None:
+    for name in AGGREGATES:
+        target = _gold_partition_dir(gold_dir, name, run_date_str)
+        if target.exists():
+            _rmtree_force(target)
+
+
+def _drop_merged(gold_dir: Path) -> None:
+    if (gold_dir / MERGED_DIR).exists():
+        _rmtree_force(gold_dir / MERGED_DIR)
+
+
+def run(
+    run_date_str: str,
+    dry_run: bool = False,
+    full_refresh: bool = False,
+    compression: str = "snappy",
+    trace_memory: bool = False,
+    merge: str = "latest",
+) -> None:
+    """Aggregate new or changed Silver run_date partitions into the Gold tables.
+
+    Each Gold table is partitioned by the Silver run_date it was computed
+    from, so only pending partitions are scanned and only their Gold
+    partitions are replaced. The merged tables under ``merged/`` are then
+    rebuilt from those per-run_date aggregates as ``merge`` says (see
+    MERGE_MODES). The mode is recorded in the manifest, so switching it
+    rebuilds the merged tables without rescanning Silver. ``run_date_str``
+    labels the stage metrics.
+    """
+    if merge not in MERGE_MODES:
+        raise ValueError(f"Unknown merge mode {merge!r}; expected one of {MERGE_MODES}")
+    silver_dir = silver_path(DATASET, VERSION)
+    gold_dir = gold_path(DATASET, VERSION)
+    metrics_run_path = gold_metrics_path(DATASET, VERSION) / f"run_date={run_date_str}"
+    manifest = PartitionManifest.load(gold_manifest_path(DATASET, VERSION))
+    if full_refresh:
+        # Blank fingerprints make every partition pending while keeping track
+        # of the dates whose Silver partition has since been removed.
+        manifest.partitions = {key: "" for key in manifest.partitions}
+
+    instr = Instrumentation(trace_memory=trace_memory)
+    with instr.stage("discover"):
+        partitions = _hive_partitions(silver_dir, PARTITION_COL)
+        pending = manifest.pending(partitions)
+        removed = manifest.removed(partitions)
+
+    merge_changed = manifest.merge != merge
+    if not pending and not removed and not merge_changed and (gold_dir / MERGED_DIR).exists():
+        print(f"No new or changed Silver partitions in {silver_dir}; nothing to do.")
+        return
+    if merge_changed and manifest.merge is not None:
+        print(f"Merge mode changed from {manifest.merge!r} to {merge!r}; rebuilding the merged tables.")
+
+    dataset = silver_dataset(silver_dir) if pending else None
+    for key in sorted(pending):
+        with instr.stage("scan") as rec:
+            table = scan_partition(dataset, key)
+            rec.rows += table.num_rows
+
+        with instr.stage("aggregate", rows=table.num_rows):
+            tables = aggregate_vehicles(table)
+        del table
+
+        summary = ", ".join(f"{name}={t.num_rows}" for name, t in tables.items())
+        print(f"Silver partition {PARTITION_COL}={key}: {summary}")
+        if dry_run:
+            continue
+
+        with instr.stage("write") as rec:
+            targets = {_gold_partition_dir(gold_dir, name, key): t for name, t in tables.items()}
+            rec.bytes_written += _publish_tables(targets, compression)
+        manifest.record(key, pending[key])
+
+    for key in removed:
+        print(f"Silver partition {PARTITION_COL}={key} no longer exists; dropping its Gold aggregates.")
+        if not dry_run:
+            _drop_partition(gold_dir, key)
+            manifest.forget(key)
+
+    if not dry_run:
+        with instr.stage("merge") as rec:
+            if manifest.partitions:
+                merged = _merge_partitions(gold_dir, list(manifest.partitions), merge)
+                targets = {_merged_dir(gold_dir, name): t for name, t in merged.items()}
+                rec.bytes_written += _publish_tables(targets, compression)
+            else:
+                _drop_merged(gold_dir)
+        manifest.merge = merge
+
+    stage_metrics = instr.to_frame(run_date_str)
+    print("\nStage timings:")
+    print(stage_metrics.drop(columns=["run_date"]).to_string(index=False))
+    if dry_run:
+        print("[DRY-RUN] Skipping writes.")
+        return
+
+    manifest.save()
+    print(f"Gold written to: {gold_dir}")
+    _write_stage_metrics_csv(metrics_run_path, stage_metrics)
+    print(f"Stage metrics written to: {metrics_run_path / 'stages.csv'}")
@@ -1,4 +1,6 @@
 import shutil
+from typing import Optional
+
 import pandas as pd
 
 def _write_metrics_csv(metrics_path, metrics_summary: pd.DataFrame, metrics_by_reason: pd.DataFrame) -> None:
@@ -27,4 +29,28 @@ def _write_metrics_csv(metrics_path, metrics_summary: pd.DataFrame, metrics_by_r
         raise ValueError("metrics_summary must contain columns: run_date, metric, value")
 
     report = pd.concat([summary_csv, reasons_csv], ignore_index=True)
-    report.to_csv(metrics_path / "metrics.csv", index=False)
\ No newline at end of file
+    report.to_csv(metrics_path / "metrics.csv", index=False)
+
+def _write_stage_metrics_csv(metrics_path, stage_metrics: pd.DataFrame) -> None:
+    metrics_path.mkdir(parents=True, exist_ok=True)
+    stage_metrics.to_csv(metrics_path / "stages.csv", index=False)
+
+def _print_dq_summary(
+    metrics_summary: pd.DataFrame,
+    metrics_by_reason: pd.DataFrame,
+    metrics_by_rule: Optional[pd.DataFrame] = None,
+) -> None:
+    print("DQ summary:")
+    print(metrics_summary.to_string(index=False))
+
+    if metrics_by_reason is not None and not metrics_by_reason.empty:
+        print("\nDQ by reason:")
+        print(metrics_by_reason.to_string(index=False))
+
+    if metrics_by_rule is not None and not metrics_by_rule.empty:
+        print("\nDQ rule timings:")
+        print(metrics_by_rule[["rule", "severity", "flagged", "seconds"]].to_string(index=False))
+
+def _print_stage_metrics(stage_metrics: pd.DataFrame) -> None:
+    print("\nStage timings:")
+    print(stage_metrics.drop(columns=["run_date"]).to_string(index=False))
@@ -0,0 +1,142 @@
+"""Historical metrics store: one SQLite file with every run's DQ metrics.
+
+``metrics.csv`` stays the per-run artifact; the store makes questions like
+"total_quarantine over the last 90 days" a single indexed query instead of
+a glob over hundreds of CSVs. Rows are keyed by
+(dataset, version, run_date, metric, reason); re-running a run_date replaces
+its rows, mirroring how the run_date's CSV is replaced.
+"""
+import sqlite3
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    dataset TEXT NOT NULL,
+    version TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    reason TEXT NOT NULL DEFAULT '',
+    value NUMERIC,
+    PRIMARY KEY (dataset, version, run_date, metric, reason)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metrics_series
+    ON metrics (dataset, version, metric, run_date);
+"""
+
+QUERY_COLUMNS = ["dataset", "version", "run_date", "metric", "reason", "value"]
+
+
+def _connect(store_path: Path) -> sqlite3.Connection:
+    store_path = Path(store_path)
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(store_path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _metric_rows(dataset: str, version: str, metrics_summary: pd.DataFrame, metrics_by_reason: pd.DataFrame) -> list[tuple]:
+    rows = [
+        (dataset, version, str(run_date), str(metric), "", _scalar(value))
+        for run_date, metric, value in zip(
+            metrics_summary["run_date"], metrics_summary["metric"], metrics_summary["value"]
+        )
+    ]
+    if metrics_by_reason is not None and not metrics_by_reason.empty:
+        rows += [
+            (dataset, version, str(run_date), "dq_reason_count", str(reason), _scalar(count))
+            for run_date, reason, count in zip(
+                metrics_by_reason["run_date"], metrics_by_reason["reason"], metrics_by_reason["count"]
+            )
+        ]
+    return rows
+
+
+def _scalar(value):
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def record_metrics(
+    store_path: Path,
+    dataset: str,
+    version: str,
+    metrics_summary: pd.DataFrame,
+    metrics_by_reason: pd.DataFrame,
+) -> int:
+    """Replace the store's rows for the run_dates in ``metrics_summary``; returns rows written."""
+    rows = _metric_rows(dataset, version, metrics_summary, metrics_by_reason)
+    run_dates = sorted({r[2] for r in rows})
+
+    with closing(_connect(store_path)) as conn, conn:
+        conn.executemany(
+            "DELETE FROM metrics WHERE dataset = ? AND version = ? AND run_date = ?",
+            [(dataset, version, d) for d in run_dates],
+        )
+        conn.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def import_metrics_csvs(store_path: Path, metrics_dir: Path, dataset: str, version: str) -> int:
+    """Load every ``run_date=*/metrics.csv`` under ``metrics_dir`` into the store."""
+    written = 0
+    for csv_path in sorted(Path(metrics_dir).glob("run_date=*/metrics.csv")):
+        report = pd.read_csv(csv_path, dtype={"run_date": "string", "reason": "string"})
+        is_reason = report["metric"] == "dq_reason_count"
+        summary = report.loc[~is_reason, ["run_date", "metric", "value"]]
+        by_reason = report.loc[is_reason, ["run_date", "reason", "count"]]
+        written += record_metrics(store_path, dataset, version, summary, by_reason)
+    return written
+
+
+def query_metrics(
+    store_path: Path,
+    dataset: Optional[str] = None,
+    version: Optional[str] = None,
+    metrics: Optional[list[str]] = None,
+    reason: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> pd.DataFrame:
+    """Return matching rows ordered by run_date, with the QUERY_COLUMNS columns."""
+    if not Path(store_path).exists():
+        return pd.DataFrame(columns=QUERY_COLUMNS)
+
+    clauses = []
+    params: list = []
+    for column, value in (("dataset", dataset), ("version", version), ("reason", reason)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if metrics:
+        clauses.append(f"metric IN ({', '.join('?' * len(metrics))})")
+        params += list(metrics)
+    if start is not None:
+        clauses.append("run_date >= ?")
+        params.append(start.isoformat())
+    if end is not None:
+        clauses.append("run_date <= ?")
+        params.append(end.isoformat())
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"SELECT {', '.join(QUERY_COLUMNS)} FROM metrics {where} ORDER BY dataset, version, metric, reason, run_date"
+    with closing(_connect(store_path)) as conn:
+        return pd.read_sql_query(sql, conn, params=params)
+
+
+def metric_series(
+    store_path: Path,
+    dataset: str,
+    version: str,
+    metric: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> pd.Series:
+    """One metric as a Series indexed by run_date (e.g. total_quarantine over time)."""
+    df = query_metrics(store_path, dataset, version, [metric], reason="", start=start, end=end)
+    return df.set_index("run_date")["value"].rename(metric)
@@ -0,0 +1,30 @@
+from importlib import import_module
+from typing import Callable
+
+# Pipelines are registered as "module:function" strings so that the heavy
+# modules (pandas, pyarrow, DQ) are imported only when a pipeline runs.
+PIPELINES: dict[str, str] = {
+    "silver/vehicles/v1": "src.silver.vehicles.v1.run:run",
+    "silver/crashes/v1": "src.silver.crashes.v1.run:run",
+    "gold/vehicles/v1": "src.gold.vehicles.v1.run:run",
+    "silver-backfill/vehicles/v1": "src.silver.vehicles.v1.backfill:backfill",
+}
+
+
+def pipeline_key(layer: str, dataset: str, version: str) -> str:
+    return f"{layer}/{dataset}/{version}"
+
+
+def available(layer: str) -> list[str]:
+    return sorted(key for key in PIPELINES if key.startswith(f"{layer}/"))
+
+
+def load_pipeline(key: str) -> Callable:
+    """Import and return the run function registered under `key`."""
+    try:
+        target = PIPELINES[key]
+    except KeyError:
+        raise KeyError(f"Pipeline não encontrada: {key}") from None
+
+    module_name, func_name = target.split(":")
+    return getattr(import_module(module_name), func_name)
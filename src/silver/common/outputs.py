@@ -0,0 +1,123 @@
+"""Sinks and publishing shared by the Silver pipelines.
+
+A run_date writes its clean rows, quarantined rows and metrics into staged
+copies of three folders (``_staging_path``) and publishes them together with
+``_commit_dirs``, so a failed run never leaves a partial run_date behind.
+"""
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from src.config import metrics_store_path
+from src.metrics.metrics import _print_stage_metrics, _write_metrics_csv, _write_stage_metrics_csv
+from src.metrics.store import record_metrics
+from src.utils.instrumentation import Instrumentation
+from src.utils.io_utils import (
+    _commit_dirs,
+    _rmtree_force,
+    _run_concurrently,
+    _staging_path,
+    ParquetAppendWriter,
+)
+
+
+@dataclass(frozen=True)
+class RunOutputs:
+    """The clean partition, quarantine folder and metrics folder of one run_date."""
+
+    partition_dir: Path
+    quarantine_dir: Path
+    metrics_dir: Path
+    token: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    @property
+    def staged_partition_dir(self) -> Path:
+        return _staging_path(self.partition_dir, self.token)
+
+    @property
+    def staged_quarantine_dir(self) -> Path:
+        return _staging_path(self.quarantine_dir, self.token)
+
+    @property
+    def staged_metrics_dir(self) -> Path:
+        return _staging_path(self.metrics_dir, self.token)
+
+    def discard(self) -> None:
+        for staged in (self.staged_partition_dir, self.staged_quarantine_dir, self.staged_metrics_dir):
+            if staged.exists():
+                _rmtree_force(staged)
+
+    def publish(self, metrics_summary: pd.DataFrame, metrics_by_reason: pd.DataFrame) -> None:
+        """Stage metrics.csv next to the staged Parquet, then publish all three at once.
+
+        Either the clean partition, the quarantine folder and the metrics of
+        the run_date are all replaced, or (on error) none of them is.
+        """
+        try:
+            _write_metrics_csv(self.staged_metrics_dir, metrics_summary, metrics_by_reason)
+            _commit_dirs([
+                (self.staged_partition_dir, self.partition_dir),
+                (self.staged_quarantine_dir, self.quarantine_dir),
+                (self.staged_metrics_dir, self.metrics_dir),
+            ])
+        except BaseException:
+            self.discard()
+            raise
+        print(f"Silver CLEAN written to: {self.partition_dir}")
+        print(f"Silver QUARANTINE written to: {self.quarantine_dir}")
+        print(f"Metrics written to: {self.metrics_dir / 'metrics.csv'}")
+
+
+def record_run_metrics(
+    outputs: RunOutputs,
+    instr: Instrumentation,
+    dataset: str,
+    version: str,
+    run_date_str: str,
+    metrics_summary: pd.DataFrame,
+    metrics_by_reason: pd.DataFrame,
+) -> None:
+    """Upsert the DQ metrics into the metrics store and write the stage metrics."""
+    with instr.stage("metrics"):
+        record_metrics(metrics_store_path(), dataset, version, metrics_summary, metrics_by_reason)
+
+    stage_metrics = instr.to_frame(run_date_str)
+    _print_stage_metrics(stage_metrics)
+    _write_stage_metrics_csv(outputs.metrics_dir, stage_metrics)
+    print(f"Stage metrics written to: {outputs.metrics_dir / 'stages.csv'}")
+
+
+def _write_parts(writer: ParquetAppendWriter, parts) -> None:
+    for part in parts:
+        writer.write(part)
+
+
+class DQSinks:
+    """The clean and quarantine writers of a Bronze file, fed on two threads.
+
+    Arrow conversion, compression and I/O release the GIL, so both sinks
+    write each batch concurrently.
+    """
+
+    def __init__(self, clean: ParquetAppendWriter, quarantine: ParquetAppendWriter):
+        self.clean = clean
+        self.quarantine = quarantine
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="silver-sink")
+
+    def write(self, clean_parts, quarantine_parts) -> None:
+        _run_concurrently(self._pool, [
+            partial(_write_parts, self.clean, clean_parts),
+            partial(_write_parts, self.quarantine, quarantine_parts),
+        ])
+
+    def close(self) -> int:
+        """Close both writers; returns the bytes they wrote."""
+        try:
+            _run_concurrently(self._pool, [self.clean.close, self.quarantine.close])
+        finally:
+            self._pool.shutdown()
+        return self.clean.bytes_written + self.quarantine.bytes_written
@@ -0,0 +1,70 @@
+"""Bronze CSV ingest for silver/crashes/v1 (NYC Motor Vehicle Collisions - Crashes).
+
+Every column is read as ``string`` and then trimmed and typed: CRASH DATE is
+parsed as ``MM/DD/YYYY``, CRASH TIME is normalized to ``HH:MM`` and the
+person counts become nullable integers. collision_id stays text, as in
+silver/vehicles/v1, so the two tables join on the same type.
+"""
+from typing import Optional
+
+import pandas as pd
+
+from src.utils.io_utils import _assert_columns_exist, _normalize_time_to_hhmm
+
+TARGET_COLUMNS = [
+    "COLLISION_ID",
+    "CRASH DATE",
+    "CRASH TIME",
+    "BOROUGH",
+    "NUMBER OF PERSONS INJURED",
+    "NUMBER OF PERSONS KILLED",
+]
+
+RENAME_MAP = {
+    "COLLISION_ID": "collision_id",
+    "CRASH DATE": "crash_date",
+    "CRASH TIME": "crash_time",
+    "BOROUGH": "borough",
+    "NUMBER OF PERSONS INJURED": "persons_injured",
+    "NUMBER OF PERSONS KILLED": "persons_killed",
+}
+
+CRASH_DATE_FORMAT = "%m/%d/%Y"
+
+
+def _prepare_crashes(df_raw: pd.DataFrame) -> pd.DataFrame:
+    df = df_raw[TARGET_COLUMNS].rename(columns=RENAME_MAP)
+
+    for col in df.columns:
+        if df[col].dtype == "string":
+            df[col] = df[col].str.strip()
+
+    df["crash_date"] = pd.to_datetime(df["crash_date"], format=CRASH_DATE_FORMAT, errors="coerce")
+    df["crash_time"] = _normalize_time_to_hhmm(df["crash_time"])
+    for col in ("persons_injured", "persons_killed"):
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    return df
+
+
+def iter_raw_frames(bronze_file, chunk_size: Optional[int] = None):
+    """Yield unprepared Bronze batches as string DataFrames."""
+    header = pd.read_csv(bronze_file, dtype="string", nrows=0)
+    _assert_columns_exist(header, TARGET_COLUMNS)
+
+    if not chunk_size:
+        yield pd.read_csv(bronze_file, dtype="string", usecols=TARGET_COLUMNS)
+        return
+
+    with pd.read_csv(bronze_file, dtype="string", usecols=TARGET_COLUMNS, chunksize=chunk_size) as reader:
+        yield from reader
+
+
+def prepare_frame(raw: pd.DataFrame) -> pd.DataFrame:
+    return _prepare_crashes(raw)
+
+
+def read_crashes(bronze_file) -> pd.DataFrame:
+    return pd.concat(
+        [prepare_frame(raw) for raw in iter_raw_frames(bronze_file)],
+        ignore_index=True,
+    )
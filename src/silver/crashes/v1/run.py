@@ -0,0 +1,175 @@
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.config import (
+    bronze_catalog_path,
+    bronze_path,
+    silver_path,
+    quarantine_path,
+    silver_metrics_path,
+    silver_id_index_path,
+)
+from src.utils.io_utils import ParquetAppendWriter
+from src.dq.apply import merge_dq_metrics, merge_rule_metrics
+from src.dq.silver.crashes.v1.dq import apply_quality_rules_crashes
+from src.metrics.metrics import _print_dq_summary, _print_stage_metrics
+from src.utils.id_index import IdIndex, partition_ids
+from src.utils.instrumentation import Instrumentation
+from src.utils.manifest import BronzeCatalog
+from src.silver.common.outputs import DQSinks, RunOutputs, record_run_metrics
+from src.silver.crashes.v1.ingest import TARGET_COLUMNS, iter_raw_frames, prepare_frame
+
+DATASET = "crashes"
+VERSION = "v1"
+PARTITION_COL = "run_date"
+ID_COLUMN = "collision_id"
+
+
+def crash_id_index_path() -> Path:
+    """Where the collision_id index of this table lives (read by vehicles DQ)."""
+    return silver_id_index_path(DATASET, VERSION, ID_COLUMN)
+
+
+def _process_file(
+    bronze_file: Path,
+    run_date_str: str,
+    instr: Instrumentation,
+    chunk_size: Optional[int] = None,
+    clean_file: Optional[Path] = None,
+    quarantine_file: Optional[Path] = None,
+    compression: str = "snappy",
+    row_group_size: Optional[int] = None,
+) -> tuple[list, list, list]:
+    """Run DQ over one Bronze file, streaming clean/quarantine rows to the given paths.
+
+    Nothing is written when the paths are None (dry run). Returns the
+    per-batch summary, by-reason and by-rule metrics.
+    """
+    sinks = None
+    if clean_file is not None:
+        options = {"row_group_size": row_group_size, "compression": compression}
+        sinks = DQSinks(
+            ParquetAppendWriter(clean_file, drop_columns=[PARTITION_COL], **options),
+            ParquetAppendWriter(quarantine_file, **options),
+        )
+
+    summaries, by_reasons, by_rules = [], [], []
+    raw_frames = iter_raw_frames(bronze_file, chunk_size)
+    try:
+        while True:
+            with instr.stage("parse") as rec:
+                raw = next(raw_frames, None)
+                rec.rows += len(raw) if raw is not None else 0
+            if raw is None:
+                break
+
+            with instr.stage("prepare", rows=len(raw)):
+                df = prepare_frame(raw)
+            del raw
+
+            with instr.stage("dq", rows=len(df)):
+                dq = apply_quality_rules_crashes(df, run_date_str=run_date_str)
+            summaries.append(dq.metrics_summary)
+            by_reasons.append(dq.metrics_by_reason)
+            by_rules.append(dq.metrics_by_rule)
+
+            if sinks is not None:
+                with instr.stage("write", rows=len(df)):
+                    sinks.write(dq.batches("clean"), dq.batches("quarantine"))
+    finally:
+        raw_frames.close()
+        if sinks is not None:
+            with instr.stage("write") as rec:
+                rec.bytes_written += sinks.close()
+
+    return summaries, by_reasons, by_rules
+
+
+def run(
+    run_date_str: str,
+    variant: str = "full",
+    dry_run: bool = False,
+    chunk_size: Optional[int] = None,
+    files_glob: Optional[str] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    compression: str = "snappy",
+    row_group_size: Optional[int] = None,
+    trace_memory: bool = False,
+    rescan: bool = False,
+) -> None:
+    """Load Bronze crashes into the run_date partition and index its collision_ids.
+
+    After publishing, the collision_ids of every crash that was not
+    discarded (clean or quarantined: a crash with a bad date or time still
+    happened) are written as this run_date's shard of the crashes IdIndex,
+    which the vehicles ``orphan_collision_id`` rule probes without
+    re-reading crashes.
+    """
+    bronze_dir = bronze_path(DATASET, variant)
+    outputs = RunOutputs(
+        partition_dir=silver_path(DATASET, VERSION) / f"{PARTITION_COL}={run_date_str}",
+        quarantine_dir=quarantine_path(DATASET, VERSION) / f"run_date={run_date_str}",
+        metrics_dir=silver_metrics_path(DATASET, VERSION) / f"run_date={run_date_str}",
+    )
+
+    instr = Instrumentation(trace_memory=trace_memory)
+    with instr.stage("discover"):
+        catalog = BronzeCatalog.load(bronze_catalog_path(DATASET, variant), bronze_dir)
+        if catalog.refresh(force=rescan) and not dry_run:
+            catalog.save()
+        if files_glob is not None or from_date is not None or to_date is not None:
+            files = catalog.files(files_glob or "*.csv", from_date, to_date)
+        else:
+            files = [catalog.latest()]
+    if not files:
+        raise FileNotFoundError(f"No CSV matching the selection found in {bronze_dir}")
+    catalog.check_columns(files, TARGET_COLUMNS)
+
+    summaries = []
+    by_reasons = []
+    by_rules = []
+    try:
+        for bronze_file in files:
+            print(f"Reading Bronze file: {bronze_file}")
+            file_summaries, file_by_reasons, file_by_rules = _process_file(
+                bronze_file,
+                run_date_str,
+                instr,
+                chunk_size=chunk_size,
+                clean_file=None if dry_run else outputs.staged_partition_dir / f"part-{bronze_file.stem}.parquet",
+                quarantine_file=None if dry_run else outputs.staged_quarantine_dir / f"part-{bronze_file.stem}.parquet",
+                compression=compression,
+                row_group_size=row_group_size,
+            )
+            summaries += file_summaries
+            by_reasons += file_by_reasons
+            by_rules += file_by_rules
+    except BaseException:
+        outputs.discard()
+        raise
+
+    metrics_summary, metrics_by_reason = merge_dq_metrics(summaries, by_reasons, run_date_str)
+    _print_dq_summary(metrics_summary, metrics_by_reason, merge_rule_metrics(by_rules, run_date_str))
+
+    if dry_run:
+        _print_stage_metrics(instr.to_frame(run_date_str))
+        print("[DRY-RUN] Skipping writes.")
+        return
+
+    with instr.stage("publish"):
+        outputs.publish(metrics_summary, metrics_by_reason)
+
+    with instr.stage("index") as rec:
+        ids = np.concatenate([
+            partition_ids(outputs.partition_dir, ID_COLUMN),
+            partition_ids(outputs.quarantine_dir, ID_COLUMN),
+        ])
+        rec.rows += len(ids)
+        shard = IdIndex(crash_id_index_path()).write_shard(run_date_str, ids)
+    print(f"collision_id index written to: {shard}")
+
+    record_run_metrics(outputs, instr, DATASET, VERSION, run_date_str, metrics_summary, metrics_by_reason)
@@ -0,0 +1,161 @@
+"""Multi-date backfill for silver/vehicles/v1.
+
+A backfill of [from_date, to_date] produces what one ``silver run`` per date
+would: run_date D is loaded from the Bronze drop(s) dated D (the YYYYMMDD in
+the file name), and dates without a drop are left untouched. Instead of N
+processes it does:
+
+1. plan: the dated drops in the range, minus the run_dates a previous,
+   interrupted backfill of the same plan already published (checkpoint);
+2. load: each date's drops go through the usual prepare / normalize / DQ /
+   write path on a process pool, each drop parsed once, and the date is
+   published as its own run_date partition as soon as it is ready.
+
+The checkpoint is updated after each published date, so rerunning the same
+command after a failure only loads the dates that are still missing.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from datetime import date, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.config import (
+    bronze_path,
+    silver_backfill_checkpoint_path,
+    silver_metrics_path,
+    silver_path,
+    silver_vocabulary_path,
+    quarantine_path,
+)
+from src.metrics.metrics import _print_stage_metrics
+from src.utils.instrumentation import Instrumentation
+from src.utils.io_utils import _file_date
+from src.utils.manifest import BackfillCheckpoint
+from src.silver.vehicles.v1.run import (
+    DATASET,
+    VERSION,
+    FileResult,
+    RunContext,
+    _finish_run,
+    _process_files,
+    check_bronze_schema,
+    open_bronze_catalog,
+)
+
+
+def plan_dates(from_date: date, to_date: date) -> list[str]:
+    if to_date < from_date:
+        raise ValueError(f"Empty backfill range: {from_date} > {to_date}")
+    days = (to_date - from_date).days + 1
+    return [(from_date + timedelta(days=i)).isoformat() for i in range(days)]
+
+
+def drops_by_date(files: list[Path]) -> dict[str, list[Path]]:
+    """Group dated Bronze drops by the run_date they load (undated files are skipped)."""
+    drops = {}
+    for f in sorted(files):
+        d = _file_date(f)
+        if d is not None:
+            drops.setdefault(d.isoformat(), []).append(f)
+    return drops
+
+
+def backfill(
+    from_date: date,
+    to_date: date,
+    variant: str = "full",
+    files_glob: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    workers: int = 1,
+    compression: str = "snappy",
+    row_group_size: Optional[int] = None,
+    trace_memory: bool = False,
+    restart: bool = False,
+) -> None:
+    """Load every run_date in [from_date, to_date] from the Bronze drop dated that day.
+
+    The same as ``silver run --run-date D --from D --to D`` for each date D
+    (restricted to ``files_glob`` if given), with the dates loaded on
+    ``workers`` processes.
+    """
+    dates = plan_dates(from_date, to_date)
+    bronze_dir = bronze_path(DATASET, variant)
+    catalog = open_bronze_catalog(bronze_dir, variant)
+    drops = drops_by_date(catalog.files(files_glob or "*.csv", from_date, to_date))
+    if not drops:
+        raise FileNotFoundError(f"No Bronze drop dated {dates[0]}..{dates[-1]} found in {bronze_dir}")
+    files = [f for d in sorted(drops) for f in drops[d]]
+    check_bronze_schema(files)
+
+    checkpoint = BackfillCheckpoint.load(silver_backfill_checkpoint_path(DATASET, VERSION))
+    plan = BackfillCheckpoint.make_plan(dates[0], dates[-1], files)
+    if restart or not checkpoint.matches(plan):
+        checkpoint.restart(plan)
+    pending = [d for d in sorted(drops) if d not in checkpoint.done]
+    print(f"Backfill plan: {len(drops)} of {len(dates)} run_dates have a Bronze drop, {len(pending)} pending")
+    if not pending:
+        print("Nothing to backfill.")
+        return
+
+    parallel = workers > 1 and len(pending) > 1
+    instr = Instrumentation(trace_memory=trace_memory)
+    base = RunContext(
+        run_date_str=pending[0],
+        silver_dir=silver_path(DATASET, VERSION),
+        quarantine_dir=quarantine_path(DATASET, VERSION),
+        metrics_dir=silver_metrics_path(DATASET, VERSION),
+        vocabulary_path=silver_vocabulary_path(DATASET, VERSION),
+        chunk_size=chunk_size,
+        engine="arrow",
+        workers=1 if parallel else workers,
+        compression=compression,
+        row_group_size=row_group_size,
+        trace_memory=trace_memory,
+    )
+    jobs = [(replace(base, run_date_str=d), drops[d]) for d in pending]
+
+    failed = []
+    with instr.stage("load") as rec:
+        if parallel:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                futures = {pool.submit(_process_files, ctx, date_files): ctx for ctx, date_files in jobs}
+                for future in as_completed(futures):
+                    rec.rows += _publish_date(checkpoint, futures[future], future.result, failed)
+        else:
+            for ctx, date_files in jobs:
+                rec.rows += _publish_date(checkpoint, ctx, partial(_process_files, ctx, date_files), failed)
+
+    checkpoint.save()
+    _print_stage_metrics(instr.to_frame(f"{dates[0]}..{dates[-1]}"))
+    if failed:
+        raise RuntimeError(
+            f"Backfill failed for {len(failed)} run_date(s): {', '.join(sorted(failed))}; "
+            "rerun the same command to resume."
+        )
+    print(f"Backfilled {len(jobs)} run_dates.")
+
+
+def _publish_date(
+    checkpoint: BackfillCheckpoint,
+    ctx: RunContext,
+    load: Callable[[], list[FileResult]],
+    failed: list[str],
+) -> int:
+    """Publish one run_date and record it in the checkpoint; returns its row count.
+
+    A failed date is reported and left out of the checkpoint so that the
+    other dates still get published and a rerun retries it.
+    """
+    try:
+        results = load()
+        _finish_run(ctx, Instrumentation(trace_memory=ctx.trace_memory), results)
+    except Exception as exc:
+        print(f"[BACKFILL] run_date={ctx.run_date_str} failed: {exc!r}")
+        ctx.outputs.discard()
+        failed.append(ctx.run_date_str)
+        return 0
+    checkpoint.mark_done(ctx.run_date_str)
+    checkpoint.save()
+    return sum(r.rows for r in results)
@@ -0,0 +1,299 @@
+"""Bronze CSV ingest for silver/vehicles/v1.
+
+Three engines produce the same typed frame (see docs/uml/silver/data_dictionary.md):
+
+* ``pandas``: ``pd.read_csv`` with every column as ``string``, then strip and
+  cast the integer columns with the same Arrow kernel as the other engines.
+* ``arrow``: multithreaded ``pyarrow.csv`` projected to ``TARGET_COLUMNS``, with
+  trimming and casting done by Arrow compute kernels.
+* ``stream``: the ``arrow`` preparation over the streaming ``pyarrow.csv``
+  reader, for files larger than memory. The file is never materialized: it
+  is always processed in batches of ``chunk_size`` (``STREAM_BATCH_ROWS`` by
+  default), and the next batch is parsed on a background thread while the
+  current one goes through DQ and the writers, so peak memory depends on the
+  batch size only.
+
+With an ``ArrowCache`` the projected string columns are parsed once (with the
+Arrow reader) into a memory-mapped IPC file and later runs read that instead;
+cached batches are Arrow tables and are prepared by the Arrow kernels.
+
+Bronze headers may name a column through one of the aliases in RENAME_MAP;
+every reader projects the header's own names and renames them to
+TARGET_COLUMNS (``source_columns`` / ``_canonical``).
+
+``normalize_frame`` then casefolds the low-cardinality text columns and maps
+them through the persisted vocabulary into ``category`` columns.
+"""
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.utils.io_utils import _assert_columns_exist, _read_csv_arrow, _iter_csv_arrow, _prefetch
+from src.utils.arrow_cache import ArrowCache
+from src.utils.vocabulary import Vocabulary
+
+ENGINES = ("pandas", "arrow", "stream")
+
+# Batch size of the stream engine when no chunk size is given.
+STREAM_BATCH_ROWS = 1 << 19
+
+TARGET_COLUMNS = [
+    "UNIQUE_ID",
+    "COLLISION_ID",
+    "VEHICLE_TYPE",
+    "VEHICLE_MAKE",
+    "VEHICLE_YEAR",
+]
+
+RENAME_MAP = {
+    "UNIQUE_ID": "unique_id",
+    "COLLISION_ID": "collision_id",
+    "VEHICLE_TYPE": "vehicle_type",
+    "VEHICLE_MAKE": "vehicle_make",
+    "VEHICLE_YEAR": "vehicle_year",
+    # Aliases of the columns above in other exports of the dataset: the
+    # Socrata API field names and the spaced headers of the crashes export.
+    # A Bronze file is read through an alias only when the column itself is
+    # absent; new aliases found by the schema pre-flight are added here.
+    "unique_id": "unique_id",
+    "collision_id": "collision_id",
+    "vehicle_type": "vehicle_type",
+    "vehicle_make": "vehicle_make",
+    "vehicle_year": "vehicle_year",
+    "UNIQUE ID": "unique_id",
+    "COLLISION ID": "collision_id",
+    "VEHICLE TYPE": "vehicle_type",
+    "VEHICLE MAKE": "vehicle_make",
+    "VEHICLE YEAR": "vehicle_year",
+}
+
+# Alias -> the TARGET_COLUMNS name it stands for.
+BRONZE_ALIASES = {
+    alias: next(t for t in TARGET_COLUMNS if RENAME_MAP[t] == name)
+    for alias, name in RENAME_MAP.items()
+    if alias not in TARGET_COLUMNS
+}
+
+# Everything that shapes a cached Bronze entry; changing it misses the cache.
+CACHE_CONTRACT = {
+    "columns": TARGET_COLUMNS,
+    "rename": RENAME_MAP,
+    "raw_type": "string",
+    "format": 2,
+}
+
+_RAW_SCHEMA = pa.schema([(c, pa.string()) for c in TARGET_COLUMNS])
+
+# collision_id is not part of the data dictionary and has always been kept as
+# text in Silver, so both engines leave it as a string.
+SILVER_SCHEMA = pa.schema(
+    [
+        ("unique_id", pa.int64()),
+        ("collision_id", pa.string()),
+        ("vehicle_type", pa.string()),
+        ("vehicle_make", pa.string()),
+        ("vehicle_year", pa.int64()),
+    ]
+)
+
+# Free-text columns with a small set of distinct values, stored as category
+# (Arrow dictionary) after normalization.
+CATEGORICAL_COLUMNS = ["vehicle_type", "vehicle_make"]
+
+_INTEGER_PATTERN = r"^[+-]?[0-9]{1,18}(\.0*)?$"
+_NUMBER_PATTERN = r"^[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?$"
+
+# Value kind expected in each Bronze column, checked by the schema pre-flight.
+BRONZE_KINDS = {
+    raw_name: "integer" if field.type == pa.int64() else "text"
+    for raw_name, field in zip(TARGET_COLUMNS, SILVER_SCHEMA)
+}
+
+_PANDAS_TYPES = {
+    pa.int64(): pd.Int64Dtype(),
+    pa.string(): pd.StringDtype(),
+    pa.large_string(): pd.StringDtype(),
+}
+
+
+def source_columns(header_columns) -> list[str]:
+    """The header names holding TARGET_COLUMNS (in that order), aliases resolved."""
+    header_columns = list(header_columns)
+    source = []
+    for target in TARGET_COLUMNS:
+        if target not in header_columns:
+            target = next((a for a, t in BRONZE_ALIASES.items() if t == target and a in header_columns), target)
+        source.append(target)
+    _assert_columns_exist(pd.DataFrame(columns=header_columns), source)
+    return source
+
+
+def _check_header(bronze_file) -> list[str]:
+    return source_columns(pd.read_csv(bronze_file, dtype="string", nrows=0).columns)
+
+
+def _canonical(raw, source: list[str]):
+    """Rename the ``source`` columns of a Bronze batch to TARGET_COLUMNS."""
+    if source == TARGET_COLUMNS:
+        return raw
+    if isinstance(raw, pd.DataFrame):
+        return raw.rename(columns=dict(zip(source, TARGET_COLUMNS)))
+    return raw.select(source).rename_columns(TARGET_COLUMNS)
+
+
+def _prepare_vehicles(df_raw: pd.DataFrame) -> pd.DataFrame:
+    df = df_raw[TARGET_COLUMNS].rename(columns=RENAME_MAP)
+
+    for col in df.columns:
+        if df[col].dtype == "string":
+            df[col] = df[col].str.strip()
+
+    for col in ("vehicle_year", "unique_id"):
+        values = _to_int64(pa.array(df[col], type=pa.string()))
+        df[col] = pd.Series(values.to_pandas(types_mapper=_PANDAS_TYPES.get).array, index=df.index)
+    return df
+
+
+def _to_int64(arr):
+    # The integer rule of every engine: integer literals (optionally with a
+    # ".0" suffix) are cast exactly, other decimal or exponent literals ("1e3")
+    # only when their value is integral and fits int64; anything else, such as
+    # "2010.5", "inf" or "0x10", becomes null.
+    null = pa.scalar(None, pa.string())
+    exact = pc.match_substring_regex(arr, _INTEGER_PATTERN)
+    digits = pc.if_else(exact, pc.replace_substring_regex(arr, r"^\+|\.0*$", ""), null).cast(pa.int64())
+
+    number = pc.and_not(pc.match_substring_regex(arr, _NUMBER_PATTERN), exact)
+    floats = pc.if_else(number, arr, null).cast(pa.float64())
+    integral = pc.and_(pc.equal(pc.floor(floats), floats), pc.less(pc.abs(floats), 2.0**63))
+    rounded = pc.if_else(integral, floats, pa.scalar(None, pa.float64())).cast(pa.int64())
+    return pc.coalesce(digits, rounded)
+
+
+def _prepare_vehicles_arrow(table) -> pd.DataFrame:
+    columns = []
+    for raw_name, field in zip(TARGET_COLUMNS, SILVER_SCHEMA):
+        col = pc.utf8_trim_whitespace(table.column(raw_name))
+        if field.type == pa.int64():
+            col = _to_int64(col)
+        columns.append(col)
+
+    typed = pa.Table.from_arrays(columns, schema=SILVER_SCHEMA)
+    return typed.to_pandas(types_mapper=_PANDAS_TYPES.get)
+
+
+def _read_raw(bronze_file, engine: str):
+    if engine in ("arrow", "stream"):
+        source = _check_header(bronze_file)
+        return _canonical(_read_csv_arrow(bronze_file, source), source)
+
+    df_raw = pd.read_csv(bronze_file, dtype="string", low_memory=False)
+    return _canonical(df_raw, source_columns(df_raw.columns))
+
+
+def _rechunk(batches, chunk_size: int):
+    pending = []
+    pending_rows = 0
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= chunk_size:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, chunk_size)
+            rest = table.slice(chunk_size)
+            pending = rest.to_batches()
+            pending_rows = rest.num_rows
+
+    if pending_rows:
+        yield pa.Table.from_batches(pending)
+
+
+def _iter_arrow_chunks(bronze_file, chunk_size: int, source: list[str] = TARGET_COLUMNS):
+    for table in _rechunk(_iter_csv_arrow(bronze_file, source), chunk_size):
+        yield _canonical(table, source)
+
+
+def _iter_stream_chunks(bronze_file, chunk_size: int, source: list[str] = TARGET_COLUMNS):
+    yield from _prefetch(_iter_arrow_chunks(bronze_file, chunk_size, source))
+
+
+def _iter_cached(bronze_file, chunk_size: Optional[int], cache: ArrowCache):
+    key = cache.key(bronze_file, CACHE_CONTRACT)
+    reader = cache.open(key)
+    if reader is None:
+        source = _check_header(bronze_file)
+        with cache.writer(key, _RAW_SCHEMA) as writer:
+            for batch in _iter_csv_arrow(bronze_file, source):
+                writer.write_batch(_canonical(batch, source).cast(_RAW_SCHEMA))
+        reader = cache.open(key)
+    else:
+        print(f"Bronze cache hit: {bronze_file.name}")
+
+    if not chunk_size:
+        yield reader.read_all()
+        return
+
+    batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    yield from _rechunk(batches, chunk_size)
+
+
+def iter_raw_frames(
+    bronze_file,
+    chunk_size: Optional[int] = None,
+    engine: str = "pandas",
+    cache: Optional[ArrowCache] = None,
+):
+    """Yield unprepared Bronze batches: string DataFrames (pandas) or Arrow tables (arrow, cache)."""
+    if cache is not None:
+        yield from _iter_cached(Path(bronze_file), chunk_size, cache)
+        return
+
+    if engine == "stream":
+        source = _check_header(bronze_file)
+        yield from _iter_stream_chunks(bronze_file, chunk_size or STREAM_BATCH_ROWS, source)
+        return
+
+    if not chunk_size:
+        yield _read_raw(bronze_file, engine)
+        return
+
+    source = _check_header(bronze_file)
+
+    if engine == "arrow":
+        yield from _iter_arrow_chunks(bronze_file, chunk_size, source)
+        return
+
+    with pd.read_csv(bronze_file, dtype="string", usecols=source, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            yield _canonical(chunk, source)
+
+
+def prepare_frame(raw, engine: str = "pandas") -> pd.DataFrame:
+    if engine != "pandas" or isinstance(raw, pa.Table):
+        return _prepare_vehicles_arrow(raw)
+    return _prepare_vehicles(raw)
+
+
+def normalize_frame(df: pd.DataFrame, vocabulary: Vocabulary) -> tuple[pd.DataFrame, dict[str, list[str]]]:
+    """Canonicalize CATEGORICAL_COLUMNS; returns the frame and the unseen vocabulary keys."""
+    new_keys = {}
+    for col in CATEGORICAL_COLUMNS:
+        df[col], new_keys[col] = vocabulary.canonicalize(df[col], col)
+    return df, new_keys
+
+
+def read_vehicles(bronze_file, engine: str = "pandas") -> pd.DataFrame:
+    return prepare_frame(_read_raw(bronze_file, engine), engine)
+
+
+def iter_vehicle_frames(
+    bronze_file,
+    chunk_size: Optional[int] = None,
+    engine: str = "pandas",
+    cache: Optional[ArrowCache] = None,
+):
+    for raw in iter_raw_frames(bronze_file, chunk_size, engine, cache):
+        yield prepare_frame(raw, engine)
@@ -0,0 +1,13 @@
+from typing import Optional
+
+from src.config import silver_path
+from src.utils.parquet_lookup import LookupResult, lookup
+
+
+def vehicles_for_collision(
+    collision_id,
+    run_dates: Optional[list[str]] = None,
+    columns: Optional[list[str]] = None,
+) -> LookupResult:
+    """Silver vehicles of one collision, reading only the row groups that can hold it."""
+    return lookup(silver_path("vehicles", "v1"), "collision_id", collision_id, columns, run_dates)
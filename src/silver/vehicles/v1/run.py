@@ -1,76 +1,507 @@
+import itertools
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
 import pandas as pd
 
-from src.config import bronze_path, silver_path, quarantine_path, silver_metrics_path
-from src.utils.io_utils import find_latest_csv, _assert_columns_exist, _write_parquet_overwrite
-from src.dq.silver.vehicles.v1.dq import apply_quality_rules_vehicles
-from src.metrics.metrics import _write_metrics_csv
+from src.config import (
+    BRONZE_CACHE_MAX_BYTES,
+    bronze_cache_path,
+    bronze_catalog_path,
+    bronze_path,
+    silver_path,
+    quarantine_path,
+    silver_metrics_path,
+    silver_manifest_path,
+    silver_bronze_schema_path,
+    silver_id_index_path,
+    silver_vocabulary_path,
+)
+from src.utils.io_utils import (
+    _hive_partitions,
+    _sample_csv,
+    ParquetAppendWriter,
+)
+from src.dq.silver.vehicles.v1.dq import (
+    apply_quality_rules_vehicles,
+    merge_dq_metrics,
+    merge_rule_metrics,
+    vehicle_rules,
+)
+from src.metrics.metrics import _print_dq_summary, _print_stage_metrics
+from src.dq.preview import estimate_rates
+from src.utils.instrumentation import Instrumentation
+from src.utils.arrow_cache import ArrowCache
+from src.utils.id_index import IdIndex, partition_ids, sync_shards
+from src.utils.manifest import BronzeCatalog, BronzeManifest
+from src.utils.schema_drift import SchemaFingerprint, check_schema
+from src.utils.vocabulary import Vocabulary
+from src.silver.common.outputs import DQSinks, RunOutputs, record_run_metrics
+from src.silver.vehicles.v1.ingest import (
+    BRONZE_ALIASES,
+    BRONZE_KINDS,
+    ENGINES,
+    SILVER_SCHEMA,
+    _canonical,
+    _check_header,
+    iter_raw_frames,
+    normalize_frame,
+    prepare_frame,
+)
 
 DATASET = "vehicles"
 VERSION = "v1"
 PARTITION_COL = "run_date"
 
-TARGET_COLUMNS = [
-    "UNIQUE_ID",
-    "COLLISION_ID",
-    "VEHICLE_TYPE",
-    "VEHICLE_MAKE",
-    "VEHICLE_YEAR",
-]
-
-RENAME_MAP = {
-    "UNIQUE_ID": "unique_id",
-    "COLLISION_ID": "collision_id",
-    "VEHICLE_TYPE": "vehicle_type",
-    "VEHICLE_MAKE": "vehicle_make",
-    "VEHICLE_YEAR": "vehicle_year",
-}
-
-def run(run_date_str: str, variant: str = "full", dry_run: bool = False) -> None:
+# Bronze rows sampled by a dry run unless --full-scan is given.
+PREVIEW_SAMPLE_ROWS = 20_000
+
+# Clean rows are sorted by SORT_KEY within each written batch, and row groups
+# are kept small, so min/max statistics let readers skip most row groups
+# when filtering on ids (see src/utils/parquet_lookup.py).
+SORT_KEY = ("collision_id", "unique_id")
+ROW_GROUP_ROWS = 128 * 1024
+BLOOM_FILTER_COLUMNS = ("collision_id", "unique_id")
+
+
+@dataclass(frozen=True)
+class RunContext:
+    run_date_str: str
+    silver_dir: Path
+    quarantine_dir: Path
+    metrics_dir: Path
+    vocabulary_path: Path
+    chunk_size: Optional[int] = None
+    engine: str = "pandas"
+    dry_run: bool = False
+    workers: int = 1
+    compression: str = "snappy"
+    row_group_size: Optional[int] = None
+    trace_memory: bool = False
+    cache: Optional[ArrowCache] = None
+    id_index_dir: Optional[Path] = None
+    crash_index_dir: Optional[Path] = None
+    full_scan: bool = False
+    sample_rows: int = PREVIEW_SAMPLE_ROWS
+    sort_by: tuple[str, ...] = SORT_KEY
+    bloom_filters: bool = False
+    staging_token: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    @property
+    def partition_dir(self) -> Path:
+        return self.silver_dir / f"{PARTITION_COL}={self.run_date_str}"
+
+    @property
+    def quarantine_run_path(self) -> Path:
+        return self.quarantine_dir / f"run_date={self.run_date_str}"
+
+    @property
+    def metrics_run_path(self) -> Path:
+        return self.metrics_dir / f"run_date={self.run_date_str}"
+
+    @property
+    def outputs(self) -> RunOutputs:
+        return RunOutputs(self.partition_dir, self.quarantine_run_path, self.metrics_run_path, self.staging_token)
+
+
+@dataclass(frozen=True)
+class FileResult:
+    bronze_file: Path
+    rows: int
+    metrics_summary: pd.DataFrame
+    metrics_by_reason: pd.DataFrame
+    metrics_by_rule: pd.DataFrame
+    stage_metrics: pd.DataFrame
+    new_vocabulary: dict[str, list[str]] = field(default_factory=dict)
+
+
+def run(
+    run_date_str: str,
+    variant: str = "full",
+    dry_run: bool = False,
+    chunk_size: Optional[int] = None,
+    incremental: bool = False,
+    engine: str = "pandas",
+    files_glob: Optional[str] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    workers: int = 1,
+    compression: str = "snappy",
+    row_group_size: Optional[int] = None,
+    trace_memory: bool = False,
+    cache: bool = False,
+    cache_max_bytes: int = BRONZE_CACHE_MAX_BYTES,
+    dedup: bool = False,
+    check_collisions: bool = False,
+    full_scan: bool = False,
+    sample_rows: int = PREVIEW_SAMPLE_ROWS,
+    sort_by: tuple[str, ...] = SORT_KEY,
+    bloom_filters: bool = False,
+    rescan: bool = False,
+) -> None:
+    """Load Bronze vehicles into the run_date partition.
+
+    A dry run only previews the DQ outcome from a random sample of
+    ``sample_rows`` Bronze rows; ``full_scan`` runs the full DQ pass instead
+    (still without writing). Clean rows are sorted by ``sort_by`` within each
+    write batch (empty to keep Bronze order); ``bloom_filters`` writes bloom filters on the id
+    columns. Bronze files are looked up in the BronzeCatalog; ``rescan``
+    re-stats every file instead of trusting the folder mtime.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown ingest engine {engine!r}; expected one of {ENGINES}")
+    unknown = [c for c in sort_by if c not in SILVER_SCHEMA.names]
+    if unknown:
+        raise ValueError(f"Unknown sort column(s) {unknown}; expected some of {SILVER_SCHEMA.names}")
+    if dry_run and not full_scan and (dedup or check_collisions):
+        raise ValueError("--dedup and --check-collisions are not estimated by a sampled --dry-run; add --full-scan")
+
     bronze_dir = bronze_path(DATASET, variant)
+    ctx = RunContext(
+        run_date_str=run_date_str,
+        silver_dir=silver_path(DATASET, VERSION),
+        quarantine_dir=quarantine_path(DATASET, VERSION),
+        metrics_dir=silver_metrics_path(DATASET, VERSION),
+        vocabulary_path=silver_vocabulary_path(DATASET, VERSION),
+        chunk_size=chunk_size,
+        engine=engine,
+        dry_run=dry_run,
+        workers=workers,
+        compression=compression,
+        row_group_size=row_group_size,
+        trace_memory=trace_memory,
+        cache=ArrowCache(bronze_cache_path(DATASET, variant), cache_max_bytes) if cache else None,
+        id_index_dir=silver_id_index_path(DATASET, VERSION, "unique_id") if dedup else None,
+        crash_index_dir=silver_id_index_path("crashes", "v1", "collision_id") if check_collisions else None,
+        full_scan=full_scan,
+        sample_rows=sample_rows,
+        sort_by=tuple(sort_by),
+        bloom_filters=bloom_filters,
+    )
+    instr = Instrumentation(trace_memory=trace_memory)
+    multi_file = incremental or files_glob is not None or from_date is not None or to_date is not None
+
+    with instr.stage("discover"):
+        catalog = open_bronze_catalog(bronze_dir, variant, rescan=rescan, save=not dry_run)
+        if multi_file:
+            candidates = catalog.files(files_glob or "*.csv", from_date, to_date)
+        else:
+            candidates = [catalog.latest()]
 
-    silver_dir = silver_path(DATASET, VERSION)
-    quarantine_dir = quarantine_path(DATASET, VERSION)
-    metrics_dir = silver_metrics_path(DATASET, VERSION)
+    if incremental:
+        _run_incremental(ctx, instr, bronze_dir, candidates)
+        return
+
+    if not candidates:
+        raise FileNotFoundError(f"No CSV matching the selection found in {bronze_dir}")
+    with instr.stage("preflight"):
+        check_bronze_schema(candidates, save=not dry_run)
+    if ctx.dry_run and not ctx.full_scan:
+        _preview_files(ctx, candidates)
+        return
+    for f in candidates:
+        print(f"Reading Bronze file: {f}")
 
-    bronze_file = find_latest_csv(bronze_dir)
-    print(f"Reading Bronze file: {bronze_file}")
+    results = _process_files(ctx, candidates)
+    _finish_run(ctx, instr, results)
 
-    df_raw = pd.read_csv(bronze_file, dtype="string", low_memory=False)
 
-    _assert_columns_exist(df_raw, TARGET_COLUMNS)
-    df = df_raw[TARGET_COLUMNS].copy().rename(columns=RENAME_MAP)
+def open_bronze_catalog(bronze_dir: Path, variant: str, rescan: bool = False, save: bool = True) -> BronzeCatalog:
+    """Load and refresh the vehicles BronzeCatalog (saved when it was rescanned)."""
+    catalog = BronzeCatalog.load(bronze_catalog_path(DATASET, variant), bronze_dir)
+    if catalog.refresh(force=rescan) and save:
+        catalog.save()
+    return catalog
 
-    for col in df.columns:
-        if df[col].dtype == "string":
-            df[col] = df[col].str.strip()
 
-    df["vehicle_year"] = pd.to_numeric(df["vehicle_year"], errors="coerce").astype("Int64")
-    df["unique_id"] = pd.to_numeric(df["unique_id"], errors="coerce").astype("Int64")
+def check_bronze_schema(files: list[Path], save: bool = True) -> None:
+    """Schema pre-flight: classify each file's drift from its header and first rows.
 
-    dq = apply_quality_rules_vehicles(df, run_date_str=run_date_str)
+    Drift is reported against the fingerprint of the last accepted file;
+    requires-mapping or breaking drift fails before anything is parsed.
+    With ``save`` the fingerprint of the last file is stored for next time.
+    """
+    fingerprint_path = silver_bronze_schema_path(DATASET, VERSION)
+    stored = SchemaFingerprint.load(fingerprint_path)
+    drifts = [check_schema(f, BRONZE_KINDS, BRONZE_ALIASES, stored) for f in files]
+    for drift in drifts:
+        if drift.changes or drift.problems:
+            print(f"[SCHEMA] {drift.path.name}: {drift.level}: {'; '.join(drift.problems + drift.changes)}")
+    for drift in drifts:
+        drift.raise_if_blocking()
+    if save and drifts and drifts[-1].fingerprint != stored:
+        drifts[-1].fingerprint.save(fingerprint_path)
 
-    print("DQ summary:")
-    print(dq.metrics_summary.to_string(index=False))
 
-    if dq.metrics_by_reason is not None and not dq.metrics_by_reason.empty:
-        print("\nDQ by reason:")
-        print(dq.metrics_by_reason.to_string(index=False))
+def _run_incremental(ctx: RunContext, instr: Instrumentation, bronze_dir: Path, csv_files: list[Path]) -> None:
+    # The catalog only lists the files: a drop rewritten in place keeps the
+    # folder mtime, so the manifest re-stats each selected file itself.
+    manifest = BronzeManifest.load(silver_manifest_path(DATASET, VERSION))
 
-    if dry_run:
-        print("[DRY-RUN] Skipping writes.")
+    with instr.stage("manifest"):
+        pending = manifest.pending_files(csv_files)
+    if not pending:
+        print(f"No new or changed Bronze files in {bronze_dir}; nothing to do.")
+        if not ctx.dry_run:
+            manifest.save()
+        return
+
+    # The run_date partition is replaced as a whole, so files loaded into it
+    # by an earlier run on the same date must be reprocessed with the new ones.
+    already_loaded = [
+        f for f in manifest.files_for_run_date(csv_files, ctx.run_date_str) if f not in pending
+    ]
+    files = sorted(already_loaded + pending)
+    with instr.stage("preflight"):
+        check_bronze_schema(files, save=not ctx.dry_run)
+    if ctx.dry_run and not ctx.full_scan:
+        _preview_files(ctx, files)
+        return
+    for f in files:
+        print(f"Reading Bronze file: {f}")
+
+    results = _process_files(ctx, files)
+    _finish_run(ctx, instr, results)
+
+    if not ctx.dry_run:
+        for r in results:
+            manifest.record(r.bronze_file, r.rows, ctx.run_date_str)
+        manifest.save()
+
+
+def _process_file(
+    ctx: RunContext,
+    bronze_file: Path,
+    seen_ids: Optional[IdIndex] = None,
+    crash_ids: Optional[IdIndex] = None,
+) -> FileResult:
+    """Run DQ over one Bronze file and stream the results into its own part files.
+
+    Every Bronze file writes ``part-<stem>.parquet`` into the staged run_date
+    partition and the staged quarantine folder, so files can be processed
+    independently (and in parallel); RunOutputs.publish swaps them into place.
+    With ``seen_ids`` the duplicate_unique_id rule discards ids already in
+    Silver, and the ids of the clean rows are added as the file is read;
+    with ``crash_ids`` the orphan_collision_id rule quarantines vehicles whose
+    collision is not in crashes Silver.
+    """
+    raw_frames = iter_raw_frames(bronze_file, ctx.chunk_size, ctx.engine, ctx.cache)
+    return _process_frames(ctx, bronze_file, raw_frames, f"part-{bronze_file.stem}.parquet", seen_ids, crash_ids)
+
+
+def _process_frames(
+    ctx: RunContext,
+    source: Path,
+    raw_frames,
+    part_name: str,
+    seen_ids: Optional[IdIndex] = None,
+    crash_ids: Optional[IdIndex] = None,
+) -> FileResult:
+    """Prepare, normalize and DQ ``raw_frames`` (read from ``source``) into ``part_name``."""
+    sinks = None
+    if not ctx.dry_run:
+        outputs = ctx.outputs
+        options = {"row_group_size": ctx.row_group_size or ROW_GROUP_ROWS, "compression": ctx.compression}
+        sinks = DQSinks(
+            ParquetAppendWriter(
+                outputs.staged_partition_dir / part_name,
+                drop_columns=[PARTITION_COL],
+                sort_by=list(ctx.sort_by),
+                bloom_filter_columns=list(BLOOM_FILTER_COLUMNS) if ctx.bloom_filters else None,
+                **options,
+            ),
+            ParquetAppendWriter(outputs.staged_quarantine_dir / part_name, **options),
+        )
+
+    instr = Instrumentation(trace_memory=ctx.trace_memory)
+    rules = vehicle_rules(seen_ids, crash_ids)
+    vocabulary = Vocabulary.load(ctx.vocabulary_path)
+    new_vocabulary = {}
+    summaries = []
+    by_reasons = []
+    by_rules = []
+    rows = 0
+    try:
+        for i in itertools.count():
+            with instr.stage("parse") as rec:
+                raw = next(raw_frames, None)
+                rec.rows += len(raw) if raw is not None else 0
+            if raw is None:
+                break
+
+            with instr.stage("prepare", rows=len(raw)):
+                df = prepare_frame(raw, ctx.engine)
+            del raw
+
+            with instr.stage("normalize", rows=len(df)):
+                df, new_keys = normalize_frame(df, vocabulary)
+            vocabulary.update(new_keys)
+            for col, keys in new_keys.items():
+                new_vocabulary.setdefault(col, []).extend(keys)
+
+            with instr.stage("dq", rows=len(df)):
+                dq = apply_quality_rules_vehicles(df, run_date_str=ctx.run_date_str, rules=rules)
+                if seen_ids is not None:
+                    seen_ids.add(dq.frame["unique_id"].to_numpy(dtype="int64", na_value=0)[dq.clean_idx])
+            summaries.append(dq.metrics_summary)
+            by_reasons.append(dq.metrics_by_reason)
+            by_rules.append(dq.metrics_by_rule)
+            rows += len(df)
+            if ctx.chunk_size:
+                print(f"{source.name} chunk {i}: {len(df)} rows")
+
+            if sinks is not None:
+                with instr.stage("write", rows=len(df)):
+                    sinks.write(dq.batches("clean", order_by=list(ctx.sort_by)), dq.batches("quarantine"))
+    finally:
+        raw_frames.close()
+        if sinks is not None:
+            with instr.stage("write") as rec:
+                rec.bytes_written += sinks.close()
+
+    metrics_summary, metrics_by_reason = merge_dq_metrics(summaries, by_reasons, ctx.run_date_str)
+    return FileResult(
+        bronze_file=source,
+        rows=rows,
+        metrics_summary=metrics_summary,
+        metrics_by_reason=metrics_by_reason,
+        metrics_by_rule=merge_rule_metrics(by_rules, ctx.run_date_str),
+        stage_metrics=instr.to_frame(ctx.run_date_str),
+        new_vocabulary=new_vocabulary,
+    )
+
+
+def _refresh_id_shard(ctx: RunContext) -> None:
+    """Keep the run_date's unique_id shard in step with the partition just published.
+
+    A dedup run rewrites it from the partition; any other run drops it, so
+    the next dedup run re-indexes the partition (sync_shards) instead of
+    trusting ids of the partition's previous contents.
+    """
+    if ctx.id_index_dir is not None:
+        IdIndex(ctx.id_index_dir).write_shard(ctx.run_date_str, partition_ids(ctx.partition_dir, "unique_id"))
+    else:
+        IdIndex(silver_id_index_path(DATASET, VERSION, "unique_id")).drop_shard(ctx.run_date_str)
+
+
+def _open_id_index(ctx: RunContext) -> Optional[IdIndex]:
+    """Open the unique_id index, first indexing Silver partitions it has not seen.
+
+    The run's own run_date is left out, since its partition is about to be
+    replaced.
+    """
+    if ctx.id_index_dir is None:
+        return None
+
+    index = IdIndex(ctx.id_index_dir, exclude=ctx.run_date_str)
+    partitions = _hive_partitions(ctx.silver_dir, PARTITION_COL)
+    return sync_shards(index, partitions, "unique_id", skip=ctx.run_date_str, dry_run=ctx.dry_run)
+
+
+def _open_crash_index(ctx: RunContext) -> Optional[IdIndex]:
+    """Open the crashes collision_id index, built by the silver/crashes/v1 runs."""
+    if ctx.crash_index_dir is None:
+        return None
+
+    index = IdIndex(ctx.crash_index_dir)
+    if not index.shards():
+        raise FileNotFoundError(
+            f"No crashes collision_id index in {ctx.crash_index_dir}; "
+            "run `silver run --dataset crashes` before checking collisions."
+        )
+    return index
+
+
+def _preview_files(ctx: RunContext, files: list[Path]) -> None:
+    """Print estimated DQ rates, with confidence intervals, from a sample of ``files``.
+
+    The sample is split across files in proportion to their size, so the
+    pooled sample is representative of the whole selection.
+    """
+    sizes = [f.stat().st_size for f in files]
+    total_size = sum(sizes) or 1
+    rules = vehicle_rules()
+
+    instr = Instrumentation(trace_memory=ctx.trace_memory)
+    summaries, by_reasons = [], []
+    sampled, estimated_rows = 0, 0
+    for f, size in zip(files, sizes):
+        with instr.stage("sample") as rec:
+            source = _check_header(f)
+            raw, file_rows = _sample_csv(f, max(1, round(ctx.sample_rows * size / total_size)), source)
+            raw = _canonical(raw, source)
+            rec.rows += len(raw)
+        with instr.stage("dq", rows=len(raw)):
+            dq = apply_quality_rules_vehicles(prepare_frame(raw), run_date_str=ctx.run_date_str, rules=rules)
+        summaries.append(dq.metrics_summary)
+        by_reasons.append(dq.metrics_by_reason)
+        sampled += len(raw)
+        estimated_rows += file_rows
+
+    metrics_summary, metrics_by_reason = merge_dq_metrics(summaries, by_reasons, ctx.run_date_str)
+    preview = estimate_rates(metrics_summary, metrics_by_reason, estimated_rows)
+    print(f"DQ preview: {sampled} sampled rows of ~{estimated_rows} in {len(files)} Bronze file(s), 95% Wilson intervals")
+    print(preview.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    _print_stage_metrics(instr.to_frame(ctx.run_date_str))
+    print("[DRY-RUN] Estimates only; use --full-scan for exact counts. Skipping writes.")
+
+
+def _process_files(ctx: RunContext, files: list[Path]) -> list[FileResult]:
+    try:
+        # Workers each get a copy of the index: duplicates across files of
+        # the same run are caught only when files are processed sequentially.
+        seen_ids = _open_id_index(ctx)
+        crash_ids = _open_crash_index(ctx)
+        if ctx.workers > 1 and len(files) > 1:
+            n = len(files)
+            with ProcessPoolExecutor(max_workers=min(ctx.workers, n)) as pool:
+                return list(pool.map(_process_file, [ctx] * n, files, [seen_ids] * n, [crash_ids] * n))
+
+        return [_process_file(ctx, f, seen_ids, crash_ids) for f in files]
+    except BaseException:
+        ctx.outputs.discard()
+        raise
+
+
+def _save_vocabulary(ctx: RunContext, results: list[FileResult]) -> None:
+    # New keys map to themselves, so merging the per-file additions after the
+    # fact gives the same vocabulary the files were normalized with.
+    new_keys = [r.new_vocabulary for r in results if any(r.new_vocabulary.values())]
+    if not new_keys:
         return
 
-    _write_parquet_overwrite(
-        silver_dir,
-        dq.clean_df,
-        partition_cols=[PARTITION_COL],
+    vocabulary = Vocabulary.load(ctx.vocabulary_path)
+    for keys in new_keys:
+        vocabulary.update(keys)
+    vocabulary.save()
+
+
+def _finish_run(ctx: RunContext, instr: Instrumentation, results: list[FileResult]) -> None:
+    metrics_summary, metrics_by_reason = merge_dq_metrics(
+        [r.metrics_summary for r in results],
+        [r.metrics_by_reason for r in results],
+        ctx.run_date_str,
     )
-    print(f"Silver CLEAN written to: {silver_dir}")
+    metrics_by_rule = merge_rule_metrics([r.metrics_by_rule for r in results], ctx.run_date_str)
+    _print_dq_summary(metrics_summary, metrics_by_reason, metrics_by_rule)
+
+    for r in results:
+        instr.merge(r.stage_metrics)
 
-    quarantine_run_path = quarantine_dir / f"run_date={dq.run_date}"
-    _write_parquet_overwrite(quarantine_run_path, dq.quarantine_df)
-    print(f"Silver QUARANTINE written to: {quarantine_run_path}")
+    if ctx.dry_run:
+        _print_stage_metrics(instr.to_frame(ctx.run_date_str))
+        print("[DRY-RUN] Skipping writes.")
+        return
 
-    metrics_run_path = metrics_dir / f"run_date={dq.run_date}"
-    _write_metrics_csv(metrics_run_path, dq.metrics_summary, dq.metrics_by_reason)
-    print(f"Metrics written to: {metrics_run_path / 'metrics.csv'}")
\ No newline at end of file
+    with instr.stage("publish"):
+        ctx.outputs.publish(metrics_summary, metrics_by_reason)
+        _save_vocabulary(ctx, results)
+        _refresh_id_shard(ctx)
+
+    record_run_metrics(
+        ctx.outputs, instr, DATASET, VERSION, ctx.run_date_str, metrics_summary, metrics_by_reason
+    )
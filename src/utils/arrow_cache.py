@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pyarrow as pa
+
+from src.utils.io_utils import _atomic_write_json, _file_sha256
+
+CACHE_SUFFIX = ".arrow"
+
+
+class ArrowCache:
+    """Local cache of parsed Bronze files as uncompressed Arrow IPC files.
+
+    Entries are keyed by the Bronze file's content hash plus a ``contract``
+    (the columns and names the caller projects), so editing either the file
+    or the contract misses the cache. Reads are memory-mapped: batches point
+    straight into the page cache instead of being copied. The cache keeps at
+    most ``max_bytes`` on disk and evicts least recently used entries; a hit
+    refreshes the entry's mtime, which is what the eviction order is based on.
+
+    Content hashes are remembered in ``index.json`` by path, size and mtime,
+    so an unchanged multi-GB file is not re-hashed on every run.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_bytes)
+        self._index_path = self.cache_dir / "index.json"
+
+    def _load_index(self) -> dict:
+        if not self._index_path.exists():
+            return {}
+        return json.loads(self._index_path.read_text(encoding="utf-8"))
+
+    def _save_index(self, index: dict) -> None:
+        _atomic_write_json(self._index_path, index)
+
+    def file_hash(self, path: Path) -> str:
+        path = Path(path).resolve()
+        st = path.stat()
+        index = self._load_index()
+        entry = index.get(str(path))
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["sha256"]
+
+        sha256 = _file_sha256(path)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        index[str(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha256}
+        self._save_index(index)
+        return sha256
+
+    def key(self, path: Path, contract: dict) -> str:
+        payload = json.dumps({"sha256": self.file_hash(path), "contract": contract}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{CACHE_SUFFIX}"
+
+    def open(self, key: str) -> Optional[pa.ipc.RecordBatchFileReader]:
+        """Memory-map the entry for ``key``; None on a miss."""
+        path = self.entry_path(key)
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(str(path), "r"))
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return reader
+
+    @contextmanager
+    def writer(self, key: str, schema: pa.Schema) -> Iterator[pa.ipc.RecordBatchFileWriter]:
+        """Write an entry batch by batch; it becomes visible only if the block succeeds."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_dir / f"_tmp-{uuid.uuid4().hex}{CACHE_SUFFIX}"
+        try:
+            with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+                yield writer
+            os.replace(tmp, self.entry_path(key))
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        self.evict(keep=key)
+
+    def entries(self) -> list[Path]:
+        if not self.cache_dir.exists():
+            return []
+        return [p for p in self.cache_dir.glob(f"*{CACHE_SUFFIX}") if not p.name.startswith("_")]
+
+    def evict(self, keep: Optional[str] = None) -> list[Path]:
+        """Drop least recently used entries until the cache fits in ``max_bytes``.
+
+        ``keep`` (the entry just written) is evicted last, and only when it
+        alone exceeds the cap.
+        """
+        stats = []
+        for p in self.entries():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            stats.append((p.stem == keep, st.st_mtime_ns, st.st_size, p))
+        stats.sort(key=lambda s: (s[0], s[1]))
+
+        total = sum(s[2] for s in stats)
+        evicted = []
+        for _, _, size, p in stats:
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+            evicted.append(p)
+        return evicted
@@ -0,0 +1,171 @@
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+SHARD_PREFIX = "run_date="
+SHARD_SUFFIX = ".npy"
+
+
+def _sorted_unique(ids: np.ndarray) -> np.ndarray:
+    # np.sort + an adjacent-duplicate mask; much faster than np.unique /
+    # np.union1d on int64, and a stable sort of two concatenated sorted runs
+    # is a linear-time merge.
+    ids = np.sort(np.asarray(ids, dtype=np.int64), kind="stable")
+    if len(ids) < 2:
+        return ids
+    keep = np.empty(len(ids), dtype=bool)
+    keep[0] = True
+    np.not_equal(ids[1:], ids[:-1], out=keep[1:])
+    return ids[keep]
+
+
+def _member(sorted_ids: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    if len(sorted_ids) == 0:
+        return np.zeros(len(ids), dtype=bool)
+    pos = np.searchsorted(sorted_ids, ids)
+    np.minimum(pos, len(sorted_ids) - 1, out=pos)
+    return sorted_ids[pos] == ids
+
+
+class IdIndex:
+    """Persistent set of int64 ids, one sorted ``.npy`` shard per run_date.
+
+    Shards mirror Silver's run_date partitions: a run replaces its own shard
+    just as it replaces its partition, and ``exclude`` leaves the run's own
+    (about to be replaced) shard out of lookups. Shards are memory-mapped and
+    probed with ``np.searchsorted``, so a lookup costs O(n log m) per shard
+    without loading the ids into memory. Ids added with ``add`` are only kept
+    in memory, for duplicates between batches of the same run, as a few
+    sorted runs (log-structured): a run is merged into the previous one only
+    once it is at least half its size, so each id is merged O(log n) times
+    and adding n ids costs O(n log n) in total, whatever the batch size.
+    """
+
+    def __init__(self, index_dir: Path, exclude: Optional[str] = None):
+        self.index_dir = Path(index_dir)
+        self.exclude = exclude
+        self._loaded: Optional[list[np.ndarray]] = None
+        self._pending: list[np.ndarray] = []
+
+    def shard_path(self, run_date_str: str) -> Path:
+        return self.index_dir / f"{SHARD_PREFIX}{run_date_str}{SHARD_SUFFIX}"
+
+    def shards(self) -> dict[str, Path]:
+        if not self.index_dir.exists():
+            return {}
+        return {
+            p.name[len(SHARD_PREFIX):-len(SHARD_SUFFIX)]: p
+            for p in sorted(self.index_dir.glob(f"{SHARD_PREFIX}*{SHARD_SUFFIX}"))
+        }
+
+    def _arrays(self) -> list[np.ndarray]:
+        if self._loaded is None:
+            self._loaded = [
+                np.load(path, mmap_mode="r")
+                for key, path in self.shards().items()
+                if key != self.exclude
+            ]
+        return self._loaded
+
+    def contains(self, ids: np.ndarray) -> np.ndarray:
+        """Vectorized membership test against the shards and the ids added so far."""
+        ids = np.asarray(ids, dtype=np.int64)
+        # Probing with sorted ids keeps searchsorted cache-friendly and lets
+        # each shard look only at the ids inside its [min, max] range.
+        order = np.argsort(ids, kind="stable")
+        sorted_ids = ids[order]
+        found_sorted = np.zeros(len(ids), dtype=bool)
+        for arr in self._pending + self._arrays():
+            if len(arr) == 0:
+                continue
+            lo = np.searchsorted(sorted_ids, arr[0], side="left")
+            hi = np.searchsorted(sorted_ids, arr[-1], side="right")
+            found_sorted[lo:hi] |= _member(arr, sorted_ids[lo:hi])
+
+        found = np.empty(len(ids), dtype=bool)
+        found[order] = found_sorted
+        return found
+
+    def add(self, ids: np.ndarray) -> None:
+        ids = _sorted_unique(ids)
+        if len(ids) == 0:
+            return
+        runs = self._pending
+        runs.append(ids)
+        while len(runs) > 1 and len(runs[-2]) <= 2 * len(runs[-1]):
+            last = runs.pop()
+            runs[-1] = _sorted_unique(np.concatenate([runs[-1], last]))
+
+    def write_shard(self, run_date_str: str, ids: np.ndarray) -> Path:
+        """Replace the run_date's shard with the distinct ``ids``."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        target = self.shard_path(run_date_str)
+        tmp = self.index_dir / f"_tmp-{uuid.uuid4().hex}{SHARD_SUFFIX}"
+        with open(tmp, "wb") as fh:
+            np.save(fh, _sorted_unique(ids))
+        os.replace(tmp, target)
+        self._loaded = None
+        return target
+
+    def drop_shard(self, run_date_str: str) -> None:
+        self.shard_path(run_date_str).unlink(missing_ok=True)
+        self._loaded = None
+
+
+def to_int64_ids(values) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(ids, valid)``: ``values`` as int64 plus a mask of the usable ones.
+
+    Integer text (e.g. the string-typed collision_id) is parsed; nulls and
+    anything non-integral are marked invalid.
+    """
+    s = values if isinstance(values, pd.Series) else pd.Series(values)
+    if not pd.api.types.is_integer_dtype(s.dtype):
+        s = pd.to_numeric(s, errors="coerce")
+        if s.dtype.kind == "f":
+            s = s.where(s % 1 == 0)
+    valid = s.notna().to_numpy()
+    return s.to_numpy(dtype="int64", na_value=0), valid
+
+
+def partition_ids(partition_dir: Path, column: str) -> np.ndarray:
+    """Read ``column`` from a Silver partition's Parquet files as int64 ids."""
+    import pyarrow.parquet as pq
+
+    parts = []
+    for f in sorted(Path(partition_dir).glob("*.parquet")):
+        ids, valid = to_int64_ids(pq.read_table(f, columns=[column]).column(column).to_pandas())
+        parts.append(ids[valid])
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+def sync_shards(
+    index: IdIndex,
+    partitions: dict[str, Path],
+    column: str,
+    skip: Optional[str] = None,
+    dry_run: bool = False,
+) -> IdIndex:
+    """Index the partitions that have no shard yet and drop shards of removed ones.
+
+    ``skip`` (the run_date a run is about to replace) is neither indexed nor
+    dropped. On a dry run nothing is written: missing partitions are only
+    added to the index in memory.
+    """
+    shards = index.shards()
+    for key, path in partitions.items():
+        if key == skip or key in shards:
+            continue
+        if dry_run:
+            index.add(partition_ids(path, column))
+        else:
+            index.write_shard(key, partition_ids(path, column))
+
+    if not dry_run:
+        for key in shards:
+            if key not in partitions and key != skip:
+                index.drop_shard(key)
+    return index
@@ -0,0 +1,133 @@
+import cProfile
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+import pandas as pd
+
+from src import config
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STAGE_COLUMNS = [
+    "run_date",
+    "stage",
+    "calls",
+    "seconds",
+    "rows",
+    "rows_per_sec",
+    "bytes_written",
+    "peak_rss_mb",
+    "tracemalloc_peak_mb",
+]
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is reported in KiB on Linux but in bytes on macOS.
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+@dataclass
+class StageRecord:
+    stage: str
+    calls: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    bytes_written: int = 0
+    peak_rss_mb: Optional[float] = None
+    tracemalloc_peak_mb: Optional[float] = None
+
+
+class Instrumentation:
+    """Accumulates wall time, rows, bytes and memory peaks per pipeline stage.
+
+    A stage can be entered many times (e.g. once per chunk); its seconds, rows
+    and bytes are summed and its memory peaks keep the maximum. Peak RSS is the
+    process high-water mark after the stage; the tracemalloc peak, recorded only
+    when ``trace_memory`` is set, is the Python allocation peak inside the stage.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.records: dict[str, StageRecord] = {}
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _record(self, name: str) -> StageRecord:
+        if name not in self.records:
+            self.records[name] = StageRecord(stage=name)
+        return self.records[name]
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0, bytes_written: int = 0):
+        record = self._record(name)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds += time.perf_counter() - start
+            record.calls += 1
+            record.rows += rows
+            record.bytes_written += bytes_written
+            record.peak_rss_mb = _max(record.peak_rss_mb, _peak_rss_mb())
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                record.tracemalloc_peak_mb = _max(record.tracemalloc_peak_mb, peak)
+
+    def merge(self, stages: pd.DataFrame) -> None:
+        for row in stages.to_dict("records"):
+            record = self._record(row["stage"])
+            record.calls += int(row["calls"])
+            record.seconds += float(row["seconds"])
+            record.rows += int(row["rows"])
+            record.bytes_written += int(row["bytes_written"])
+            record.peak_rss_mb = _max(record.peak_rss_mb, row["peak_rss_mb"])
+            record.tracemalloc_peak_mb = _max(record.tracemalloc_peak_mb, row["tracemalloc_peak_mb"])
+
+    def to_frame(self, run_date_str: str) -> pd.DataFrame:
+        rows = []
+        for record in self.records.values():
+            row = asdict(record)
+            row["run_date"] = run_date_str
+            row["rows_per_sec"] = record.rows / record.seconds if record.rows and record.seconds > 0 else None
+            rows.append(row)
+        return pd.DataFrame(rows, columns=STAGE_COLUMNS)
+
+
+def _max(a, b):
+    if a is None or pd.isna(a):
+        return b
+    if b is None or pd.isna(b):
+        return a
+    return max(a, b)
+
+
+@contextmanager
+def profiled(name: str, enabled: bool = True):
+    """cProfile the enclosed block and dump the stats to logs/profiles/<name>.prof."""
+    if not enabled:
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        out_dir = config.LOGS_DIR / "profiles"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        out_path = out_dir / f"{name}.prof"
+        profiler.dump_stats(out_path)
+        print(f"cProfile written to: {out_path} (inspect with: python -m pstats {out_path})")
@@ -1,47 +1,95 @@
+from datetime import date, datetime
 from pathlib import Path
+import hashlib
+import json
+import os
+import re
+import stat
+import uuid
 import pandas as pd
 import shutil
 
+PARQUET_COMPRESSIONS = ("snappy", "zstd", "gzip", "none")
 
-def find_latest_csv(folder: Path) -> Path:
-    csv_files = sorted(folder.glob("*.csv"))
+_FILE_DATE_RE = re.compile(r"(\d{8})")
 
-    if not csv_files:
-        raise FileNotFoundError(f"No CSV found in {folder}")
+def _file_date(path: Path) -> date | None:
+    match = _FILE_DATE_RE.search(path.stem)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), "%Y%m%d").date()
+    except ValueError:
+        return None
 
-    return max(csv_files, key=lambda f: f.stat().st_mtime)
+def _filter_file_dates(files: list[Path], start: date | None = None, end: date | None = None) -> list[Path]:
+    if start is None and end is None:
+        return files
+
+    selected = []
+    for f in files:
+        d = _file_date(f)
+        if d is None:
+            continue
+        if (start is None or d >= start) and (end is None or d <= end):
+            selected.append(f)
+    return selected
+
+def _file_sha256(path: Path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _atomic_write_json(path, payload) -> None:
+    """Write ``payload`` as JSON to ``path`` through a temporary file and os.replace.
+
+    Readers see either the previous file or the new one, never a partial
+    write; the temporary name is unique so concurrent writers do not clash.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    try:
+        tmp.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
 def _assert_columns_exist(df: pd.DataFrame, required: list[str]) -> None:
     missing = [c for c in required if c not in df.columns]
     if missing:
         raise KeyError(f"Missing required columns in Bronze CSV: {missing}")
     
+_TIME_PATTERN = r"^0*(?P<hh>[0-9]{1,2}):0*(?P<mm>[0-9]{1,2})(?::0*(?P<ss>[0-9]{1,2}))?$"
+
 def _normalize_time_to_hhmm(s: pd.Series) -> pd.Series:
-    def fix(x):
-        if x is None or pd.isna(x):
-            return pd.NA
-        t = str(x).strip()
-        if not t:
-            return pd.NA
-        parts = t.split(":")
-        if len(parts) not in (2, 3):
-            return pd.NA
-        if any(p.strip() == "" for p in parts):
-            return pd.NA
-        if not all(p.isdigit() for p in parts):
-            return pd.NA
-        hh = int(parts[0])
-        mm = int(parts[1])
-        if not (0 <= hh <= 23 and 0 <= mm <= 59):
-            return pd.NA
-        if len(parts) == 3:
-            ss = int(parts[2])
-            if not (0 <= ss <= 59):
-                return pd.NA
-            return f"{hh:02d}:{mm:02d}:{ss:02d}"
-        return f"{hh:02d}:{mm:02d}"
-
-    return s.apply(fix).astype("string")
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    # Leading zeros are consumed by the pattern, so every captured part has at
+    # most two digits; once left-padded to two characters the range checks can
+    # be done as plain string comparisons ("00" <= hh <= "23").
+    arr = pa.array(s.astype("string"), type=pa.string())
+    parts = pc.extract_regex(pc.utf8_trim_whitespace(arr), _TIME_PATTERN)
+
+    hh = pc.utf8_lpad(pc.struct_field(parts, "hh"), 2, "0")
+    mm = pc.utf8_lpad(pc.struct_field(parts, "mm"), 2, "0")
+    ss_raw = pc.struct_field(parts, "ss")
+    has_ss = pc.not_equal(ss_raw, "")
+    ss = pc.utf8_lpad(ss_raw, 2, "0")
+
+    valid = pc.and_(
+        pc.and_(pc.less_equal(hh, "23"), pc.less_equal(mm, "59")),
+        pc.or_(pc.invert(has_ss), pc.less_equal(ss, "59")),
+    )
+    hhmm = pc.binary_join_element_wise(hh, mm, ":")
+    out = pc.if_else(has_ss, pc.binary_join_element_wise(hhmm, ss, ":"), hhmm)
+    out = pc.if_else(valid, out, pa.scalar(None, pa.string()))
+
+    return pd.Series(pd.array(out, dtype="string"), index=s.index, name=s.name)
 
 def _rmtree_force(path: Path) -> None:
     def onerror(func, p, exc_info):
@@ -50,19 +98,332 @@ def _rmtree_force(path: Path) -> None:
 
     shutil.rmtree(path, onerror=onerror)
 
-def _write_parquet_overwrite(path, df: pd.DataFrame, partition_cols=None) -> None:
+def _hive_partitions(path: Path, col: str = "run_date") -> dict[str, Path]:
+    """Map each ``<col>=<value>`` directory directly under ``path`` to its value."""
+    prefix = f"{col}="
     path = Path(path)
-    if path.exists():
-        if path.is_file():
-            path.unlink()
+    if not path.exists():
+        return {}
+    return {
+        p.name[len(prefix):]: p
+        for p in sorted(path.iterdir())
+        if p.is_dir() and p.name.startswith(prefix)
+    }
+
+def _staging_path(target: Path, token: str | None = None) -> Path:
+    # Staging lives next to the target so the final rename stays on one
+    # filesystem; the "_" prefix keeps it invisible to pyarrow dataset scans.
+    token = token or uuid.uuid4().hex
+    return Path(target).parent / f"_staging-{token}-{Path(target).name}"
+
+def _swap_dir(staged: Path, target: Path) -> None:
+    """Publish ``staged`` at ``target``, replacing whatever was there.
+
+    POSIX cannot rename over a non-empty directory, so the old version is first
+    renamed aside and removed only after the new one is in place: readers see
+    either the old or the new contents, never a partially written directory.
+    """
+    _commit_dirs([(staged, target)])
+
+def _commit_dirs(pairs: list[tuple[Path, Path]]) -> None:
+    """Publish several ``(staged, target)`` directories as one unit: all or none.
+
+    Every existing target is renamed aside before any staged directory is
+    renamed into place. If a rename fails, the renames already done are
+    reverted and the previous versions restored before the error propagates,
+    so a run never ends up half-published. Old versions are removed only once
+    every target is in place.
+    """
+    pairs = [(Path(staged), Path(target)) for staged, target in pairs]
+    token = uuid.uuid4().hex
+    aside = []
+    placed = []
+    try:
+        for _, target in pairs:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.exists():
+                old = target.parent / f"_old-{token}-{target.name}"
+                os.replace(target, old)
+                aside.append((target, old))
+        for staged, target in pairs:
+            os.replace(staged, target)
+            placed.append((staged, target))
+    except BaseException:
+        for staged, target in reversed(placed):
+            os.replace(target, staged)
+        for target, old in reversed(aside):
+            os.replace(old, target)
+        raise
+
+    for _, old in aside:
+        if old.is_dir():
+            _rmtree_force(old)
         else:
-            _rmtree_force(path)
+            old.unlink()
+
+def _run_concurrently(executor, tasks) -> list:
+    """Run ``tasks`` (callables) on ``executor`` and return their results in order.
+
+    Every task is waited for before the first error is re-raised, so no sink
+    is still writing into a staged directory while the caller cleans it up.
+    """
+    futures = [executor.submit(task) for task in tasks]
+    errors = [f.exception() for f in futures]
+    for error in errors:
+        if error is not None:
+            raise error
+    return [f.result() for f in futures]
+
+def _compression_arg(compression: str | None):
+    if compression is None or compression == "none":
+        return None
+    if compression not in PARQUET_COMPRESSIONS:
+        raise ValueError(f"Unknown Parquet compression {compression!r}; expected one of {PARQUET_COMPRESSIONS}")
+    return compression
+
+def _widen_dictionaries(schema):
+    # Category columns convert to the narrowest index type for the batch at
+    # hand; later batches may carry more categories, so pin int32 indices.
+    import pyarrow as pa
+
+    for i, f in enumerate(schema):
+        if pa.types.is_dictionary(f.type):
+            schema = schema.set(i, f.with_type(pa.dictionary(pa.int32(), f.type.value_type)))
+    return schema
+
+
+def _sort_indices(table, sort_by: list[str]):
+    """Indices that sort ``table`` by ``sort_by`` ascending, nulls last (dictionary keys by value)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    keys = {}
+    for col in sort_by:
+        arr = table.column(col)
+        if pa.types.is_dictionary(arr.type):
+            arr = arr.cast(arr.type.value_type)
+        keys[col] = arr
+    return pc.sort_indices(pa.table(keys), sort_keys=[(c, "ascending", "at_end") for c in sort_by])
+
+
+class ParquetAppendWriter:
+    """Streams DataFrame batches into a single Parquet file.
+
+    The file is opened lazily on the first batch, and its schema is pinned so
+    later batches are cast to it. Columns in ``drop_columns`` are removed before
+    writing (e.g. hive partition columns already encoded in the directory name).
+
+    With ``sort_by`` every batch is sorted before it is written, so each row
+    group is sorted (and declared so in its metadata) and its min/max
+    statistics cover a narrow key range. ``bloom_filter_columns`` adds a
+    Parquet bloom filter per row group for those columns, sized from the
+    first batch.
+    """
+
+    def __init__(
+        self,
+        file_path,
+        drop_columns=None,
+        row_group_size: int | None = None,
+        compression: str | None = "snappy",
+        sort_by: list[str] | None = None,
+        bloom_filter_columns: list[str] | None = None,
+    ):
+        self.file_path = Path(file_path)
+        self.drop_columns = list(drop_columns or [])
+        self.row_group_size = row_group_size
+        self.compression = _compression_arg(compression)
+        self.sort_by = list(sort_by or [])
+        self.bloom_filter_columns = list(bloom_filter_columns or [])
+        self.rows_written = 0
+        self.bytes_written = 0
+        self._writer = None
+
+    def _open(self, table):
+        import pyarrow.parquet as pq
+
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        schema = _widen_dictionaries(table.schema)
+        options = {"compression": self.compression, "write_page_index": True}
+        if self.sort_by:
+            options["sorting_columns"] = pq.SortingColumn.from_ordering(
+                schema, [(c, "ascending") for c in self.sort_by], null_placement="at_end"
+            )
+        if self.bloom_filter_columns:
+            ndv = max(1024, min(table.num_rows, self.row_group_size or table.num_rows))
+            options["bloom_filter_options"] = {c: {"ndv": ndv, "fpp": 0.05} for c in self.bloom_filter_columns}
+        return pq.ParquetWriter(self.file_path, schema, **options)
+
+    def write(self, df: pd.DataFrame) -> None:
+        import pyarrow as pa
+
+        if self.drop_columns:
+            df = df.drop(columns=[c for c in self.drop_columns if c in df.columns])
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self.sort_by:
+            table = table.take(_sort_indices(table, self.sort_by))
+        if self._writer is None:
+            self._writer = self._open(table)
+        table = table.cast(self._writer.schema)
+
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self.rows_written += len(df)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self.bytes_written = self.file_path.stat().st_size
+        else:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+
+
+# pandas' default ``na_values`` (pandas._libs.parsers.STR_NA_VALUES), so the
+# Arrow reader nulls the same fields as ``pd.read_csv``.
+PANDAS_NA_VALUES = (
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+)
+
+def _arrow_csv_options(columns: list[str], block_size: int | None = None):
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    read_options = pacsv.ReadOptions(use_threads=True)
+    if block_size:
+        read_options.block_size = block_size
+    convert_options = pacsv.ConvertOptions(
+        include_columns=columns,
+        column_types={c: pa.string() for c in columns},
+        null_values=list(PANDAS_NA_VALUES),
+        strings_can_be_null=True,
+    )
+    return read_options, convert_options
+
+def _read_csv_arrow(path, columns: list[str], block_size: int | None = None):
+    import pyarrow.csv as pacsv
+
+    read_options, convert_options = _arrow_csv_options(columns, block_size)
+    return pacsv.read_csv(path, read_options=read_options, convert_options=convert_options)
+
+def _iter_csv_arrow(path, columns: list[str], block_size: int | None = None):
+    import pyarrow.csv as pacsv
+
+    read_options, convert_options = _arrow_csv_options(columns, block_size)
+    reader = pacsv.open_csv(path, read_options=read_options, convert_options=convert_options)
+    try:
+        for batch in reader:
+            yield batch
+    finally:
+        reader.close()
+
+def _sample_csv(
+    path,
+    n_rows: int,
+    columns: list[str],
+    seed: int | None = None,
+    full_read_bytes: int = 4 * 1024**2,
+) -> tuple[pd.DataFrame, int]:
+    """Read about ``n_rows`` random rows of a CSV as strings, without parsing the file.
+
+    Each row is the first line starting after a uniformly random byte offset,
+    so only ``n_rows`` small reads are needed whatever the file size (rows
+    after longer lines are slightly favoured). Files whose body fits in
+    ``full_read_bytes`` are read whole. Returns the rows and the estimated
+    row count of the file, from the mean sampled line length. Assumes no
+    quoted line breaks; rows that do not parse are skipped.
+    """
+    import io
+
+    import numpy as np
+
+    path = Path(path)
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        header = f.readline()
+        body_start = f.tell()
+        _assert_columns_exist(pd.read_csv(io.BytesIO(header), dtype="string", nrows=0), columns)
+
+        full_read = size - body_start <= full_read_bytes
+        if full_read:
+            lines = f.read().splitlines(keepends=True)
+        else:
+            rng = np.random.default_rng(seed)
+            offsets = np.sort(rng.integers(body_start, size, n_rows))
+            lines, seen = [], set()
+            for offset in offsets:
+                # Finish the line holding byte offset-1: the next one starts after offset.
+                f.seek(offset - 1)
+                f.readline()
+                start = f.tell()
+                if start >= size or start in seen:
+                    continue
+                seen.add(start)
+                lines.append(f.readline())
+
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return pd.DataFrame({c: pd.Series(dtype="string") for c in columns}), 0
+    if not lines[-1].endswith(b"\n"):
+        lines[-1] += b"\n"
+
+    sample = pd.read_csv(
+        io.BytesIO(header + b"".join(lines)), dtype="string", usecols=columns, on_bad_lines="skip"
+    )
+    if full_read:
+        return sample, len(sample)
+
+    mean_line = sum(map(len, lines)) / len(lines)
+    return sample, max(len(sample), round((size - body_start) / mean_line))
+
+
+def _prefetch(iterable, depth: int = 1):
+    """Iterate ``iterable`` on a background thread, at most ``depth`` items ahead.
 
-    path.mkdir(parents=True, exist_ok=True)
+    Lets a GIL-releasing producer (the Arrow CSV reader) parse the next batch
+    while the consumer works on the current one, holding at most ``depth``
+    extra batches in memory.
+    """
+    import queue
+    import threading
 
-    if partition_cols:
-        df.to_parquet(path, engine="pyarrow", index=False, partition_cols=partition_cols)
-    else:
-        df.to_parquet(path / "data.parquet", engine="pyarrow", index=False)
+    done = object()
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
 
+    def produce():
+        try:
+            for item in iterable:
+                while not stop.is_set():
+                    try:
+                        items.put((item, None), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            items.put((done, None))
+        except BaseException as exc:
+            items.put((done, exc))
 
+    thread = threading.Thread(target=produce, name="prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, exc = items.get()
+            if item is done:
+                if exc is not None:
+                    raise exc
+                return
+            yield item
+    finally:
+        stop.set()
+        while thread.is_alive():
+            try:
+                items.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        thread.join()
+        if hasattr(iterable, "close"):
+            iterable.close()
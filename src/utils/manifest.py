@@ -0,0 +1,331 @@
+import csv
+import fnmatch
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, asdict, field
+from datetime import date
+from pathlib import Path
+
+from src.utils.io_utils import _atomic_write_json, _file_sha256, _filter_file_dates
+
+# Bytes read from the head of a Bronze file for its header and row estimate.
+CATALOG_SAMPLE_BYTES = 1 << 20
+# A directory mtime this close to the last scan may hide a change made in the
+# same timestamp tick, so it is not trusted (as with git's "racy" index).
+RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass
+class ManifestEntry:
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    row_count: int
+    run_date: str
+
+
+class BronzeManifest:
+    """Persisted record of the Bronze files already loaded into a Silver table.
+
+    A file is considered unchanged when its size and mtime match the recorded
+    entry; only when those differ is the content hash recomputed, so touching a
+    file without changing it does not trigger a reload.
+    """
+
+    def __init__(self, manifest_path: Path, entries: dict[str, ManifestEntry] | None = None):
+        self.manifest_path = Path(manifest_path)
+        self.entries = entries or {}
+        self._hashes: dict[tuple, str] = {}
+
+    @classmethod
+    def load(cls, manifest_path: Path) -> "BronzeManifest":
+        manifest_path = Path(manifest_path)
+        if not manifest_path.exists():
+            return cls(manifest_path)
+
+        raw = json.loads(manifest_path.read_text(encoding="utf-8"))
+        entries = {e["path"]: ManifestEntry(**e) for e in raw.get("files", [])}
+        return cls(manifest_path, entries)
+
+    def save(self) -> None:
+        payload = {"files": [asdict(e) for e in sorted(self.entries.values(), key=lambda e: e.path)]}
+        _atomic_write_json(self.manifest_path, payload)
+
+    def _hash(self, path: Path) -> str:
+        st = path.stat()
+        key = (str(path), st.st_size, st.st_mtime_ns)
+        if key not in self._hashes:
+            self._hashes[key] = _file_sha256(path)
+        return self._hashes[key]
+
+    def is_pending(self, path: Path) -> bool:
+        entry = self.entries.get(str(path))
+        if entry is None:
+            return True
+
+        st = path.stat()
+        if entry.size == st.st_size and entry.mtime_ns == st.st_mtime_ns:
+            return False
+
+        if self._hash(path) != entry.sha256:
+            return True
+
+        entry.size = st.st_size
+        entry.mtime_ns = st.st_mtime_ns
+        return False
+
+    def pending_files(self, files: list[Path]) -> list[Path]:
+        return [f for f in files if self.is_pending(f)]
+
+    def files_for_run_date(self, files: list[Path], run_date: str) -> list[Path]:
+        return [
+            f for f in files
+            if str(f) in self.entries and self.entries[str(f)].run_date == run_date
+        ]
+
+    def record(self, path: Path, row_count: int, run_date: str) -> None:
+        st = path.stat()
+        self.entries[str(path)] = ManifestEntry(
+            path=str(path),
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            sha256=self._hash(path),
+            row_count=int(row_count),
+            run_date=run_date,
+        )
+
+
+@dataclass
+class CatalogEntry:
+    name: str
+    size: int
+    mtime_ns: int
+    header_sha256: str
+    columns: list[str] = field(default_factory=list)
+    estimated_rows: int = 0
+
+
+def _describe_csv(path: Path, size: int, mtime_ns: int) -> CatalogEntry:
+    """Catalog entry of a CSV from its first CATALOG_SAMPLE_BYTES only."""
+    with open(path, "rb") as f:
+        head = f.read(CATALOG_SAMPLE_BYTES)
+    first, _, rest = head.partition(b"\n")
+    header = first.rstrip(b"\r")
+    columns = next(csv.reader([header.decode("utf-8-sig", errors="replace")]), [])
+
+    if len(head) < CATALOG_SAMPLE_BYTES:
+        estimated = rest.count(b"\n") + (1 if rest and not rest.endswith(b"\n") else 0)
+    else:
+        # Extrapolate the sampled rows' mean width to the rest of the file.
+        lines = rest.count(b"\n")
+        estimated = round((size - len(first) - 1) * lines / len(rest)) if lines else 0
+    return CatalogEntry(
+        name=path.name,
+        size=size,
+        mtime_ns=mtime_ns,
+        header_sha256=hashlib.sha256(header).hexdigest(),
+        columns=columns,
+        estimated_rows=estimated,
+    )
+
+
+class BronzeCatalog:
+    """Persisted listing of a Bronze folder: one entry per CSV, by file name.
+
+    Each entry records the file's size, mtime, header columns (and their
+    fingerprint) and an estimated row count read from the file's head.
+    ``refresh`` only lists the folder again when the folder's own mtime has
+    changed, i.e. when a file was added, removed or renamed over; files whose
+    size and mtime are unchanged keep their entry. Latest-file, glob and
+    column lookups are then answered from memory, without a ``stat()`` per
+    file. The catalog is for discovery only: a file rewritten in place does
+    not change the folder mtime, so change detection (BronzeManifest) always
+    re-stats the selected files. ``force`` re-stats every file.
+    """
+
+    def __init__(
+        self,
+        catalog_path: Path,
+        folder: Path,
+        entries: dict[str, CatalogEntry] | None = None,
+        dir_mtime_ns: int | None = None,
+        scanned_ns: int = 0,
+    ):
+        self.catalog_path = Path(catalog_path)
+        self.folder = Path(folder)
+        self.entries = entries or {}
+        self.dir_mtime_ns = dir_mtime_ns
+        self.scanned_ns = scanned_ns
+
+    @classmethod
+    def load(cls, catalog_path: Path, folder: Path) -> "BronzeCatalog":
+        catalog_path = Path(catalog_path)
+        if not catalog_path.exists():
+            return cls(catalog_path, folder)
+
+        raw = json.loads(catalog_path.read_text(encoding="utf-8"))
+        if raw.get("folder") != str(folder):
+            return cls(catalog_path, folder)
+        entries = {e["name"]: CatalogEntry(**e) for e in raw.get("files", [])}
+        return cls(catalog_path, folder, entries, raw.get("dir_mtime_ns"), raw.get("scanned_ns", 0))
+
+    def save(self) -> None:
+        payload = {
+            "folder": str(self.folder),
+            "dir_mtime_ns": self.dir_mtime_ns,
+            "scanned_ns": self.scanned_ns,
+            "files": [asdict(e) for _, e in sorted(self.entries.items())],
+        }
+        _atomic_write_json(self.catalog_path, payload)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Bring the catalog up to date with the folder; returns whether it rescanned."""
+        if not self.folder.is_dir():
+            self.entries = {}
+            self.dir_mtime_ns = None
+            return True
+
+        dir_mtime_ns = self.folder.stat().st_mtime_ns
+        trusted = dir_mtime_ns == self.dir_mtime_ns and dir_mtime_ns < self.scanned_ns - RACY_WINDOW_NS
+        if trusted and not force:
+            return False
+
+        scanned_ns = time.time_ns()
+        entries = {}
+        with os.scandir(self.folder) as it:
+            for item in it:
+                if not item.name.endswith(".csv") or not item.is_file():
+                    continue
+                st = item.stat()
+                entry = self.entries.get(item.name)
+                if entry is None or (entry.size, entry.mtime_ns) != (st.st_size, st.st_mtime_ns):
+                    entry = _describe_csv(Path(item.path), st.st_size, st.st_mtime_ns)
+                entries[item.name] = entry
+        self.entries = entries
+        self.dir_mtime_ns = dir_mtime_ns
+        self.scanned_ns = scanned_ns
+        return True
+
+    def latest(self) -> Path:
+        """The most recently modified CSV (ties broken by name)."""
+        if not self.entries:
+            raise FileNotFoundError(f"No CSV found in {self.folder}")
+        name = max(sorted(self.entries), key=lambda n: self.entries[n].mtime_ns)
+        return self.folder / name
+
+    def files(self, pattern: str = "*.csv", start: date | None = None, end: date | None = None) -> list[Path]:
+        """CSVs whose name matches ``pattern``, optionally limited to drops whose
+        file name carries a YYYYMMDD date within [start, end]."""
+        names = sorted(n for n in self.entries if fnmatch.fnmatchcase(n, pattern))
+        return _filter_file_dates([self.folder / n for n in names], start, end)
+
+    def check_columns(self, files: list[Path], required: list[str]) -> None:
+        """Reject, before any parse, files whose header lacks ``required`` columns."""
+        problems = []
+        for f in files:
+            entry = self.entries.get(Path(f).name)
+            if entry is None:
+                continue
+            missing = [c for c in required if c not in entry.columns]
+            if missing:
+                problems.append(f"{entry.name}: {missing}")
+        if problems:
+            raise KeyError(f"Missing required columns in Bronze CSV: {'; '.join(problems)}")
+
+
+class PartitionManifest:
+    """Persisted fingerprints of the Silver partitions already aggregated into Gold.
+
+    A partition's fingerprint covers the name, size and mtime of its Parquet
+    files. Silver publishes a run_date by swapping in a new directory, so any
+    rewrite of a partition changes its fingerprint and makes it pending again.
+    ``merge`` records how the merged Gold tables were last built.
+    """
+
+    def __init__(self, manifest_path: Path, partitions: dict[str, str] | None = None, merge: str | None = None):
+        self.manifest_path = Path(manifest_path)
+        self.partitions = partitions or {}
+        self.merge = merge
+
+    @classmethod
+    def load(cls, manifest_path: Path) -> "PartitionManifest":
+        manifest_path = Path(manifest_path)
+        if not manifest_path.exists():
+            return cls(manifest_path)
+
+        raw = json.loads(manifest_path.read_text(encoding="utf-8"))
+        return cls(manifest_path, dict(raw.get("partitions", {})), raw.get("merge"))
+
+    def save(self) -> None:
+        payload = {"partitions": dict(sorted(self.partitions.items())), "merge": self.merge}
+        _atomic_write_json(self.manifest_path, payload)
+
+    @staticmethod
+    def fingerprint(partition_dir: Path) -> str:
+        digest = hashlib.sha256()
+        for f in sorted(Path(partition_dir).glob("*.parquet")):
+            st = f.stat()
+            digest.update(f"{f.name}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+    def pending(self, partitions: dict[str, Path]) -> dict[str, str]:
+        """Return ``{key: fingerprint}`` for the partitions that are new or changed."""
+        fingerprints = {key: self.fingerprint(path) for key, path in partitions.items()}
+        return {key: fp for key, fp in fingerprints.items() if self.partitions.get(key) != fp}
+
+    def removed(self, partitions: dict[str, Path]) -> list[str]:
+        return sorted(key for key in self.partitions if key not in partitions)
+
+    def record(self, key: str, fingerprint: str) -> None:
+        self.partitions[key] = fingerprint
+
+    def forget(self, key: str) -> None:
+        self.partitions.pop(key, None)
+
+
+class BackfillCheckpoint:
+    """Progress of a Silver backfill, so a failed backfill resumes where it stopped.
+
+    ``plan`` identifies the backfill (date range and the size/mtime of the
+    Bronze drops it loads) and ``done`` lists the run_dates already published.
+    A checkpoint whose plan differs from the requested one is ignored.
+    """
+
+    def __init__(self, checkpoint_path: Path, plan: dict | None = None, done: set[str] | None = None):
+        self.checkpoint_path = Path(checkpoint_path)
+        self.plan = plan or {}
+        self.done = set(done or ())
+
+    @classmethod
+    def load(cls, checkpoint_path: Path) -> "BackfillCheckpoint":
+        checkpoint_path = Path(checkpoint_path)
+        if not checkpoint_path.exists():
+            return cls(checkpoint_path)
+
+        raw = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+        return cls(checkpoint_path, raw.get("plan"), set(raw.get("done", [])))
+
+    def save(self) -> None:
+        payload = {"plan": self.plan, "done": sorted(self.done)}
+        _atomic_write_json(self.checkpoint_path, payload)
+
+    @staticmethod
+    def make_plan(start: str, end: str, files: list[Path]) -> dict:
+        bronze = []
+        for f in files:
+            st = Path(f).stat()
+            bronze.append({"path": str(f), "size": st.st_size, "mtime_ns": st.st_mtime_ns})
+        return {"from": start, "to": end, "bronze": bronze}
+
+    def matches(self, plan: dict) -> bool:
+        return self.plan == plan
+
+    def restart(self, plan: dict) -> None:
+        self.plan = plan
+        self.done = set()
+
+    def mark_done(self, run_date: str) -> None:
+        self.done.add(run_date)
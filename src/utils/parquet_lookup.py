@@ -0,0 +1,83 @@
+"""Point lookups on hive-partitioned Parquet that read only the row groups that can match.
+
+Each row group's min/max statistics for the lookup column are checked
+against the value before anything is read, so on Silver (sorted by id
+within each batch, small row groups) a lookup reads a few row groups
+instead of the whole table.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utils.io_utils import _hive_partitions
+
+
+@dataclass(frozen=True)
+class LookupResult:
+    rows: pd.DataFrame
+    row_groups_read: int
+    row_groups_total: int
+
+
+def _coerce(value, arrow_type):
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    if pa.types.is_integer(arrow_type):
+        return int(value)
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return str(value)
+    return value
+
+
+def matching_row_groups(metadata: pq.FileMetaData, column: str, value) -> list[int]:
+    """Indices of the row groups whose statistics do not rule out ``column == value``.
+
+    Row groups without min/max statistics for the column are always kept.
+    """
+    col_idx = metadata.schema.to_arrow_schema().get_field_index(column)
+    keep = []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(col_idx).statistics
+        if stats is None or not stats.has_min_max or stats.min <= value <= stats.max:
+            keep.append(i)
+    return keep
+
+
+def lookup(
+    dataset_dir: Path,
+    column: str,
+    value,
+    columns: Optional[list[str]] = None,
+    run_dates: Optional[list[str]] = None,
+    partition_col: str = "run_date",
+) -> LookupResult:
+    """Rows of a ``<partition_col>=`` partitioned dataset where ``column == value``."""
+    partitions = _hive_partitions(Path(dataset_dir), partition_col)
+    if run_dates is not None:
+        partitions = {k: p for k, p in partitions.items() if k in set(run_dates)}
+
+    frames = []
+    read = total = 0
+    for key, partition_dir in sorted(partitions.items()):
+        for path in sorted(partition_dir.glob("*.parquet")):
+            pf = pq.ParquetFile(path)
+            target = _coerce(value, pf.schema_arrow.field(column).type)
+            groups = matching_row_groups(pf.metadata, column, target)
+            total += pf.metadata.num_row_groups
+            read += len(groups)
+            if not groups:
+                continue
+
+            wanted = None if columns is None else list(dict.fromkeys([*columns, column]))
+            df = pf.read_row_groups(groups, columns=wanted).to_pandas()
+            df = df[df[column] == target]
+            if columns is not None:
+                df = df[columns]
+            frames.append(df.assign(**{partition_col: key}))
+
+    rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=[*(columns or []), partition_col])
+    return LookupResult(rows=rows, row_groups_read=read, row_groups_total=total)
@@ -0,0 +1,183 @@
+"""Schema-drift pre-flight for Bronze CSVs.
+
+Before a Bronze file is parsed, its header and first rows are compared with
+the columns a pipeline needs and with the schema fingerprint stored by the
+last accepted run, and the drift is classified as:
+
+* ``compatible``: every required column is present, directly or through a
+  known alias (RENAME_MAP), and still holds the expected kind of values.
+  Reordered, added or dropped extra columns are only reported;
+* ``requires-mapping``: a required column is missing but a header column
+  differs from it (or from one of its aliases) only in case, spacing or
+  punctuation. It is not read until the alias is added to RENAME_MAP;
+* ``breaking``: a required column is missing without a candidate, or an
+  integer column now mostly holds non-integers.
+"""
+import csv
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from src.utils.io_utils import _atomic_write_json
+
+COMPATIBLE = "compatible"
+REQUIRES_MAPPING = "requires-mapping"
+BREAKING = "breaking"
+
+# Data rows read after the header to check the value kinds.
+PREFLIGHT_SAMPLE_ROWS = 1_000
+# An integer column is breaking when more than this share of its non-empty
+# sampled values are not integers (isolated bad values are left to DQ).
+KIND_DRIFT_SHARE = 0.5
+
+_INTEGER_RE = re.compile(r"^\s*[+-]?[0-9]{1,18}(\.0*)?\s*$")
+
+
+def read_header_sample(path, n_rows: int = PREFLIGHT_SAMPLE_ROWS) -> tuple[list[str], list[list[str]]]:
+    """Header and first ``n_rows`` data rows of a CSV, without parsing the rest."""
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = []
+        for row in reader:
+            if len(rows) >= n_rows:
+                break
+            rows.append(row)
+    return header, rows
+
+
+def _normalize_name(name: str) -> str:
+    return re.sub(r"[\s_\-.]+", "_", name.strip().casefold())
+
+
+def _kind(values: list[str]) -> str:
+    """``integer``, ``text`` or ``empty`` (no non-blank value) for sampled values."""
+    present = [v for v in values if v.strip()]
+    if not present:
+        return "empty"
+    integers = sum(1 for v in present if _INTEGER_RE.match(v))
+    return "integer" if integers / len(present) >= 1 - KIND_DRIFT_SHARE else "text"
+
+
+@dataclass(frozen=True)
+class SchemaFingerprint:
+    """Header (in file order) and sampled value kind of each required column."""
+
+    columns: tuple[str, ...]
+    kinds: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def sha256(self) -> str:
+        return hashlib.sha256(",".join(self.columns).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SchemaFingerprint"]:
+        path = Path(path)
+        if not path.exists():
+            return None
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        return cls(tuple(raw["columns"]), dict(raw.get("kinds", {})))
+
+    def save(self, path: Path) -> None:
+        payload = {"columns": list(self.columns), "kinds": self.kinds, "sha256": self.sha256}
+        _atomic_write_json(path, payload)
+
+
+@dataclass(frozen=True)
+class SchemaDrift:
+    path: Path
+    level: str
+    fingerprint: SchemaFingerprint
+    changes: tuple[str, ...] = ()
+    problems: tuple[str, ...] = ()
+    unresolved: tuple[str, ...] = ()
+
+    def raise_if_blocking(self) -> None:
+        """Fail fast on ``requires-mapping`` and ``breaking`` drift.
+
+        Unresolved columns raise KeyError, like any missing Bronze column;
+        a change of value kind raises ValueError.
+        """
+        if self.level == COMPATIBLE:
+            return
+        message = f"{self.level} schema drift in {Path(self.path).name}: {'; '.join(self.problems)}"
+        raise (KeyError if self.unresolved else ValueError)(message)
+
+
+def classify_drift(
+    path,
+    header: list[str],
+    rows: list[list[str]],
+    kinds: dict[str, str],
+    aliases: dict[str, str],
+    stored: Optional[SchemaFingerprint] = None,
+) -> SchemaDrift:
+    """Classify the drift of a Bronze file's header and sample.
+
+    ``kinds`` maps each required column to its expected kind (``integer`` or
+    ``text``), ``aliases`` maps alternative header names to required columns
+    and ``stored`` is the fingerprint of the last accepted file, if any.
+    """
+    changes, mappings, breaks = [], [], []
+    resolved, unresolved = {}, []
+    for target in kinds:
+        if target in header:
+            resolved[target] = target
+            continue
+        alias = next((a for a, t in aliases.items() if t == target and a in header), None)
+        if alias is not None:
+            resolved[target] = alias
+            changes.append(f"{target} read from {alias!r}")
+            continue
+
+        unresolved.append(target)
+        names = {_normalize_name(target)} | {_normalize_name(a) for a, t in aliases.items() if t == target}
+        candidate = next((c for c in header if _normalize_name(c) in names), None)
+        if candidate is not None:
+            mappings.append(f"{target} looks renamed to {candidate!r}; add it to RENAME_MAP")
+        else:
+            breaks.append(f"missing column {target}")
+
+    observed = {}
+    for target, name in resolved.items():
+        pos = header.index(name)
+        observed[target] = _kind([row[pos] for row in rows if pos < len(row)])
+        if kinds[target] == "integer" and observed[target] == "text":
+            breaks.append(f"{target} no longer holds integers")
+        elif stored is not None and stored.kinds.get(target, observed[target]) != observed[target]:
+            changes.append(f"{target} values changed from {stored.kinds[target]} to {observed[target]}")
+
+    if stored is not None and tuple(header) != stored.columns:
+        added = [c for c in header if c not in stored.columns]
+        dropped = [c for c in stored.columns if c not in header]
+        if added:
+            changes.append(f"new columns {added}")
+        if dropped:
+            changes.append(f"dropped columns {dropped}")
+        if not added and not dropped:
+            changes.append("columns reordered")
+
+    level = BREAKING if breaks else REQUIRES_MAPPING if mappings else COMPATIBLE
+    return SchemaDrift(
+        path=Path(path),
+        level=level,
+        fingerprint=SchemaFingerprint(tuple(header), observed),
+        changes=tuple(changes),
+        problems=tuple(breaks + mappings),
+        unresolved=tuple(unresolved),
+    )
+
+
+def check_schema(
+    path,
+    kinds: dict[str, str],
+    aliases: dict[str, str],
+    stored: Optional[SchemaFingerprint] = None,
+    n_rows: int = PREFLIGHT_SAMPLE_ROWS,
+) -> SchemaDrift:
+    """Read the header and first rows of ``path`` and classify their drift."""
+    header, rows = read_header_sample(path, n_rows)
+    return classify_drift(path, header, rows, kinds, aliases, stored)
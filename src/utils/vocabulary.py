@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from src.utils.io_utils import _atomic_write_json
+
+
+def normalize_key(value: str) -> str:
+    """Casefold and collapse internal whitespace: ``" Pick-up  TRUCK"`` -> ``"pick-up truck"``."""
+    return " ".join(value.split()).casefold()
+
+
+class Vocabulary:
+    """Persisted mapping from normalized free-text values to canonical labels.
+
+    Every column has its own ``{normalized key: canonical label}`` table. A key
+    seen for the first time maps to itself, so the result never depends on the
+    order in which files (or worker processes) meet it; entries can be edited
+    by hand to fold aliases together (e.g. ``"4 dr sedan": "sedan"``).
+    """
+
+    def __init__(self, path: Path, columns: dict[str, dict[str, str]] | None = None):
+        self.path = Path(path)
+        self.columns = columns or {}
+
+    @classmethod
+    def load(cls, path: Path) -> "Vocabulary":
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        return cls(path, {col: dict(mapping) for col, mapping in raw.get("columns", {}).items()})
+
+    def save(self) -> None:
+        payload = {"columns": {col: dict(sorted(m.items())) for col, m in sorted(self.columns.items())}}
+        _atomic_write_json(self.path, payload)
+
+    def update(self, new_keys: dict[str, list[str]]) -> None:
+        for col, keys in new_keys.items():
+            mapping = self.columns.setdefault(col, {})
+            for key in keys:
+                mapping.setdefault(key, key)
+
+    def canonicalize(self, s: pd.Series, column: str) -> tuple[pd.Series, list[str]]:
+        """Map ``s`` to canonical labels as a ``category`` Series.
+
+        Only the distinct values are normalized in Python, so the cost is
+        one factorize pass plus the column's cardinality. Returns the Series
+        and the normalized keys not yet in the vocabulary (kept out of it
+        until ``update``, so a dry run or a failed run records nothing).
+        """
+        mapping = self.columns.get(column, {})
+        codes, uniques = pd.factorize(s, use_na_sentinel=True)
+
+        keys = [normalize_key(v) for v in uniques]
+        new_keys = sorted({k for k in keys if k not in mapping})
+        labels = [mapping.get(k, k) for k in keys]
+
+        categories = pd.Index(sorted(set(labels)), dtype="string")
+        label_codes = categories.get_indexer(labels)
+        out_codes = label_codes[codes] if len(labels) else codes
+        out_codes[codes < 0] = -1
+
+        out = pd.Series(
+            pd.Categorical.from_codes(out_codes, dtype=pd.CategoricalDtype(categories)),
+            index=s.index,
+            name=s.name,
+        )
+        return out, new_keys
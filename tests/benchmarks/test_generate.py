@@ -0,0 +1,33 @@
+import pandas as pd
+
+from benchmarks.generate import BLOCK_ROWS, COLUMNS, GeneratorConfig, generate_vehicles_csv, make_block
+
+
+def test_generator_is_deterministic(tmp_path):
+    config = GeneratorConfig(rows=1_000, seed=7)
+
+    a = generate_vehicles_csv(tmp_path / "a.csv", config)
+    b = generate_vehicles_csv(tmp_path / "b.csv", config)
+
+    assert a.read_bytes() == b.read_bytes()
+
+
+def test_generator_writes_requested_rows_across_blocks(tmp_path):
+    config = GeneratorConfig(rows=BLOCK_ROWS + 10, seed=1)
+
+    path = generate_vehicles_csv(tmp_path / "v.csv", config)
+    df = pd.read_csv(path, dtype="string")
+
+    assert list(df.columns) == COLUMNS
+    assert len(df) == BLOCK_ROWS + 10
+    assert df["UNIQUE_ID"].dropna().astype(int).is_unique
+
+
+def test_generator_rates_shape_the_data():
+    clean = make_block(GeneratorConfig(rows=5_000, null_rate=0, bad_year_rate=0, whitespace_rate=0), 0)
+    messy = make_block(GeneratorConfig(rows=5_000, null_rate=0.2, bad_year_rate=0.2, whitespace_rate=0.2), 0)
+
+    assert clean["VEHICLE_TYPE"].notna().all()
+    assert not clean["VEHICLE_TYPE"].str.startswith(" ").any()
+    assert messy["VEHICLE_TYPE"].isna().mean() > 0.1
+    assert messy["VEHICLE_TYPE"].dropna().str.startswith(" ").mean() > 0.1
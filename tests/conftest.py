@@ -0,0 +1,19 @@
+import pytest
+
+import src.config as config
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    monkeypatch.setattr(config, "DATA_DIR", data)
+    monkeypatch.setattr(config, "BRONZE_DIR", data / "bronze")
+    monkeypatch.setattr(config, "SILVER_DIR", data / "silver")
+    monkeypatch.setattr(config, "SILVER_QUARANTINE_DIR", data / "silver_quarantine")
+    monkeypatch.setattr(config, "GOLD_DIR", data / "gold")
+    monkeypatch.setattr(config, "METRICS_DIR", data / "metrics")
+    monkeypatch.setattr(config, "MANIFESTS_DIR", data / "manifests")
+    monkeypatch.setattr(config, "CACHE_DIR", data / "cache")
+    monkeypatch.setattr(config, "INDEXES_DIR", data / "indexes")
+    monkeypatch.setattr(config, "LOGS_DIR", tmp_path / "logs")
+    return data
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+from src.dq.preview import estimate_rates, wilson_interval
+
+
+def test_wilson_interval_matches_reference_values():
+    low, high = wilson_interval([0, 5, 10], 10)
+
+    assert low[0] == 0.0 and high[0] == pytest.approx(0.2775, abs=1e-4)
+    assert (low[1], high[1]) == (pytest.approx(0.2366, abs=1e-4), pytest.approx(0.7634, abs=1e-4))
+    assert low[2] == pytest.approx(0.7225, abs=1e-4) and high[2] == pytest.approx(1.0)
+
+
+def test_estimate_rates_scales_sample_counts():
+    summary = pd.DataFrame(
+        {
+            "metric": ["total_rows_read", "total_clean", "total_quarantine", "total_discard"],
+            "value": [200, 150, 40, 10],
+        }
+    )
+    by_reason = pd.DataFrame({"reason": ["invalid_vehicle_year_range"], "count": [40]})
+
+    preview = estimate_rates(summary, by_reason, estimated_rows=10_000)
+
+    by_metric = preview.set_index(["metric", "reason"])
+    assert by_metric.loc[("total_clean", ""), "rate"] == 0.75
+    assert by_metric.loc[("total_discard", ""), "estimated_count"] == 500
+    row = by_metric.loc[("dq_reason_count", "invalid_vehicle_year_range")]
+    assert row["ci_low"] < 0.2 < row["ci_high"]
+    assert row["estimated_count"] == 2_000
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dq.rules import DISCARD, QUARANTINE, DQRule, RuleRegistry
+
+
+def negative(df):
+    return df["x"] < 0
+
+
+def null_id(df):
+    return df["id"].isna()
+
+
+def make_registry():
+    return RuleRegistry(
+        [
+            DQRule("negative_x", ("x",), QUARANTINE, negative, missing_reason="no_x"),
+            DQRule("null_id", ("id",), DISCARD, null_id),
+        ]
+    )
+
+
+def test_evaluate_sets_one_bit_per_reason_and_discard_mask():
+    registry = make_registry()
+    df = pd.DataFrame({"x": [1, -1, -2], "id": pd.array([1, 2, None], dtype="Int64")})
+
+    ev = registry.evaluate(df)
+
+    assert ev.codes.tolist() == [0, 1, 1 | 4]
+    assert ev.discard_mask.tolist() == [False, False, True]
+    assert registry.decode(ev.codes) == ["", "negative_x", "negative_x;null_id"]
+    assert registry.count(ev.codes) == {"negative_x": 2, "no_x": 0, "null_id": 1}
+
+
+def test_missing_column_uses_missing_reason_or_skips_rule():
+    registry = make_registry()
+    df = pd.DataFrame({"y": [1, 2]})
+
+    ev = registry.evaluate(df)
+
+    assert registry.decode(ev.codes) == ["no_x", "no_x"]
+    assert not ev.discard_mask.any()
+    timings = ev.timings.set_index("rule")
+    assert timings.loc["negative_x", "reason"] == "no_x"
+    assert pd.isna(timings.loc["null_id", "reason"])
+
+
+def test_timings_report_each_rule():
+    registry = make_registry()
+    df = pd.DataFrame({"x": [-1], "id": pd.array([1], dtype="Int64")})
+
+    ev = registry.evaluate(df)
+
+    assert ev.timings["rule"].tolist() == ["negative_x", "null_id"]
+    assert ev.timings["flagged"].tolist() == [1, 0]
+    assert (ev.timings["seconds"] >= 0).all()
+
+
+def test_register_rejects_duplicates_and_unknown_severity():
+    registry = make_registry()
+
+    with pytest.raises(ValueError, match="Duplicate DQ reason"):
+        registry.register(DQRule("null_id", ("id",), DISCARD, null_id))
+    with pytest.raises(ValueError, match="Unknown severity"):
+        registry.register(DQRule("other", ("id",), "warn", null_id))
+
+
+def test_decode_empty_codes():
+    registry = make_registry()
+
+    assert registry.decode(np.zeros(0, dtype=np.int64)) == []
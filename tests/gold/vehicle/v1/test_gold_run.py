@@ -0,0 +1,154 @@
+import pandas as pd
+import pytest
+
+import src.gold.vehicles.v1.run as gold_run
+from src.gold.vehicles.v1.aggregate import aggregate_vehicles, scan_partition, silver_dataset
+from src.silver.vehicles.v1.run import run as run_silver
+
+BRONZE_CSV = """UNIQUE_ID,COLLISION_ID,CRASH_DATE,VEHICLE_TYPE,VEHICLE_MAKE,VEHICLE_YEAR
+1,100,01/01/2024, Sedan ,TOYOTA,2010
+2,100,01/01/2024,Bike,,1899
+3,100,01/01/2024,Sedan,FORD,2020
+4,102,01/02/2024,Pick-up Truck,FORD,
+5,103,01/03/2024,Sedan,FORD,2020
+"""
+
+
+@pytest.fixture
+def silver(data_dir):
+    folder = data_dir / "bronze" / "vehicles" / "full"
+    folder.mkdir(parents=True)
+    (folder / "vehicles_raw_20240103.csv").write_text(BRONZE_CSV, encoding="utf-8")
+    run_silver("2026-02-27")
+    run_silver("2026-02-28")
+    return data_dir / "silver" / "vehicles" / "v1"
+
+
+def read_gold(data_dir, table):
+    return pd.read_parquet(data_dir / "gold" / "vehicles" / "v1" / table)
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    calls = []
+
+    def spy(dataset, run_date_str):
+        calls.append(run_date_str)
+        return scan_partition(dataset, run_date_str)
+
+    monkeypatch.setattr(gold_run, "scan_partition", spy)
+    return calls
+
+
+def test_scan_partition_prunes_and_projects(silver):
+    table = scan_partition(silver_dataset(silver), "2026-02-27")
+
+    assert table.column_names == ["collision_id", "vehicle_type", "vehicle_make", "vehicle_year"]
+    assert table.num_rows == 3
+
+
+def test_aggregates_are_counts_per_key(silver):
+    tables = aggregate_vehicles(scan_partition(silver_dataset(silver), "2026-02-27"))
+
+    per_collision = tables["vehicles_per_collision"].to_pydict()
+    assert per_collision == {"collision_id": ["100", "103"], "vehicles": [2, 1]}
+    assert tables["vehicle_make_counts"].to_pydict() == {
+        "vehicle_make": ["ford", "toyota"],
+        "vehicles": [2, 1],
+    }
+    assert tables["vehicle_year_distribution"].to_pydict() == {
+        "vehicle_year": [2020, 2010],
+        "vehicles": [2, 1],
+    }
+
+
+def test_gold_run_only_scans_new_partitions(data_dir, silver, scans):
+    gold_run.run("2026-03-01")
+    assert scans == ["2026-02-27", "2026-02-28"]
+
+    types = read_gold(data_dir, "vehicle_type_counts")
+    assert set(types["run_date"].astype(str)) == {"2026-02-27", "2026-02-28"}
+    assert types.groupby("vehicle_type")["vehicles"].sum().to_dict() == {"sedan": 6}
+
+    scans.clear()
+    gold_run.run("2026-03-01")
+    assert scans == []
+
+    run_silver("2026-02-28")
+    gold_run.run("2026-03-01")
+    assert scans == ["2026-02-28"]
+    assert (data_dir / "metrics" / "gold" / "vehicles" / "v1" / "run_date=2026-03-01" / "stages.csv").exists()
+
+
+def read_merged(data_dir, table):
+    return pd.read_parquet(data_dir / "gold" / "vehicles" / "v1" / "merged" / table)
+
+
+def test_merged_tables_take_the_latest_snapshot_by_default(data_dir, silver):
+    gold_run.run("2026-03-01")
+
+    per_collision = read_merged(data_dir, "vehicles_per_collision")
+    assert dict(zip(per_collision["collision_id"], per_collision["vehicles"])) == {"100": 2, "103": 1}
+    assert read_merged(data_dir, "vehicle_type_counts").to_dict("list") == {"vehicle_type": ["sedan"], "vehicles": [3]}
+
+
+def test_merged_tables_sum_increments_when_asked(data_dir, silver):
+    gold_run.run("2026-03-01", merge="sum")
+
+    per_collision = read_merged(data_dir, "vehicles_per_collision")
+    assert dict(zip(per_collision["collision_id"], per_collision["vehicles"])) == {"100": 4, "103": 2}
+
+
+def test_switching_merge_mode_rebuilds_merged_tables_without_scanning_silver(data_dir, silver, scans):
+    gold_run.run("2026-03-01")
+    scans.clear()
+
+    gold_run.run("2026-03-01", merge="sum")
+    per_collision = read_merged(data_dir, "vehicles_per_collision")
+    assert dict(zip(per_collision["collision_id"], per_collision["vehicles"])) == {"100": 4, "103": 2}
+    assert scans == []
+
+    run_silver("2026-02-28")
+    gold_run.run("2026-03-01", merge="sum")
+    per_collision = read_merged(data_dir, "vehicles_per_collision")
+    assert dict(zip(per_collision["collision_id"], per_collision["vehicles"])) == {"100": 4, "103": 2}
+
+    gold_run.run("2026-03-01")
+    per_collision = read_merged(data_dir, "vehicles_per_collision")
+    assert dict(zip(per_collision["collision_id"], per_collision["vehicles"])) == {"100": 2, "103": 1}
+    assert scans == ["2026-02-28"]
+
+
+def test_merged_tables_follow_removed_partitions(data_dir, silver, scans):
+    gold_run.run("2026-03-01")
+    gold_run._rmtree_force(silver / "run_date=2026-02-28")
+    (silver / "run_date=2026-02-27" / "part-vehicles_raw_20240103.parquet").unlink()
+    gold_run.run("2026-03-01")
+
+    assert read_merged(data_dir, "vehicle_type_counts").empty
+    gold_run._rmtree_force(silver / "run_date=2026-02-27")
+    gold_run.run("2026-03-01")
+    assert not (data_dir / "gold" / "vehicles" / "v1" / "merged").exists()
+
+
+def test_unknown_merge_mode_is_rejected(data_dir, silver):
+    with pytest.raises(ValueError, match="Unknown merge mode"):
+        gold_run.run("2026-03-01", merge="max")
+
+
+def test_gold_run_drops_removed_partitions(data_dir, silver, scans):
+    gold_run.run("2026-03-01")
+
+    gold_run._rmtree_force(silver / "run_date=2026-02-28")
+    gold_run.run("2026-03-01", full_refresh=True)
+
+    assert scans == ["2026-02-27", "2026-02-28", "2026-02-27"]
+    types = read_gold(data_dir, "vehicle_type_counts")
+    assert set(types["run_date"].astype(str)) == {"2026-02-27"}
+
+
+def test_gold_dry_run_writes_nothing(data_dir, silver):
+    gold_run.run("2026-03-01", dry_run=True)
+
+    assert not (data_dir / "gold").exists()
+    assert not (data_dir / "manifests" / "gold").exists()
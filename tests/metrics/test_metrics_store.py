@@ -0,0 +1,79 @@
+from datetime import date
+
+import pandas as pd
+from typer.testing import CliRunner
+
+from src.cli import app
+from src.metrics.metrics import _write_metrics_csv
+from src.metrics.store import import_metrics_csvs, metric_series, query_metrics, record_metrics
+
+
+def summary(run_date, quarantine):
+    return pd.DataFrame(
+        {
+            "run_date": run_date,
+            "metric": ["total_rows_read", "total_quarantine"],
+            "value": [10, quarantine],
+        }
+    )
+
+
+def by_reason(run_date, count):
+    return pd.DataFrame({"run_date": [run_date], "reason": ["No_vehicle_year"], "count": [count]})
+
+
+def test_record_and_query_series(tmp_path):
+    store = tmp_path / "metrics.sqlite"
+    for day, quarantine in [("2026-02-01", 3), ("2026-02-02", 5), ("2026-02-03", 4)]:
+        record_metrics(store, "vehicles", "v1", summary(day, quarantine), by_reason(day, quarantine))
+
+    series = metric_series(store, "vehicles", "v1", "total_quarantine", start=date(2026, 2, 2))
+
+    assert series.to_dict() == {"2026-02-02": 5, "2026-02-03": 4}
+
+    reasons = query_metrics(store, "vehicles", "v1", ["dq_reason_count"], reason="No_vehicle_year")
+    assert reasons["value"].tolist() == [3, 5, 4]
+
+
+def test_rerun_replaces_run_date_rows(tmp_path):
+    store = tmp_path / "metrics.sqlite"
+    record_metrics(store, "vehicles", "v1", summary("2026-02-01", 3), by_reason("2026-02-01", 3))
+    record_metrics(store, "vehicles", "v1", summary("2026-02-01", 7), by_reason("2026-02-01", 7).iloc[:0])
+
+    df = query_metrics(store, "vehicles", "v1")
+
+    assert len(df) == 2
+    assert metric_series(store, "vehicles", "v1", "total_quarantine").tolist() == [7]
+
+
+def test_query_missing_store_is_empty(tmp_path):
+    df = query_metrics(tmp_path / "missing.sqlite")
+
+    assert df.empty
+    assert not (tmp_path / "missing.sqlite").exists()
+
+
+def test_import_existing_csvs(tmp_path):
+    metrics_dir = tmp_path / "metrics" / "silver" / "vehicles" / "v1"
+    for day, quarantine in [("2026-02-01", 3), ("2026-02-02", 5)]:
+        _write_metrics_csv(metrics_dir / f"run_date={day}", summary(day, quarantine), by_reason(day, quarantine))
+
+    written = import_metrics_csvs(tmp_path / "metrics.sqlite", metrics_dir, "vehicles", "v1")
+
+    assert written == 6
+    assert metric_series(tmp_path / "metrics.sqlite", "vehicles", "v1", "total_quarantine").tolist() == [3, 5]
+
+
+def test_cli_query_prints_wide_csv(data_dir):
+    store = data_dir / "metrics" / "metrics.sqlite"
+    for day, quarantine in [("2026-02-01", 3), ("2026-02-02", 5)]:
+        record_metrics(store, "vehicles", "v1", summary(day, quarantine), by_reason(day, quarantine))
+
+    result = CliRunner().invoke(app, ["metrics", "query", "-m", "total_quarantine", "-m", "dq_reason_count", "--wide", "--csv"])
+
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines()[:3] == [
+        "run_date,dq_reason_count:No_vehicle_year,total_quarantine",
+        "2026-02-01,3,3",
+        "2026-02-02,5,5",
+    ]
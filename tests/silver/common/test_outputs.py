@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+import src.silver.common.outputs as outputs_module
+from src.silver.common.outputs import DQSinks, RunOutputs
+from src.utils.io_utils import ParquetAppendWriter
+
+
+def make_outputs(tmp_path):
+    return RunOutputs(
+        partition_dir=tmp_path / "silver" / "run_date=2024-01-01",
+        quarantine_dir=tmp_path / "quarantine" / "run_date=2024-01-01",
+        metrics_dir=tmp_path / "metrics" / "run_date=2024-01-01",
+    )
+
+
+def metrics():
+    summary = pd.DataFrame({"run_date": ["2024-01-01"], "metric": ["total_clean"], "value": [1]})
+    by_reason = pd.DataFrame(columns=["run_date", "reason", "count"])
+    return summary, by_reason
+
+
+def test_publish_replaces_all_three_folders(tmp_path):
+    outputs = make_outputs(tmp_path)
+    outputs.partition_dir.mkdir(parents=True)
+    (outputs.partition_dir / "stale.parquet").write_bytes(b"old")
+    for staged in (outputs.staged_partition_dir, outputs.staged_quarantine_dir):
+        staged.mkdir(parents=True)
+        (staged / "part-a.parquet").write_bytes(b"new")
+
+    outputs.publish(*metrics())
+
+    assert [p.name for p in outputs.partition_dir.iterdir()] == ["part-a.parquet"]
+    assert (outputs.quarantine_dir / "part-a.parquet").exists()
+    assert (outputs.metrics_dir / "metrics.csv").exists()
+    assert not outputs.staged_partition_dir.exists()
+
+
+def test_failed_publish_discards_the_staged_folders(tmp_path, monkeypatch):
+    outputs = make_outputs(tmp_path)
+    for staged in (outputs.staged_partition_dir, outputs.staged_quarantine_dir):
+        staged.mkdir(parents=True)
+
+    def fail(pairs):
+        raise OSError("rename failed")
+
+    monkeypatch.setattr(outputs_module, "_commit_dirs", fail)
+    with pytest.raises(OSError):
+        outputs.publish(*metrics())
+
+    for staged in (outputs.staged_partition_dir, outputs.staged_quarantine_dir, outputs.staged_metrics_dir):
+        assert not staged.exists()
+    assert not outputs.partition_dir.exists()
+
+
+def test_sinks_write_both_buckets(tmp_path):
+    sinks = DQSinks(ParquetAppendWriter(tmp_path / "clean.parquet"), ParquetAppendWriter(tmp_path / "quarantine.parquet"))
+
+    sinks.write([pd.DataFrame({"id": [1, 2]})], [pd.DataFrame({"id": [3]})])
+    sinks.write([pd.DataFrame({"id": [4]})], [])
+    written = sinks.close()
+
+    assert pd.read_parquet(tmp_path / "clean.parquet")["id"].tolist() == [1, 2, 4]
+    assert pd.read_parquet(tmp_path / "quarantine.parquet")["id"].tolist() == [3]
+    assert written == sum(p.stat().st_size for p in tmp_path.glob("*.parquet"))
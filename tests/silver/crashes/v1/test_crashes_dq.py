@@ -0,0 +1,20 @@
+import pandas as pd
+
+from src.dq.silver.crashes.v1.dq import apply_quality_rules_crashes
+
+
+def test_buckets_by_date_time_and_collision_id():
+    df = pd.DataFrame(
+        {
+            "collision_id": pd.array(["1", "2", "3", None], dtype="string"),
+            "crash_date": pd.to_datetime(["2024-01-01", None, "2099-01-01", "2024-01-01"]),
+            "crash_time": pd.array(["09:00", "10:00", None, "11:00"], dtype="string"),
+        }
+    )
+
+    dq = apply_quality_rules_crashes(df, run_date_str="2026-02-27")
+
+    assert dq.clean_idx.tolist() == [0]
+    assert dq.quarantine_idx.tolist() == [1, 2]
+    assert dq.discard_idx.tolist() == [3]
+    assert dq.quarantine_df["dq_reasons"].tolist() == ["invalid_crash_date", "invalid_crash_date;invalid_crash_time"]
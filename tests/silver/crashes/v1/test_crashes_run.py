@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.silver.crashes.v1.ingest import read_crashes
+from src.silver.crashes.v1.run import crash_id_index_path, run
+
+BRONZE_CSV = """CRASH DATE,CRASH TIME,BOROUGH,ZIP CODE,NUMBER OF PERSONS INJURED,NUMBER OF PERSONS KILLED,COLLISION_ID
+01/01/2024,9:05,BROOKLYN,11201,1,0, 100
+01/02/2024,25:00,QUEENS,,0,0,101
+not a date,12:00,,,0,0,102
+01/03/2024,0:30,BRONX,,2,1,
+01/03/2024,23:59:30,MANHATTAN,,x,0,103
+"""
+
+
+@pytest.fixture
+def bronze_crashes(data_dir):
+    folder = data_dir / "bronze" / "crashes" / "full"
+    folder.mkdir(parents=True)
+    path = folder / "crashes_raw_20240103.csv"
+    path.write_text(BRONZE_CSV, encoding="utf-8")
+    return path
+
+
+def test_ingest_types_and_normalizes_time(bronze_crashes):
+    df = read_crashes(bronze_crashes)
+
+    assert df["collision_id"].tolist()[:3] == ["100", "101", "102"]
+    assert df["crash_time"].tolist()[0] == "09:05"
+    assert pd.isna(df["crash_time"].iloc[1])
+    assert df["crash_time"].iloc[4] == "23:59:30"
+    assert pd.isna(df["crash_date"].iloc[2])
+    assert df["persons_injured"].isna().tolist() == [False, False, False, False, True]
+
+
+def test_run_writes_partition_metrics_and_collision_index(data_dir, bronze_crashes):
+    run("2026-02-27")
+
+    clean = pd.read_parquet(data_dir / "silver" / "crashes" / "v1")
+    quarantine = pd.read_parquet(data_dir / "silver_quarantine" / "crashes" / "v1" / "run_date=2026-02-27")
+    assert sorted(clean["collision_id"]) == ["100", "103"]
+    assert sorted(quarantine["collision_id"]) == ["101", "102"]
+
+    shard = crash_id_index_path() / "run_date=2026-02-27.npy"
+    assert np.load(shard).tolist() == [100, 101, 102, 103]
+
+    metrics = pd.read_csv(data_dir / "metrics" / "silver" / "crashes" / "v1" / "run_date=2026-02-27" / "metrics.csv")
+    m = dict(zip(metrics["metric"], metrics["value"]))
+    assert m["total_discard"] == 1
+
+
+def test_dry_run_writes_nothing(data_dir, bronze_crashes):
+    run("2026-02-27", dry_run=True, chunk_size=2)
+
+    assert not (data_dir / "silver").exists()
+    assert not crash_id_index_path().exists()
+
+
+def test_vehicles_of_quarantined_crashes_are_not_orphans(data_dir, bronze_crashes):
+    from src.silver.vehicles.v1.run import run as run_vehicles
+
+    run("2026-02-27")
+    folder = data_dir / "bronze" / "vehicles" / "full"
+    folder.mkdir(parents=True)
+    (folder / "vehicles_raw_20240103.csv").write_text(
+        "UNIQUE_ID,COLLISION_ID,VEHICLE_TYPE,VEHICLE_MAKE,VEHICLE_YEAR\n"
+        "1,100,Sedan,FORD,2010\n2,101,Sedan,FORD,2010\n3,102,Sedan,FORD,2010\n4,999,Sedan,FORD,2010\n",
+        encoding="utf-8",
+    )
+
+    run_vehicles("2026-02-27", check_collisions=True)
+
+    clean = pd.read_parquet(data_dir / "silver" / "vehicles" / "v1")
+    quarantine = pd.read_parquet(data_dir / "silver_quarantine" / "vehicles" / "v1" / "run_date=2026-02-27")
+    assert sorted(clean["unique_id"]) == [1, 2, 3]
+    assert quarantine[["unique_id", "dq_reasons"]].values.tolist() == [[4, "orphan_collision_id"]]
@@ -0,0 +1,119 @@
+import json
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import src.silver.vehicles.v1.backfill as backfill_module
+from src.silver.vehicles.v1.backfill import backfill, drops_by_date, plan_dates
+from src.silver.vehicles.v1.run import run
+
+HEADER = "UNIQUE_ID,COLLISION_ID,VEHICLE_TYPE,VEHICLE_MAKE,VEHICLE_YEAR\n"
+DROPS = {
+    "20240101": "1,100,Sedan,TOYOTA,2010\n2,100,Bike,,1899\n",
+    "20240102": "3,101,Sedan,HONDA,2015\n,102,Sedan,FORD,2016\n",
+    "20240103": "5,103,Sedan,FORD,2020\n",
+    "20231231": "6,104,Sedan,KIA,2020\n",
+}
+
+
+@pytest.fixture
+def bronze_dir(data_dir):
+    folder = data_dir / "bronze" / "vehicles" / "full"
+    folder.mkdir(parents=True)
+    for stamp, body in DROPS.items():
+        (folder / f"vehicles_raw_{stamp}.csv").write_text(HEADER + body, encoding="utf-8")
+    (folder / "vehicles_raw_latest.csv").write_text(HEADER + "9,109,Sedan,KIA,2020\n", encoding="utf-8")
+    return folder
+
+
+def read_partition(data_dir, layer, run_date):
+    return pd.read_parquet(data_dir / layer / "vehicles" / "v1" / f"run_date={run_date}")
+
+
+def checkpoint(data_dir):
+    return json.loads((data_dir / "manifests" / "silver" / "vehicles" / "v1" / "backfill.json").read_text())
+
+
+def test_plan_dates_covers_range_and_rejects_reversed():
+    assert plan_dates(date(2024, 1, 30), date(2024, 2, 1)) == ["2024-01-30", "2024-01-31", "2024-02-01"]
+    with pytest.raises(ValueError):
+        plan_dates(date(2024, 2, 1), date(2024, 1, 1))
+
+
+def test_drops_by_date_skips_undated_files(bronze_dir):
+    drops = drops_by_date(list(bronze_dir.glob("*.csv")))
+
+    assert sorted(drops) == ["2023-12-31", "2024-01-01", "2024-01-02", "2024-01-03"]
+    assert drops["2024-01-02"] == [bronze_dir / "vehicles_raw_20240102.csv"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_backfill_loads_each_run_date_from_its_dated_drop(data_dir, bronze_dir, workers):
+    backfill(date(2024, 1, 1), date(2024, 1, 4), workers=workers)
+
+    assert read_partition(data_dir, "silver", "2024-01-01")["unique_id"].tolist() == [1]
+    assert read_partition(data_dir, "silver_quarantine", "2024-01-01")["unique_id"].tolist() == [2]
+    assert read_partition(data_dir, "silver", "2024-01-02")["unique_id"].tolist() == [3]
+    assert read_partition(data_dir, "silver", "2024-01-03")["unique_id"].tolist() == [5]
+    assert not (data_dir / "silver" / "vehicles" / "v1" / "run_date=2024-01-04").exists()
+    assert not (data_dir / "silver" / "vehicles" / "v1" / "run_date=2023-12-31").exists()
+
+    metrics = pd.read_csv(data_dir / "metrics" / "silver" / "vehicles" / "v1" / "run_date=2024-01-02" / "metrics.csv")
+    assert dict(zip(metrics["metric"], metrics["value"]))["total_discard"] == 1
+
+    assert checkpoint(data_dir)["done"] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+
+
+def test_backfill_matches_one_silver_run_per_date(data_dir, bronze_dir):
+    backfill(date(2024, 1, 1), date(2024, 1, 3))
+    backfilled = {d: read_partition(data_dir, "silver", d) for d in ("2024-01-01", "2024-01-02", "2024-01-03")}
+
+    for d, expected in backfilled.items():
+        day = date.fromisoformat(d)
+        run(d, from_date=day, to_date=day)
+        pd.testing.assert_frame_equal(read_partition(data_dir, "silver", d), expected)
+
+
+def test_failed_backfill_resumes_without_reparsing_published_drops(data_dir, bronze_dir, monkeypatch):
+    real_process = backfill_module._process_files
+    loaded = []
+
+    def flaky(ctx, files):
+        loaded.append(ctx.run_date_str)
+        if ctx.run_date_str == "2024-01-02":
+            raise OSError("disk full")
+        return real_process(ctx, files)
+
+    monkeypatch.setattr(backfill_module, "_process_files", flaky)
+    with pytest.raises(RuntimeError, match="2024-01-02"):
+        backfill(date(2024, 1, 1), date(2024, 1, 3))
+
+    assert checkpoint(data_dir)["done"] == ["2024-01-01", "2024-01-03"]
+    assert not (data_dir / "silver" / "vehicles" / "v1" / "run_date=2024-01-02").exists()
+
+    def tracked(ctx, files):
+        loaded.append(ctx.run_date_str)
+        return real_process(ctx, files)
+
+    loaded.clear()
+    monkeypatch.setattr(backfill_module, "_process_files", tracked)
+    backfill(date(2024, 1, 1), date(2024, 1, 3))
+
+    assert loaded == ["2024-01-02"]
+    assert read_partition(data_dir, "silver", "2024-01-02")["unique_id"].tolist() == [3]
+    assert checkpoint(data_dir)["done"] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+
+
+def test_changed_drop_restarts_the_plan(data_dir, bronze_dir):
+    backfill(date(2024, 1, 1), date(2024, 1, 3))
+    (bronze_dir / "vehicles_raw_20240103.csv").write_text(HEADER + "59,103,Sedan,FORD,2020\n", encoding="utf-8")
+
+    backfill(date(2024, 1, 1), date(2024, 1, 3))
+
+    assert read_partition(data_dir, "silver", "2024-01-03")["unique_id"].tolist() == [59]
+
+
+def test_range_without_dated_drops_is_rejected(data_dir, bronze_dir):
+    with pytest.raises(FileNotFoundError, match="No Bronze drop dated"):
+        backfill(date(2024, 2, 1), date(2024, 2, 3))
@@ -1,8 +1,16 @@
+import numpy as np
 import pandas as pd
 import pytest
 from datetime import date
 
-from src.dq.silver.vehicles.v1.dq import apply_quality_rules_vehicles
+from src.dq.rules import QUARANTINE, DQRule, RuleRegistry
+from src.dq.silver.vehicles.v1.dq import (
+    VEHICLE_RULES,
+    apply_quality_rules_vehicles,
+    merge_dq_metrics,
+    vehicle_rules,
+)
+from src.utils.id_index import IdIndex
 
 
 def make_df(rows):
@@ -127,4 +135,163 @@ def test_metrics_by_reason_explodes_reasons_and_counts():
     counts = dict(zip(dq.metrics_by_reason["reason"], dq.metrics_by_reason["count"]))
 
     assert counts["invalid_vehicle_year_range"] == 2
-    assert counts["discard_missing_id"] == 1
\ No newline at end of file
+    assert counts["discard_missing_id"] == 1
+
+def test_merge_dq_metrics_sums_batches():
+    batches = [
+        make_df([{"unique_id": 1, "collision_id": 10, "vehicle_year": 1899}]),
+        make_df(
+            [
+                {"unique_id": 2, "collision_id": 11, "vehicle_year": 2010},
+                {"unique_id": None, "collision_id": 12, "vehicle_year": 1899},
+            ]
+        ),
+    ]
+    results = [apply_quality_rules_vehicles(b, run_date_str="2026-02-27") for b in batches]
+
+    summary, by_reason = merge_dq_metrics(
+        [r.metrics_summary for r in results],
+        [r.metrics_by_reason for r in results],
+        "2026-02-27",
+    )
+
+    m = dict(zip(summary["metric"], summary["value"]))
+    assert m == {"total_rows_read": 3, "total_clean": 1, "total_quarantine": 1, "total_discard": 1}
+    counts = dict(zip(by_reason["reason"], by_reason["count"]))
+    assert counts == {"invalid_vehicle_year_range": 2, "discard_missing_id": 1}
+    assert (by_reason["run_date"] == "2026-02-27").all()
+
+
+def test_dq_reasons_are_joined_in_rule_order():
+    df = make_df([{"unique_id": None, "collision_id": 10, "vehicle_year": 1899}])
+
+    dq = apply_quality_rules_vehicles(df, run_date_str="2026-02-27")
+
+    assert dq.discard_df.iloc[0]["dq_reasons"] == "invalid_vehicle_year_range;discard_missing_id"
+    assert list(dq.discard_df.columns[-2:]) == ["dq_reasons", "run_date"]
+
+
+def test_custom_rule_registry_is_applied():
+    rules = RuleRegistry(
+        list(VEHICLE_RULES.rules)
+        + [DQRule("unknown_vehicle_type", ("vehicle_type",), QUARANTINE, lambda d: d["vehicle_type"] == "UNKNOWN")]
+    )
+    df = make_df(
+        [
+            {"unique_id": 1, "collision_id": 10, "vehicle_year": 2010, "vehicle_type": "UNKNOWN"},
+            {"unique_id": 2, "collision_id": 11, "vehicle_year": 2010, "vehicle_type": "Sedan"},
+        ]
+    )
+
+    dq = apply_quality_rules_vehicles(df, run_date_str="2026-02-27", rules=rules)
+
+    assert dq.quarantine_df["unique_id"].tolist() == [1]
+    assert dq.quarantine_df.iloc[0]["dq_reasons"] == "unknown_vehicle_type"
+    assert dq.metrics_by_rule["rule"].tolist() == [
+        "invalid_vehicle_year_range",
+        "discard_missing_id",
+        "unknown_vehicle_type",
+    ]
+
+
+def test_result_shares_input_buffers_and_does_not_modify_input():
+    df = make_df(
+        [
+            {"unique_id": 1, "collision_id": 10, "vehicle_year": 2010},
+            {"unique_id": 2, "collision_id": 11, "vehicle_year": 1899},
+        ]
+    )
+
+    dq = apply_quality_rules_vehicles(df, run_date_str="2026-02-27")
+
+    assert "run_date" not in df.columns
+    assert np.shares_memory(
+        dq.frame["vehicle_year"].array._data, df["vehicle_year"].array._data
+    )
+    assert dq.clean_idx.tolist() == [0]
+    assert dq.quarantine_idx.tolist() == [1]
+
+
+def test_batches_yield_bucket_in_slices():
+    df = make_df(
+        [{"unique_id": i, "collision_id": 10, "vehicle_year": 1899 if i % 2 else 2010} for i in range(7)]
+    )
+
+    dq = apply_quality_rules_vehicles(df, run_date_str="2026-02-27")
+    parts = list(dq.batches("quarantine", batch_rows=2))
+
+    assert [len(p) for p in parts] == [2, 1]
+    pd.testing.assert_frame_equal(pd.concat(parts), dq.quarantine_df)
+    assert len(list(dq.batches("discard"))) == 1
+
+
+def test_duplicate_unique_id_discards_seen_and_repeated_ids(tmp_path):
+    seen = IdIndex(tmp_path)
+    seen.write_shard("2026-02-26", np.array([1]))
+    df = make_df(
+        [
+            {"unique_id": 1, "collision_id": 10, "vehicle_year": 2010},
+            {"unique_id": 2, "collision_id": 10, "vehicle_year": 2010},
+            {"unique_id": 2, "collision_id": 11, "vehicle_year": 2010},
+            {"unique_id": None, "collision_id": 12, "vehicle_year": 2010},
+            {"unique_id": 3, "collision_id": 13, "vehicle_year": 1800},
+        ]
+    )
+
+    dq = apply_quality_rules_vehicles(df, run_date_str="2026-02-27", rules=vehicle_rules(seen))
+
+    assert dq.clean_idx.tolist() == [1]
+    assert dq.quarantine_idx.tolist() == [4]
+    assert dq.discard_idx.tolist() == [0, 2, 3]
+    assert dict(zip(dq.metrics_by_reason["reason"], dq.metrics_by_reason["count"])) == {
+        "duplicate_unique_id": 2,
+        "discard_missing_id": 1,
+        "invalid_vehicle_year_range": 1,
+    }
+    assert vehicle_rules() is VEHICLE_RULES
+
+
+def test_repeat_of_a_rejected_row_is_not_a_duplicate(tmp_path):
+    df = make_df(
+        [
+            {"unique_id": 5, "collision_id": None, "vehicle_year": 2010},
+            {"unique_id": 5, "collision_id": 10, "vehicle_year": 2010},
+            {"unique_id": 6, "collision_id": 11, "vehicle_year": 1800},
+            {"unique_id": 6, "collision_id": 12, "vehicle_year": 2010},
+            {"unique_id": 6, "collision_id": 13, "vehicle_year": 1800},
+        ]
+    )
+
+    dq = apply_quality_rules_vehicles(df, run_date_str="2026-02-27", rules=vehicle_rules(IdIndex(tmp_path)))
+
+    assert dq.clean_idx.tolist() == [1, 3]
+    assert dq.quarantine_idx.tolist() == [2]
+    assert dq.discard_idx.tolist() == [0, 4]
+
+
+def test_orphan_collision_id_quarantines_ids_missing_from_crashes(tmp_path):
+    crashes = IdIndex(tmp_path)
+    crashes.write_shard("2026-02-27", np.array([10, 11]))
+    df = pd.DataFrame(
+        {
+            "unique_id": pd.array([1, 2, 3, 4], dtype="Int64"),
+            "collision_id": pd.array(["10", "99", None, "abc"], dtype="string"),
+            "vehicle_year": pd.array([2010, 2010, 2010, 2010], dtype="Int64"),
+        }
+    )
+
+    dq = apply_quality_rules_vehicles(df, run_date_str="2026-02-27", rules=vehicle_rules(crash_ids=crashes))
+
+    assert dq.clean_idx.tolist() == [0]
+    assert dq.quarantine_idx.tolist() == [1, 3]
+    assert dq.discard_idx.tolist() == [2]
+    assert dq.quarantine_df["dq_reasons"].tolist() == ["orphan_collision_id", "orphan_collision_id"]
+
+
+def test_batches_can_be_ordered_by_key_columns():
+    df = make_df([{"unique_id": u, "collision_id": c, "vehicle_year": 2010} for u, c in [(1, 30), (2, 10), (3, 20), (4, 10)]])
+
+    dq = apply_quality_rules_vehicles(df, run_date_str="2026-02-27")
+    parts = list(dq.batches("clean", batch_rows=2, order_by=["collision_id", "unique_id"]))
+
+    assert [p["unique_id"].tolist() for p in parts] == [[2, 4], [3, 1]]
@@ -0,0 +1,130 @@
+import pandas as pd
+import pytest
+
+import src.silver.vehicles.v1.ingest as ingest
+from src.silver.vehicles.v1.ingest import iter_vehicle_frames, read_vehicles
+from src.utils.arrow_cache import ArrowCache
+
+MESSY_CSV = """UNIQUE_ID,COLLISION_ID,EXTRA,VEHICLE_TYPE,VEHICLE_MAKE,VEHICLE_YEAR
+ 1 , 100 ,x, Sedan ,TOYOTA,2010
+2,100,x,Bike,  ,1899.0
+abc,101,x,Sedan,HONDA,20x5
+4,,x,NA,FORD,
+5,103,x,Sedan,FORD, 2020 
+"""
+
+
+@pytest.fixture
+def messy_file(tmp_path):
+    path = tmp_path / "vehicles.csv"
+    path.write_text(MESSY_CSV, encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("engine", ["arrow", "stream"])
+def test_arrow_and_pandas_engines_produce_same_frame(messy_file, engine):
+    expected = read_vehicles(messy_file, engine="pandas")
+    got = read_vehicles(messy_file, engine=engine)
+
+    pd.testing.assert_frame_equal(got, expected)
+    assert got["unique_id"].tolist()[:2] == [1, 2]
+    assert got["vehicle_year"].isna().tolist() == [False, False, True, True, False]
+
+
+EDGE_CSV = """UNIQUE_ID,COLLISION_ID,VEHICLE_TYPE,VEHICLE_MAKE,VEHICLE_YEAR
+1,None,<NA>,NULL,1e3
+2,n/a,#N/A,null,2010.5
+3,NaN,-nan,FORD,inf
+1.0e1,7,Sedan,N/A,1e30
++5,8,Sedan,FORD,.5
+0x10,9,Sedan,FORD,5.
+"""
+
+
+@pytest.mark.parametrize("engine", ["arrow", "stream", "cache"])
+def test_engines_agree_on_na_strings_and_numeric_literals(tmp_path, engine):
+    path = tmp_path / "edge.csv"
+    path.write_text(EDGE_CSV, encoding="utf-8")
+    cache = ArrowCache(tmp_path / "cache", max_bytes=1 << 30) if engine == "cache" else None
+
+    expected = read_vehicles(path, engine="pandas")
+    got = pd.concat(
+        list(iter_vehicle_frames(path, engine="pandas" if cache else engine, cache=cache)), ignore_index=True
+    )
+
+    pd.testing.assert_frame_equal(got, expected)
+    assert got["unique_id"].tolist()[3:5] == [10, 5]
+    assert got["unique_id"].isna().tolist() == [False] * 5 + [True]
+    assert got["vehicle_year"].tolist()[0] == 1000
+    assert got["vehicle_year"].isna().tolist() == [False, True, True, True, True, False]
+    assert got["collision_id"].isna().tolist()[:3] == [True, True, True]
+    assert got[["vehicle_type", "vehicle_make"]].isna().sum().tolist() == [3, 3]
+
+
+@pytest.mark.parametrize("engine", ["pandas", "arrow", "stream"])
+def test_chunked_frames_concatenate_to_full_frame(messy_file, engine):
+    full = read_vehicles(messy_file, engine=engine)
+    chunks = list(iter_vehicle_frames(messy_file, chunk_size=2, engine=engine))
+
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), full)
+
+
+@pytest.mark.parametrize("engine", ["pandas", "arrow", "stream"])
+def test_missing_target_column_raises(tmp_path, engine):
+    path = tmp_path / "bad.csv"
+    path.write_text("UNIQUE_ID,COLLISION_ID\n1,2\n", encoding="utf-8")
+
+    with pytest.raises(KeyError, match="Missing required columns"):
+        list(iter_vehicle_frames(path, chunk_size=10, engine=engine))
+
+
+@pytest.mark.parametrize("engine", ["pandas", "arrow", "stream"])
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_aliased_header_reads_like_canonical_header(tmp_path, messy_file, engine, chunk_size):
+    aliased = tmp_path / "api_export.csv"
+    header, body = MESSY_CSV.split("\n", 1)
+    aliased.write_text(header.lower().replace("vehicle_type", "VEHICLE TYPE") + "\n" + body, encoding="utf-8")
+
+    expected = read_vehicles(messy_file, engine=engine)
+    got = pd.concat(list(iter_vehicle_frames(aliased, chunk_size=chunk_size, engine=engine)), ignore_index=True)
+
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_stream_engine_never_reads_the_whole_file(messy_file, monkeypatch):
+    monkeypatch.setattr(ingest, "STREAM_BATCH_ROWS", 2)
+    expected = read_vehicles(messy_file, engine="pandas")
+
+    chunks = list(iter_vehicle_frames(messy_file, engine="stream"))
+
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_cached_frames_match_uncached_and_skip_parsing_on_hit(tmp_path, messy_file, monkeypatch, chunk_size):
+    cache = ArrowCache(tmp_path / "cache", max_bytes=1 << 30)
+    expected = read_vehicles(messy_file, engine="pandas")
+
+    first = pd.concat(list(iter_vehicle_frames(messy_file, chunk_size, cache=cache)), ignore_index=True)
+    assert len(cache.entries()) == 1
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("Bronze CSV parsed on a cache hit")
+
+    monkeypatch.setattr(ingest, "_iter_csv_arrow", no_parse)
+    second = pd.concat(list(iter_vehicle_frames(messy_file, chunk_size, cache=cache)), ignore_index=True)
+
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+
+
+def test_cache_rejects_missing_target_column(tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("UNIQUE_ID,COLLISION_ID\n1,2\n", encoding="utf-8")
+    cache = ArrowCache(tmp_path / "cache", max_bytes=1 << 30)
+
+    with pytest.raises(KeyError, match="Missing required columns"):
+        list(iter_vehicle_frames(path, cache=cache))
+    assert cache.entries() == []
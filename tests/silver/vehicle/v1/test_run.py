@@ -0,0 +1,482 @@
+import json
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from src.config import silver_id_index_path
+from src.metrics.store import metric_series
+from src.silver.vehicles.v1.run import run
+from src.utils.id_index import IdIndex
+
+BRONZE_CSV = """UNIQUE_ID,COLLISION_ID,CRASH_DATE,VEHICLE_TYPE,VEHICLE_MAKE,VEHICLE_YEAR
+1,100,01/01/2024, Sedan ,TOYOTA,2010
+2,100,01/01/2024,Bike,,1899
+,101,01/02/2024,Sedan,HONDA,2015
+4,102,01/02/2024,Pick-up Truck,FORD,
+5,103,01/03/2024,Sedan,FORD,2020
+"""
+
+
+@pytest.fixture
+def bronze_file(data_dir):
+    folder = data_dir / "bronze" / "vehicles" / "full"
+    folder.mkdir(parents=True)
+    path = folder / "vehicles_raw_20240103.csv"
+    path.write_text(BRONZE_CSV, encoding="utf-8")
+    return path
+
+
+def read_outputs(data_dir):
+    clean = pd.read_parquet(data_dir / "silver" / "vehicles" / "v1")
+    quarantine = pd.read_parquet(
+        data_dir / "silver_quarantine" / "vehicles" / "v1" / "run_date=2026-02-27"
+    )
+    metrics = pd.read_csv(
+        data_dir / "metrics" / "silver" / "vehicles" / "v1" / "run_date=2026-02-27" / "metrics.csv"
+    )
+    return clean, quarantine, metrics
+
+
+def test_run_writes_clean_quarantine_and_metrics(data_dir, bronze_file):
+    run("2026-02-27")
+
+    clean, quarantine, metrics = read_outputs(data_dir)
+
+    assert sorted(clean["unique_id"].tolist()) == [1, 5]
+    assert clean.loc[clean["unique_id"] == 1, "vehicle_type"].iloc[0] == "sedan"
+    assert sorted(quarantine["unique_id"].tolist()) == [2, 4]
+    m = dict(zip(metrics["metric"], metrics["value"]))
+    assert m["total_rows_read"] == 5
+    assert m["total_discard"] == 1
+
+
+def test_chunked_run_matches_full_run(data_dir, bronze_file):
+    run("2026-02-27")
+    full_clean, full_quarantine, full_metrics = read_outputs(data_dir)
+
+    run("2026-02-27", chunk_size=2)
+    clean, quarantine, metrics = read_outputs(data_dir)
+
+    key = ["unique_id"]
+    pd.testing.assert_frame_equal(
+        clean.sort_values(key).reset_index(drop=True),
+        full_clean.sort_values(key).reset_index(drop=True),
+        check_dtype=False,
+        check_categorical=False,
+    )
+    pd.testing.assert_frame_equal(
+        quarantine.sort_values(key).reset_index(drop=True),
+        full_quarantine.sort_values(key).reset_index(drop=True),
+        check_categorical=False,
+    )
+    summary = metrics[metrics["metric"] != "dq_reason_count"]
+    full_summary = full_metrics[full_metrics["metric"] != "dq_reason_count"]
+    assert dict(zip(summary["metric"], summary["value"])) == dict(
+        zip(full_summary["metric"], full_summary["value"])
+    )
+    reasons = metrics[metrics["metric"] == "dq_reason_count"]
+    full_reasons = full_metrics[full_metrics["metric"] == "dq_reason_count"]
+    assert dict(zip(reasons["reason"], reasons["count"])) == dict(
+        zip(full_reasons["reason"], full_reasons["count"])
+    )
+
+
+def test_chunked_dry_run_writes_nothing(data_dir, bronze_file):
+    run("2026-02-27", dry_run=True, chunk_size=2)
+
+    assert not (data_dir / "silver").exists()
+    assert not (data_dir / "metrics").exists()
+
+
+def test_incremental_run_skips_when_nothing_new(data_dir, bronze_file, monkeypatch):
+    run("2026-02-27", incremental=True)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Bronze CSV should not be parsed")
+
+    monkeypatch.setattr(pd, "read_csv", fail)
+    run("2026-02-28", incremental=True)
+
+    assert not (data_dir / "silver" / "vehicles" / "v1" / "run_date=2026-02-28").exists()
+
+
+def test_bronze_file_without_target_columns_is_rejected_before_parsing(data_dir, bronze_file, monkeypatch):
+    (bronze_file.parent / "vehicles_raw_20240104.csv").write_text("UNIQUE_ID,VEHICLE_TYPE\n6,Sedan\n", encoding="utf-8")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Bronze CSV should not be parsed")
+
+    monkeypatch.setattr(pd, "read_csv", fail)
+    with pytest.raises(KeyError, match="vehicles_raw_20240104.csv"):
+        run("2026-02-27", files_glob="*.csv")
+    assert not (data_dir / "silver").exists()
+
+
+def test_aliased_bronze_header_loads_and_schema_is_fingerprinted(data_dir, bronze_file):
+    header, body = BRONZE_CSV.split("\n", 1)
+    bronze_file.write_text(header.replace("UNIQUE_ID", "unique_id") + "\n" + body, encoding="utf-8")
+
+    run("2026-02-27")
+
+    clean, _, _ = read_outputs(data_dir)
+    assert sorted(clean["unique_id"].tolist()) == [1, 5]
+    stored = json.loads((data_dir / "manifests" / "silver" / "vehicles" / "v1" / "bronze_schema.json").read_text())
+    assert stored["columns"][0] == "unique_id"
+    assert stored["kinds"]["UNIQUE_ID"] == "integer"
+
+
+def test_schema_drift_requiring_a_mapping_fails_before_parsing(data_dir, bronze_file, monkeypatch):
+    header, body = BRONZE_CSV.split("\n", 1)
+    bronze_file.write_text(header.replace("VEHICLE_YEAR", "Vehicle-Year") + "\n" + body, encoding="utf-8")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Bronze CSV should not be parsed")
+
+    monkeypatch.setattr(pd, "read_csv", fail)
+    with pytest.raises(KeyError, match="requires-mapping.*'Vehicle-Year'"):
+        run("2026-02-27")
+    assert not (data_dir / "silver").exists()
+
+
+def test_incremental_run_only_replaces_its_partition(data_dir, bronze_file):
+    run("2026-02-27", incremental=True)
+
+    new_file = bronze_file.parent / "vehicles_raw_20240104.csv"
+    new_file.write_text(
+        "UNIQUE_ID,COLLISION_ID,VEHICLE_TYPE,VEHICLE_MAKE,VEHICLE_YEAR\n6,104,Sedan,KIA,2019\n",
+        encoding="utf-8",
+    )
+    run("2026-02-28", incremental=True)
+
+    silver_dir = data_dir / "silver" / "vehicles" / "v1"
+    old = pd.read_parquet(silver_dir / "run_date=2026-02-27")
+    new = pd.read_parquet(silver_dir / "run_date=2026-02-28")
+    assert sorted(old["unique_id"].tolist()) == [1, 5]
+    assert new["unique_id"].tolist() == [6]
+
+
+def test_incremental_run_reloads_drop_rewritten_in_place(data_dir, bronze_file, monkeypatch):
+    import src.utils.manifest as manifest_module
+
+    # Trust the folder mtime right away: the catalog does not see the rewrite.
+    monkeypatch.setattr(manifest_module, "RACY_WINDOW_NS", 0)
+    run("2026-02-27", incremental=True)
+
+    folder_stat = bronze_file.parent.stat()
+    with open(bronze_file, "a", encoding="utf-8") as f:
+        f.write("6,104,01/04/2024,Sedan,KIA,2019\n")
+    os.utime(bronze_file.parent, ns=(folder_stat.st_atime_ns, folder_stat.st_mtime_ns))
+    run("2026-02-28", incremental=True)
+
+    clean = pd.read_parquet(data_dir / "silver" / "vehicles" / "v1" / "run_date=2026-02-28")
+    assert sorted(clean["unique_id"].tolist()) == [1, 5, 6]
+
+
+def test_incremental_rerun_keeps_files_already_in_partition(data_dir, bronze_file):
+    run("2026-02-27", incremental=True)
+
+    new_file = bronze_file.parent / "vehicles_raw_20240104.csv"
+    new_file.write_text(
+        "UNIQUE_ID,COLLISION_ID,VEHICLE_TYPE,VEHICLE_MAKE,VEHICLE_YEAR\n6,104,Sedan,KIA,2019\n",
+        encoding="utf-8",
+    )
+    run("2026-02-27", incremental=True)
+
+    clean = pd.read_parquet(data_dir / "silver" / "vehicles" / "v1" / "run_date=2026-02-27")
+    assert sorted(clean["unique_id"].tolist()) == [1, 5, 6]
+
+
+@pytest.mark.parametrize("engine", ["arrow", "stream"])
+def test_arrow_engine_matches_pandas_engine(data_dir, bronze_file, engine):
+    run("2026-02-27")
+    pandas_outputs = read_outputs(data_dir)
+
+    run("2026-02-27", engine=engine)
+    arrow_outputs = read_outputs(data_dir)
+
+    for expected, got in zip(pandas_outputs, arrow_outputs):
+        pd.testing.assert_frame_equal(got, expected)
+
+
+def test_unknown_engine_is_rejected(data_dir, bronze_file):
+    with pytest.raises(ValueError, match="Unknown ingest engine"):
+        run("2026-02-27", engine="polars")
+
+
+def write_drop(folder, day, rows):
+    path = folder / f"vehicles_raw_{day}.csv"
+    body = "".join(f"{uid},{cid},Sedan,KIA,{year}\n" for uid, cid, year in rows)
+    path.write_text("UNIQUE_ID,COLLISION_ID,VEHICLE_TYPE,VEHICLE_MAKE,VEHICLE_YEAR\n" + body, encoding="utf-8")
+    return path
+
+
+def test_parallel_multi_file_run_merges_metrics(data_dir, bronze_file):
+    folder = bronze_file.parent
+    write_drop(folder, "20240104", [(6, 104, 2019), (7, 105, 1800)])
+    write_drop(folder, "20240105", [(8, 106, 2021)])
+
+    run("2026-02-27", files_glob="*.csv", workers=2)
+
+    clean, quarantine, metrics = read_outputs(data_dir)
+    assert sorted(clean["unique_id"].tolist()) == [1, 5, 6, 8]
+    assert sorted(quarantine["unique_id"].tolist()) == [2, 4, 7]
+    m = dict(zip(metrics["metric"], metrics["value"]))
+    assert m["total_rows_read"] == 8
+    assert m["total_clean"] == 4
+
+
+def test_date_range_selects_bronze_drops(data_dir, bronze_file):
+    folder = bronze_file.parent
+    write_drop(folder, "20240104", [(6, 104, 2019)])
+    write_drop(folder, "20240105", [(8, 106, 2021)])
+
+    run("2026-02-27", from_date=date(2024, 1, 4), to_date=date(2024, 1, 4))
+
+    clean, _, _ = read_outputs(data_dir)
+    assert clean["unique_id"].tolist() == [6]
+
+
+def test_run_replaces_only_its_run_date_partition(data_dir, bronze_file):
+    run("2026-02-26")
+    run("2026-02-27")
+
+    silver_dir = data_dir / "silver" / "vehicles" / "v1"
+    assert sorted(p.name for p in silver_dir.iterdir()) == ["run_date=2026-02-26", "run_date=2026-02-27"]
+
+
+def test_failed_run_keeps_previous_outputs(data_dir, bronze_file, monkeypatch):
+    import src.silver.vehicles.v1.run as run_module
+
+    run("2026-02-27")
+    before, _, _ = read_outputs(data_dir)
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("dq failed")
+
+    monkeypatch.setattr(run_module, "apply_quality_rules_vehicles", boom)
+    with pytest.raises(RuntimeError):
+        run("2026-02-27")
+
+    after, _, _ = read_outputs(data_dir)
+    pd.testing.assert_frame_equal(after, before)
+    silver_dir = data_dir / "silver" / "vehicles" / "v1"
+    assert not [p for p in silver_dir.iterdir() if p.name.startswith("_")]
+
+
+def test_failed_quarantine_write_publishes_nothing(data_dir, bronze_file, monkeypatch):
+    import src.silver.vehicles.v1.run as run_module
+
+    run("2026-02-27")
+    before, quarantine_before, _ = read_outputs(data_dir)
+    metrics_file = data_dir / "metrics" / "silver" / "vehicles" / "v1" / "run_date=2026-02-27" / "metrics.csv"
+    metrics_before = metrics_file.read_text(encoding="utf-8")
+
+    real_write = run_module.ParquetAppendWriter.write
+
+    def write(self, batch):
+        if "quarantine" in str(self.file_path):
+            raise OSError("quarantine sink failed")
+        real_write(self, batch)
+
+    monkeypatch.setattr(run_module.ParquetAppendWriter, "write", write)
+    with pytest.raises(OSError, match="quarantine sink failed"):
+        run("2026-02-27")
+
+    after, quarantine_after, _ = read_outputs(data_dir)
+    pd.testing.assert_frame_equal(after, before)
+    pd.testing.assert_frame_equal(quarantine_after, quarantine_before)
+    assert metrics_file.read_text(encoding="utf-8") == metrics_before
+    for root in ("silver", "silver_quarantine", "metrics/silver"):
+        parent = data_dir / root / "vehicles" / "v1"
+        assert not [p for p in parent.iterdir() if p.name.startswith("_")]
+
+
+def test_run_writes_requested_compression(data_dir, bronze_file):
+    import pyarrow.parquet as pq
+
+    run("2026-02-27", compression="zstd", row_group_size=1)
+
+    part = next((data_dir / "silver" / "vehicles" / "v1" / "run_date=2026-02-27").glob("*.parquet"))
+    meta = pq.ParquetFile(part).metadata
+    assert meta.row_group(0).column(0).compression == "ZSTD"
+    assert meta.num_row_groups == 2
+
+
+def test_run_writes_stage_metrics_next_to_dq_metrics(data_dir, bronze_file):
+    run("2026-02-27", chunk_size=2)
+
+    stages = pd.read_csv(
+        data_dir / "metrics" / "silver" / "vehicles" / "v1" / "run_date=2026-02-27" / "stages.csv"
+    ).set_index("stage")
+
+    assert {"discover", "parse", "prepare", "dq", "write", "publish", "metrics"} <= set(stages.index)
+    assert stages.loc["dq", "rows"] == 5
+    assert stages.loc["prepare", "calls"] == 3
+    assert stages.loc["write", "bytes_written"] > 0
+
+
+def test_run_stores_categories_and_persists_vocabulary(data_dir, bronze_file):
+    run("2026-02-27")
+
+    part = next((data_dir / "silver" / "vehicles" / "v1" / "run_date=2026-02-27").glob("*.parquet"))
+    schema = pq.read_schema(part)
+    assert str(schema.field("vehicle_type").type) == "dictionary<values=string, indices=int32, ordered=0>"
+    assert str(schema.field("vehicle_make").type) == "dictionary<values=string, indices=int32, ordered=0>"
+
+    vocab = json.loads(
+        (data_dir / "manifests" / "silver" / "vehicles" / "v1" / "vocabulary.json").read_text(encoding="utf-8")
+    )
+    assert vocab["columns"]["vehicle_type"] == {"bike": "bike", "pick-up truck": "pick-up truck", "sedan": "sedan"}
+    assert vocab["columns"]["vehicle_make"] == {"ford": "ford", "honda": "honda", "toyota": "toyota"}
+
+
+def test_cached_run_matches_uncached_run(data_dir, bronze_file):
+    run("2026-02-27")
+    expected_clean, expected_quarantine, _ = read_outputs(data_dir)
+
+    run("2026-02-27", cache=True)
+    run("2026-02-27", cache=True, dry_run=True)
+    run("2026-02-27", cache=True)
+    clean, quarantine, _ = read_outputs(data_dir)
+
+    assert len(list((data_dir / "cache" / "bronze" / "vehicles" / "full").glob("*.arrow"))) == 1
+    pd.testing.assert_frame_equal(clean, expected_clean, check_categorical=False)
+    pd.testing.assert_frame_equal(quarantine, expected_quarantine, check_categorical=False)
+
+
+def test_run_appends_to_metrics_store(data_dir, bronze_file):
+    run("2026-02-27")
+    run("2026-02-28")
+    run("2026-02-28")
+
+    series = metric_series(data_dir / "metrics" / "metrics.sqlite", "vehicles", "v1", "total_discard")
+    assert series.to_dict() == {"2026-02-27": 1, "2026-02-28": 1}
+
+
+def test_chunked_dedup_run_matches_full_run(data_dir):
+    folder = data_dir / "bronze" / "vehicles" / "full"
+    folder.mkdir(parents=True)
+    (folder / "vehicles_raw_20240103.csv").write_text(
+        "UNIQUE_ID,COLLISION_ID,VEHICLE_TYPE,VEHICLE_MAKE,VEHICLE_YEAR\n"
+        "5,,Sedan,FORD,2010\n5,10,Sedan,FORD,2010\n6,11,Sedan,KIA,1800\n6,12,Sedan,KIA,2011\n6,13,Sedan,KIA,2012\n",
+        encoding="utf-8",
+    )
+
+    outputs = []
+    for chunk_size in (None, 1):
+        run("2026-02-27", dedup=True, chunk_size=chunk_size)
+        clean, quarantine, metrics = read_outputs(data_dir)
+        outputs.append((
+            sorted(zip(clean["unique_id"], clean["collision_id"])),
+            sorted(zip(quarantine["unique_id"], quarantine["collision_id"])),
+            dict(zip(metrics["metric"], metrics["value"])),
+        ))
+
+    assert outputs[0] == outputs[1]
+    assert outputs[0][0] == [(5, "10"), (6, "12")]
+    assert outputs[0][1] == [(6, "11")]
+    assert outputs[0][2]["total_discard"] == 2
+
+
+def test_dedup_discards_ids_loaded_on_other_run_dates(data_dir, bronze_file):
+    run("2026-02-26")  # loaded before --dedup existed: indexed on the next dedup run
+    run("2026-02-27", dedup=True)
+
+    _, quarantine, metrics = read_outputs(data_dir)
+    m = dict(zip(metrics["metric"], metrics["value"]))
+    assert m["total_clean"] == 0
+    assert m["total_discard"] == 3
+    assert sorted(quarantine["unique_id"].tolist()) == [2, 4]
+
+    shards = sorted(p.name for p in (data_dir / "indexes" / "silver" / "vehicles" / "v1" / "unique_id").iterdir())
+    assert shards == ["run_date=2026-02-26.npy", "run_date=2026-02-27.npy"]
+
+
+def test_dedup_rerun_of_same_run_date_keeps_its_rows(data_dir, bronze_file):
+    run("2026-02-27", dedup=True)
+    run("2026-02-27", dedup=True)
+
+    clean, _, metrics = read_outputs(data_dir)
+    assert sorted(clean["unique_id"].tolist()) == [1, 5]
+    m = dict(zip(metrics["metric"], metrics["value"]))
+    assert m["total_discard"] == 1
+
+
+def test_non_dedup_rerun_does_not_leave_a_stale_shard(data_dir, bronze_file):
+    run("2026-02-26", dedup=True)  # shard of 2026-02-26 holds ids 1 and 5
+    header = BRONZE_CSV.split("\n", 1)[0]
+    bronze_file.write_text(f"{header}\n6,104,01/04/2024,Sedan,KIA,2019\n", encoding="utf-8")
+    run("2026-02-26")  # 2026-02-26 now only holds id 6
+
+    bronze_file.write_text(BRONZE_CSV + "6,104,01/04/2024,Sedan,KIA,2019\n", encoding="utf-8")
+    run("2026-02-27", dedup=True)
+
+    clean, _, _ = read_outputs(data_dir)
+    assert sorted(clean.loc[clean["run_date"] == "2026-02-27", "unique_id"].tolist()) == [1, 5]
+
+
+def test_check_collisions_requires_crashes_index(data_dir, bronze_file):
+    with pytest.raises(FileNotFoundError):
+        run("2026-02-27", check_collisions=True)
+
+    assert not (data_dir / "silver" / "vehicles").exists()
+
+
+def test_check_collisions_quarantines_orphans(data_dir, bronze_file):
+    IdIndex(silver_id_index_path("crashes", "v1", "collision_id")).write_shard("2026-02-27", np.array([100, 101, 102]))
+
+    run("2026-02-27", check_collisions=True)
+
+    clean, quarantine, metrics = read_outputs(data_dir)
+    assert clean["unique_id"].tolist() == [1]
+    assert 5 in quarantine["unique_id"].tolist()
+    reasons = dict(zip(metrics["reason"], metrics["count"]))
+    assert reasons["orphan_collision_id"] == 1
+
+
+def test_dry_run_previews_from_a_sample_unless_full_scan(data_dir, bronze_file, capsys):
+    run("2026-02-27", dry_run=True)
+    preview = capsys.readouterr().out
+    assert "DQ preview: 5 sampled rows of ~5" in preview
+    assert "invalid_vehicle_year_range" in preview
+    assert not (data_dir / "silver").exists()
+
+    run("2026-02-27", dry_run=True, full_scan=True)
+    full = capsys.readouterr().out
+    assert "DQ preview" not in full and "DQ summary:" in full
+    assert not (data_dir / "silver").exists()
+
+
+@pytest.mark.parametrize("option", ["dedup", "check_collisions"])
+def test_sampled_dry_run_rejects_rules_it_cannot_estimate(data_dir, bronze_file, option):
+    with pytest.raises(ValueError, match="--full-scan"):
+        run("2026-02-27", dry_run=True, **{option: True})
+
+    run("2026-02-27", dry_run=True, full_scan=True, dedup=True)
+    assert not (data_dir / "silver").exists()
+
+
+def test_clean_rows_are_sorted_per_batch_and_support_lookups(data_dir, bronze_file):
+    from src.silver.vehicles.v1.lookup import vehicles_for_collision
+
+    run("2026-02-27", sort_by=("unique_id",))
+    run("2026-02-28")
+
+    part = next((data_dir / "silver" / "vehicles" / "v1" / "run_date=2026-02-28").glob("*.parquet"))
+    assert pq.ParquetFile(part).metadata.row_group(0).sorting_columns is not None
+    assert pq.read_table(part).column("collision_id").to_pylist() == ["100", "103"]
+
+    result = vehicles_for_collision(103, columns=["unique_id"])
+    assert result.rows.to_dict("records") == [
+        {"unique_id": 5, "run_date": "2026-02-27"},
+        {"unique_id": 5, "run_date": "2026-02-28"},
+    ]
+
+
+def test_unknown_sort_column_is_rejected(data_dir, bronze_file):
+    with pytest.raises(ValueError, match="Unknown sort column"):
+        run("2026-02-27", sort_by=("crash_date",))
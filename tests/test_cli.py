@@ -0,0 +1,76 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from src import pipelines
+from src.cli import app
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("pandas", "pyarrow", "numpy", "src.silver.vehicles.v1.run")
+
+
+def _python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def test_importing_cli_does_not_load_heavy_modules():
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import src.cli\n"
+        "print(time.perf_counter() - start)\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    elapsed, loaded = _python(code).stdout.splitlines()
+
+    assert loaded == ""
+    # Typer alone imports in well under a second; pandas + pyarrow add ~0.5s+.
+    assert float(elapsed) < 1.0
+
+
+def test_help_runs_without_loading_pipelines():
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "src.cli", "silver", "run", "--help"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0
+    assert "--dataset" in result.stdout
+    assert time.perf_counter() - start < 5.0
+
+
+def test_unknown_pipeline_is_rejected():
+    result = CliRunner().invoke(app, ["silver", "run", "--dataset", "nope"])
+
+    assert result.exit_code != 0
+    assert "silver/nope/v1" in result.output
+
+
+def test_registry_resolves_lazily():
+    assert pipelines.available("silver") == ["silver/crashes/v1", "silver/vehicles/v1"]
+    assert pipelines.available("gold") == ["gold/vehicles/v1"]
+
+    run = pipelines.load_pipeline(pipelines.pipeline_key("silver", "vehicles", "v1"))
+
+    from src.silver.vehicles.v1.run import run as expected
+    assert run is expected
+
+    with pytest.raises(KeyError, match="silver/nope/v1"):
+        pipelines.load_pipeline("silver/nope/v1")
+
+
+def test_option_unsupported_by_pipeline_is_rejected():
+    result = CliRunner().invoke(app, ["silver", "run", "--dataset", "crashes", "--dedup"])
+
+    assert result.exit_code != 0
+    assert "--dedup" in result.output
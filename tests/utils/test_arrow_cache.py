@@ -0,0 +1,68 @@
+import os
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+
+from src.utils.arrow_cache import ArrowCache
+
+SCHEMA = pa.schema([("x", pa.string())])
+
+
+def put(cache: ArrowCache, key: str, rows: int) -> Path:
+    with cache.writer(key, SCHEMA) as writer:
+        writer.write_batch(pa.record_batch([pa.array(["v" * 100] * rows)], schema=SCHEMA))
+    return cache.entry_path(key)
+
+
+def set_mtime(path: Path, seconds: int) -> None:
+    os.utime(path, (seconds, seconds))
+
+
+def test_round_trip_is_memory_mapped(tmp_path: Path):
+    cache = ArrowCache(tmp_path, max_bytes=1 << 30)
+    put(cache, "a", 10)
+
+    reader = cache.open("a")
+
+    assert reader.read_all().column("x").to_pylist() == ["v" * 100] * 10
+    assert cache.open("missing") is None
+
+
+def test_key_changes_with_content_and_contract(tmp_path: Path):
+    f = tmp_path / "bronze.csv"
+    f.write_text("a\n1\n", encoding="utf-8")
+    cache = ArrowCache(tmp_path / "cache", max_bytes=1 << 30)
+
+    key = cache.key(f, {"columns": ["a"]})
+    assert cache.key(f, {"columns": ["a"]}) == key
+    assert cache.key(f, {"columns": ["b"]}) != key
+
+    f.write_text("a\n2\n", encoding="utf-8")
+    assert cache.key(f, {"columns": ["a"]}) != key
+
+
+def test_evicts_least_recently_used_first(tmp_path: Path):
+    cache = ArrowCache(tmp_path, max_bytes=1 << 30)
+    a = put(cache, "a", 100)
+    b = put(cache, "b", 100)
+    set_mtime(a, 1_000)
+    set_mtime(b, 2_000)
+    cache.open("a")  # a hit makes "a" the most recently used
+
+    cache.max_bytes = a.stat().st_size + b.stat().st_size
+    c = put(cache, "c", 100)
+
+    assert a.exists() and c.exists()
+    assert not b.exists()
+
+
+def test_failed_write_leaves_no_entry(tmp_path: Path):
+    cache = ArrowCache(tmp_path, max_bytes=1 << 30)
+
+    with pytest.raises(RuntimeError):
+        with cache.writer("a", SCHEMA):
+            raise RuntimeError("boom")
+
+    assert cache.open("a") is None
+    assert list(tmp_path.iterdir()) == []
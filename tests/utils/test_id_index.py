@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import numpy as np
+
+from src.utils.id_index import IdIndex
+
+
+def test_contains_checks_every_shard_but_the_excluded_one(tmp_path: Path):
+    IdIndex(tmp_path).write_shard("2026-02-01", np.array([5, 1, 3, 3]))
+    IdIndex(tmp_path).write_shard("2026-02-02", np.array([10]))
+
+    index = IdIndex(tmp_path, exclude="2026-02-02")
+
+    assert index.contains(np.array([1, 2, 3, 10, 11])).tolist() == [True, False, True, False, False]
+    assert np.load(index.shard_path("2026-02-01")).tolist() == [1, 3, 5]
+
+
+def test_added_ids_are_found_but_not_persisted(tmp_path: Path):
+    index = IdIndex(tmp_path)
+    index.add(np.array([7, 2]))
+    index.add(np.array([4]))
+
+    assert index.contains(np.array([2, 4, 7, 8])).tolist() == [True, True, True, False]
+    assert IdIndex(tmp_path).shards() == {}
+
+
+def test_ids_added_in_many_batches_stay_in_few_sorted_runs(tmp_path: Path):
+    rng = np.random.default_rng(0)
+    index = IdIndex(tmp_path)
+    batches = [rng.integers(0, 10**12, 1_000) for _ in range(64)]
+    for batch in batches:
+        index.add(batch)
+
+    # Log-structured: O(log n) runs, each sorted and distinct.
+    assert len(index._pending) <= 7
+    assert all((np.diff(run) > 0).all() for run in index._pending)
+    everything = np.concatenate(batches)
+    assert index.contains(everything).all()
+    assert not index.contains(np.setdiff1d(rng.integers(0, 10**12, 1_000), everything)).any()
+
+
+def test_write_and_drop_shard_refresh_lookups(tmp_path: Path):
+    index = IdIndex(tmp_path)
+    assert not index.contains(np.array([1]))[0]
+
+    index.write_shard("2026-02-01", np.array([1]))
+    assert index.contains(np.array([1]))[0]
+
+    index.drop_shard("2026-02-01")
+    assert not index.contains(np.array([1]))[0]
+    assert index.shards() == {}
+
+
+def test_empty_shard(tmp_path: Path):
+    index = IdIndex(tmp_path)
+    index.write_shard("2026-02-01", np.array([], dtype=np.int64))
+
+    assert index.contains(np.array([0, 1])).tolist() == [False, False]
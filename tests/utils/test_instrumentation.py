@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+import src.utils.instrumentation as instrumentation
+from src.utils.instrumentation import STAGE_COLUMNS, Instrumentation, profiled
+
+
+def test_stage_accumulates_calls_rows_and_seconds():
+    instr = Instrumentation()
+
+    for _ in range(3):
+        with instr.stage("parse", rows=10):
+            pass
+    with instr.stage("write") as rec:
+        rec.bytes_written += 123
+
+    df = instr.to_frame("2026-02-27").set_index("stage")
+
+    assert list(instr.to_frame("2026-02-27").columns) == STAGE_COLUMNS
+    assert df.loc["parse", "calls"] == 3
+    assert df.loc["parse", "rows"] == 30
+    assert df.loc["parse", "seconds"] >= 0
+    assert df.loc["write", "bytes_written"] == 123
+    assert pd.isna(df.loc["write", "tracemalloc_peak_mb"])
+
+
+def test_stage_records_time_even_when_block_raises():
+    instr = Instrumentation()
+
+    try:
+        with instr.stage("dq"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert instr.records["dq"].calls == 1
+
+
+def test_trace_memory_records_tracemalloc_peak():
+    instr = Instrumentation(trace_memory=True)
+
+    with instr.stage("alloc"):
+        data = [0] * 1_000_000
+    del data
+
+    assert instr.records["alloc"].tracemalloc_peak_mb > 1
+
+
+def test_merge_sums_worker_stages():
+    worker = Instrumentation()
+    with worker.stage("dq", rows=5):
+        pass
+    main = Instrumentation()
+    with main.stage("dq", rows=2):
+        pass
+
+    main.merge(worker.to_frame("2026-02-27"))
+
+    assert main.records["dq"].rows == 7
+    assert main.records["dq"].calls == 2
+
+
+def test_profiled_dumps_stats(data_dir, tmp_path):
+    with profiled("unit"):
+        sum(range(1000))
+
+    assert (tmp_path / "logs" / "profiles" / "unit.prof").exists()
+
+
+@pytest.mark.skipif(instrumentation.resource is None, reason="resource is not available")
+@pytest.mark.parametrize("platform, maxrss", [("linux", 512 * 1024), ("darwin", 512 * 1024 * 1024)])
+def test_peak_rss_is_reported_in_mb_on_every_platform(monkeypatch, platform, maxrss):
+    class Usage:
+        ru_maxrss = maxrss
+
+    monkeypatch.setattr(instrumentation.sys, "platform", platform)
+    monkeypatch.setattr(instrumentation.resource, "getrusage", lambda who: Usage())
+
+    assert instrumentation._peak_rss_mb() == 512
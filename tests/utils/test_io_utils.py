@@ -1,4 +1,5 @@
 import time
+from datetime import date
 from pathlib import Path
 
 import pandas as pd
@@ -6,31 +7,21 @@ import pytest
 
 
 from src.utils.io_utils import (
-    find_latest_csv,
     _assert_columns_exist,
+    _atomic_write_json,
+    _commit_dirs,
+    _filter_file_dates,
     _normalize_time_to_hhmm,
+    _prefetch,
+    _sample_csv,
     _rmtree_force,
-    _write_parquet_overwrite,
+    _run_concurrently,
+    _swap_dir,
+    ParquetAppendWriter,
+    PANDAS_NA_VALUES,
 )
 
 
-def test_find_latest_csv_raises_when_none(tmp_path: Path):
-    with pytest.raises(FileNotFoundError):
-        find_latest_csv(tmp_path)
-
-
-def test_find_latest_csv_returns_most_recent(tmp_path: Path):
-    f1 = tmp_path / "a.csv"
-    f2 = tmp_path / "b.csv"
-
-    f1.write_text("x\n1\n", encoding="utf-8")
-    time.sleep(0.02)
-    f2.write_text("x\n2\n", encoding="utf-8")
-
-    latest = find_latest_csv(tmp_path)
-    assert latest.name == "b.csv"
-
-
 def test_assert_columns_exist_ok():
     df = pd.DataFrame({"a": [1], "b": [2]})
     _assert_columns_exist(df, ["a", "b"])
@@ -66,6 +57,38 @@ def test_normalize_time_to_hhmm_invalid_formats_become_na():
     assert out.isna().all()
 
 
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("0012:05", "12:05"),
+        ("000:00", "00:00"),
+        ("123:00", None),
+        ("23:59:59", "23:59:59"),
+        ("23:59:60", None),
+        ("1: 2", None),
+        ("1:2:", None),
+        ("1:2:3:4", None),
+        ("\t09:30\t", "09:30"),
+    ],
+)
+def test_normalize_time_to_hhmm_edge_cases(value, expected):
+    out = _normalize_time_to_hhmm(pd.Series([value]))
+
+    if expected is None:
+        assert out.isna().all()
+    else:
+        assert out.tolist() == [expected]
+
+
+def test_normalize_time_to_hhmm_keeps_index_and_stringifies_non_strings():
+    s = pd.Series([1234, "7:5"], index=[10, 20], dtype=object)
+    out = _normalize_time_to_hhmm(s)
+
+    assert out.index.tolist() == [10, 20]
+    assert out.isna().tolist() == [True, False]
+    assert out[20] == "07:05"
+
+
 def test_rmtree_force_removes_directory(tmp_path: Path):
     d = tmp_path / "to_delete"
     d.mkdir()
@@ -76,56 +99,207 @@ def test_rmtree_force_removes_directory(tmp_path: Path):
     assert not d.exists()
 
 
-def test_write_parquet_overwrite_creates_single_file_when_no_partitions(tmp_path: Path):
-    out_dir = tmp_path / "out_parquet"
-    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+def test_parquet_append_writer_streams_batches_into_one_file(tmp_path: Path):
+    out_file = tmp_path / "part" / "part-0.parquet"
+    writer = ParquetAppendWriter(out_file, drop_columns=["run_date"])
 
-    _write_parquet_overwrite(out_dir, df, partition_cols=None)
+    writer.write(pd.DataFrame({"a": [1, 2], "run_date": ["d", "d"]}))
+    writer.write(pd.DataFrame({"a": [3], "run_date": ["d"]}))
+    writer.close()
 
-    assert out_dir.exists()
-    assert (out_dir / "data.parquet").exists()
+    back = pd.read_parquet(out_file)
+    assert back["a"].tolist() == [1, 2, 3]
+    assert "run_date" not in back.columns
+    assert writer.rows_written == 3
 
-    back = pd.read_parquet(out_dir / "data.parquet")
-    pd.testing.assert_frame_equal(back, df)
 
+def test_filter_file_dates_keeps_dated_files_in_range():
+    files = [Path(n) for n in ["notes.csv", "vehicles_raw_20240101.csv", "vehicles_raw_20240105.csv"]]
 
-def test_write_parquet_overwrite_overwrites_existing_directory(tmp_path: Path):
-    out_dir = tmp_path / "out_parquet"
-    out_dir.mkdir()
-    (out_dir / "old.txt").write_text("old", encoding="utf-8")
+    assert _filter_file_dates(files) == files
+    selected = _filter_file_dates(files, start=date(2024, 1, 2), end=date(2024, 1, 31))
+    assert [f.name for f in selected] == ["vehicles_raw_20240105.csv"]
 
-    df = pd.DataFrame({"a": [1]})
-    _write_parquet_overwrite(out_dir, df)
 
-    assert not (out_dir / "old.txt").exists()
-    assert (out_dir / "data.parquet").exists()
+def test_parquet_append_writer_rejects_unknown_compression(tmp_path: Path):
+    with pytest.raises(ValueError, match="Unknown Parquet compression"):
+        ParquetAppendWriter(tmp_path / "x.parquet", compression="lz5")
 
 
-def test_write_parquet_overwrite_if_path_is_file(tmp_path: Path):
-    out_path = tmp_path / "out_parquet"
-    out_path.write_text("i am a file", encoding="utf-8")
-    assert out_path.is_file()
+def test_rmtree_force_removes_read_only_files(tmp_path: Path):
+    d = tmp_path / "ro"
+    d.mkdir()
+    f = d / "x.txt"
+    f.write_text("hi", encoding="utf-8")
+    f.chmod(0o444)
+    d.chmod(0o555)
 
-    df = pd.DataFrame({"a": [1]})
-    _write_parquet_overwrite(out_path, df)
+    try:
+        _rmtree_force(d)
+    finally:
+        if d.exists():
+            d.chmod(0o755)
 
-    assert out_path.is_dir()
-    assert (out_path / "data.parquet").exists()
+    assert not d.exists()
 
 
-@pytest.mark.skipif(
-    pytest.importorskip("pyarrow") is None, reason="pyarrow not installed"
-)
-def test_write_parquet_overwrite_with_partitions_creates_partition_dirs(tmp_path: Path):
-    out_dir = tmp_path / "out_part"
-    df = pd.DataFrame(
-        {
-            "state": ["PR", "PR", "SP"],
-            "value": [1, 2, 3],
-        }
-    )
-
-    _write_parquet_overwrite(out_dir, df, partition_cols=["state"])
-
-    assert out_dir.exists()
-    assert any(p.is_dir() and p.name.startswith("state=") for p in out_dir.iterdir())
\ No newline at end of file
+def test_swap_dir_replaces_target(tmp_path: Path):
+    target = tmp_path / "target"
+    target.mkdir()
+    (target / "old.txt").write_text("old", encoding="utf-8")
+    staged = tmp_path / "staged"
+    staged.mkdir()
+    (staged / "new.txt").write_text("new", encoding="utf-8")
+
+    _swap_dir(staged, target)
+
+    assert [p.name for p in target.iterdir()] == ["new.txt"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["target"]
+
+
+def test_commit_dirs_restores_every_target_when_a_rename_fails(tmp_path: Path, monkeypatch):
+    import os
+    import src.utils.io_utils as io_module
+
+    pairs = []
+    for name in ("clean", "quarantine"):
+        target = tmp_path / name
+        target.mkdir()
+        (target / "old.txt").write_text("old", encoding="utf-8")
+        staged = tmp_path / f"_staging-{name}"
+        staged.mkdir()
+        (staged / "new.txt").write_text("new", encoding="utf-8")
+        pairs.append((staged, target))
+
+    real_replace = os.replace
+
+    def failing_replace(src, dst):
+        if Path(src) == pairs[1][0]:
+            raise OSError("disk full")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(io_module.os, "replace", failing_replace)
+    with pytest.raises(OSError, match="disk full"):
+        _commit_dirs(pairs)
+    monkeypatch.setattr(io_module.os, "replace", real_replace)
+
+    for staged, target in pairs:
+        assert [p.name for p in target.iterdir()] == ["old.txt"]
+        assert [p.name for p in staged.iterdir()] == ["new.txt"]
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith("_old-")]
+
+
+def test_run_concurrently_waits_for_every_task_before_reraising():
+    from concurrent.futures import ThreadPoolExecutor
+
+    finished = []
+
+    def slow():
+        time.sleep(0.05)
+        finished.append("slow")
+
+    def fail():
+        raise ValueError("sink failed")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert _run_concurrently(pool, [lambda: 1, lambda: 2]) == [1, 2]
+        with pytest.raises(ValueError, match="sink failed"):
+            _run_concurrently(pool, [fail, slow])
+    assert finished == ["slow"]
+
+
+def test_prefetch_yields_items_in_order_and_reraises():
+    assert list(_prefetch(iter(range(5)))) == [0, 1, 2, 3, 4]
+
+    def failing():
+        yield 1
+        raise ValueError("boom")
+
+    it = _prefetch(failing())
+    assert next(it) == 1
+    with pytest.raises(ValueError, match="boom"):
+        next(it)
+
+
+def test_prefetch_stops_producer_when_closed_early():
+    produced = []
+
+    def numbers():
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    it = _prefetch(numbers(), depth=1)
+    assert next(it) == 0
+    it.close()
+
+    assert len(produced) <= 3
+
+
+def test_sample_csv_reads_small_files_whole(tmp_path: Path):
+    path = tmp_path / "small.csv"
+    path.write_text("A,B,C\n1,x,7\n2,y,8\n3,z,9", encoding="utf-8")
+
+    sample, rows = _sample_csv(path, 2, ["A", "C"])
+
+    assert rows == 3
+    assert sample["A"].tolist() == ["1", "2", "3"]
+    assert list(sample.columns) == ["A", "C"]
+
+
+def test_sample_csv_draws_distinct_rows_and_estimates_row_count(tmp_path: Path):
+    path = tmp_path / "big.csv"
+    path.write_text("ID,NAME\n" + "".join(f"{i},name-{i % 7}\n" for i in range(50_000)), encoding="utf-8")
+
+    sample, rows = _sample_csv(path, 1_000, ["ID", "NAME"], seed=1, full_read_bytes=0)
+
+    ids = sample["ID"].astype(int)
+    assert 900 <= len(sample) <= 1_000
+    assert ids.is_unique and ids.between(0, 49_999).all()
+    assert abs(rows - 50_000) / 50_000 < 0.05
+
+
+def test_sample_csv_checks_header(tmp_path: Path):
+    path = tmp_path / "bad.csv"
+    path.write_text("A,B\n1,2\n", encoding="utf-8")
+
+    with pytest.raises(KeyError, match="Missing required columns"):
+        _sample_csv(path, 10, ["A", "Z"])
+
+
+def test_parquet_append_writer_sorts_batches_and_writes_bloom_filters(tmp_path: Path):
+    import pyarrow.parquet as pq
+
+    path = tmp_path / "part.parquet"
+    writer = ParquetAppendWriter(path, row_group_size=2, sort_by=["id"], bloom_filter_columns=["id"])
+    writer.write(pd.DataFrame({"id": pd.array([3, None, 1, 2], dtype="Int64"), "v": list("abcd")}))
+    writer.close()
+
+    pf = pq.ParquetFile(path)
+    assert pf.read().column("id").to_pylist() == [1, 2, 3, None]
+    row_group = pf.metadata.row_group(0)
+    assert row_group.sorting_columns[0].column_index == 0
+    assert (row_group.column(0).statistics.min, row_group.column(0).statistics.max) == (1, 2)
+    assert row_group.column(0).bloom_filter_offset is not None
+    assert row_group.column(1).bloom_filter_offset is None
+
+
+def test_arrow_na_values_match_pandas_defaults():
+    from pandas._libs.parsers import STR_NA_VALUES
+
+    assert set(PANDAS_NA_VALUES) == set(STR_NA_VALUES)
+
+
+def test_atomic_write_json_replaces_file_and_keeps_it_on_failure(tmp_path: Path):
+    import json
+
+    path = tmp_path / "state" / "manifest.json"
+    _atomic_write_json(path, {"files": [1]})
+    _atomic_write_json(path, {"files": [1, 2]})
+    assert json.loads(path.read_text(encoding="utf-8")) == {"files": [1, 2]}
+
+    with pytest.raises(TypeError):
+        _atomic_write_json(path, {"files": object()})
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"files": [1, 2]}
+    assert [p.name for p in path.parent.iterdir()] == ["manifest.json"]
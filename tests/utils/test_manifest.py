@@ -0,0 +1,157 @@
+import os
+from pathlib import Path
+
+from datetime import date
+
+import pytest
+
+from src.utils.manifest import BronzeCatalog, BronzeManifest, PartitionManifest
+
+
+def write_csv(path: Path, text: str) -> Path:
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_new_file_is_pending(tmp_path: Path):
+    f = write_csv(tmp_path / "a.csv", "x\n1\n")
+    manifest = BronzeManifest.load(tmp_path / "manifest.json")
+
+    assert manifest.pending_files([f]) == [f]
+
+
+def test_recorded_file_is_not_pending_after_reload(tmp_path: Path):
+    f = write_csv(tmp_path / "a.csv", "x\n1\n")
+    manifest = BronzeManifest.load(tmp_path / "manifest.json")
+    manifest.record(f, row_count=1, run_date="2026-02-27")
+    manifest.save()
+
+    reloaded = BronzeManifest.load(tmp_path / "manifest.json")
+    assert reloaded.pending_files([f]) == []
+    assert reloaded.entries[str(f)].row_count == 1
+    assert reloaded.files_for_run_date([f], "2026-02-27") == [f]
+
+
+def test_changed_content_is_pending(tmp_path: Path):
+    f = write_csv(tmp_path / "a.csv", "x\n1\n")
+    manifest = BronzeManifest.load(tmp_path / "manifest.json")
+    manifest.record(f, row_count=1, run_date="2026-02-27")
+
+    write_csv(f, "x\n1\n2\n")
+
+    assert manifest.is_pending(f)
+
+
+def test_touched_but_identical_file_is_not_pending(tmp_path: Path):
+    f = write_csv(tmp_path / "a.csv", "x\n1\n")
+    manifest = BronzeManifest.load(tmp_path / "manifest.json")
+    manifest.record(f, row_count=1, run_date="2026-02-27")
+
+    st = f.stat()
+    os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+    assert not manifest.is_pending(f)
+    assert manifest.entries[str(f)].mtime_ns == f.stat().st_mtime_ns
+
+
+def test_partition_manifest_tracks_new_changed_and_removed(tmp_path: Path):
+    a = tmp_path / "run_date=2026-02-27"
+    a.mkdir()
+    write_csv(a / "part-0.parquet", "x")
+    manifest = PartitionManifest.load(tmp_path / "partitions.json")
+
+    pending = manifest.pending({"2026-02-27": a})
+    assert list(pending) == ["2026-02-27"]
+    manifest.record("2026-02-27", pending["2026-02-27"])
+
+    manifest.merge = "sum"
+    manifest.save()
+
+    reloaded = PartitionManifest.load(tmp_path / "partitions.json")
+    assert reloaded.pending({"2026-02-27": a}) == {}
+    assert reloaded.merge == "sum"
+
+    write_csv(a / "part-0.parquet", "xy")
+    assert list(reloaded.pending({"2026-02-27": a})) == ["2026-02-27"]
+    assert reloaded.removed({}) == ["2026-02-27"]
+
+
+def age_folder(folder: Path, seconds: int = 60) -> None:
+    """Backdate the folder mtime so the catalog trusts it (outside the racy window)."""
+    st = folder.stat()
+    os.utime(folder, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_catalog_records_header_and_row_estimate(tmp_path: Path):
+    bronze = tmp_path / "bronze"
+    bronze.mkdir()
+    write_csv(bronze / "v_20240101.csv", "A,B\n1,2\n3,4\n")
+    write_csv(bronze / "notes.txt", "ignored")
+
+    catalog = BronzeCatalog.load(tmp_path / "catalog.json", bronze)
+    assert catalog.refresh()
+    catalog.save()
+
+    entry = BronzeCatalog.load(tmp_path / "catalog.json", bronze).entries["v_20240101.csv"]
+    assert entry.columns == ["A", "B"]
+    assert entry.estimated_rows == 2
+    assert entry.size == (bronze / "v_20240101.csv").stat().st_size
+
+
+def test_catalog_skips_listing_when_folder_mtime_is_unchanged(tmp_path: Path, monkeypatch):
+    import src.utils.manifest as manifest_module
+
+    bronze = tmp_path / "bronze"
+    bronze.mkdir()
+    write_csv(bronze / "v_20240101.csv", "A\n1\n")
+    age_folder(bronze)
+    catalog = BronzeCatalog.load(tmp_path / "catalog.json", bronze)
+    catalog.refresh()
+    catalog.scanned_ns = bronze.stat().st_mtime_ns + 10 * manifest_module.RACY_WINDOW_NS
+    catalog.save()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("folder should not be listed")
+
+    monkeypatch.setattr(manifest_module.os, "scandir", fail)
+    reloaded = BronzeCatalog.load(tmp_path / "catalog.json", bronze)
+    assert not reloaded.refresh()
+    assert reloaded.latest() == bronze / "v_20240101.csv"
+
+
+def test_catalog_picks_up_added_and_removed_files(tmp_path: Path):
+    bronze = tmp_path / "bronze"
+    bronze.mkdir()
+    old = write_csv(bronze / "v_20240101.csv", "A\n1\n")
+    os.utime(old, (1_000, 1_000))
+    catalog = BronzeCatalog.load(tmp_path / "catalog.json", bronze)
+    catalog.refresh()
+
+    new = write_csv(bronze / "v_20240102.csv", "A\n1\n2\n")
+    old.unlink()
+    assert catalog.refresh()
+
+    assert catalog.latest() == new
+    assert catalog.files("v_*.csv") == [new]
+    assert catalog.files(start=date(2024, 1, 3)) == []
+
+
+def test_catalog_rejects_files_missing_required_columns(tmp_path: Path):
+    bronze = tmp_path / "bronze"
+    bronze.mkdir()
+    good = write_csv(bronze / "good.csv", "A,B\n1,2\n")
+    bad = write_csv(bronze / "bad.csv", "A\n1\n")
+    catalog = BronzeCatalog.load(tmp_path / "catalog.json", bronze)
+    catalog.refresh()
+
+    catalog.check_columns([good], ["A", "B"])
+    with pytest.raises(KeyError, match=r"bad.csv: \['B'\]"):
+        catalog.check_columns([good, bad], ["A", "B"])
+
+
+def test_empty_catalog_has_no_latest_file(tmp_path: Path):
+    catalog = BronzeCatalog.load(tmp_path / "catalog.json", tmp_path / "missing")
+    catalog.refresh()
+
+    with pytest.raises(FileNotFoundError):
+        catalog.latest()
@@ -0,0 +1,44 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utils.parquet_lookup import lookup, matching_row_groups
+
+
+def write_partition(root, run_date, ids):
+    folder = root / f"run_date={run_date}"
+    folder.mkdir(parents=True)
+    table = pa.table({"collision_id": [str(i) for i in ids], "unique_id": ids})
+    pq.write_table(table, folder / "part-0.parquet", row_group_size=2)
+
+
+def test_matching_row_groups_uses_min_max(tmp_path):
+    write_partition(tmp_path, "2026-01-01", [10, 11, 20, 21, 30, 31])
+    metadata = pq.ParquetFile(tmp_path / "run_date=2026-01-01" / "part-0.parquet").metadata
+
+    assert matching_row_groups(metadata, "unique_id", 21) == [1]
+    assert matching_row_groups(metadata, "collision_id", "30") == [2]
+    assert matching_row_groups(metadata, "unique_id", 25) == []
+    assert matching_row_groups(metadata, "unique_id", 99) == []
+
+
+def test_lookup_reads_only_matching_row_groups(tmp_path):
+    write_partition(tmp_path, "2026-01-01", [10, 11, 20, 21, 30, 31])
+    write_partition(tmp_path, "2026-01-02", [40, 41, 50, 51])
+
+    result = lookup(tmp_path, "collision_id", 20, columns=["unique_id"])
+
+    assert result.rows.to_dict("records") == [{"unique_id": 20, "run_date": "2026-01-01"}]
+    assert (result.row_groups_read, result.row_groups_total) == (1, 5)
+
+
+def test_lookup_can_be_limited_to_run_dates(tmp_path):
+    write_partition(tmp_path, "2026-01-01", [10, 11])
+    write_partition(tmp_path, "2026-01-02", [10, 12])
+
+    result = lookup(tmp_path, "unique_id", 10, run_dates=["2026-01-02"])
+
+    assert result.rows["run_date"].tolist() == ["2026-01-02"]
+    assert result.row_groups_total == 1
+
+    empty = lookup(tmp_path, "unique_id", 99, columns=["unique_id"])
+    assert empty.rows.empty and list(empty.rows.columns) == ["unique_id", "run_date"]
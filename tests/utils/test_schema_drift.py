@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+from src.utils.schema_drift import (
+    BREAKING,
+    COMPATIBLE,
+    REQUIRES_MAPPING,
+    SchemaFingerprint,
+    check_schema,
+)
+
+KINDS = {"ID": "integer", "TYPE": "text"}
+ALIASES = {"id": "ID", "VEHICLE TYPE": "TYPE"}
+
+
+def write_csv(path: Path, text: str) -> Path:
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_known_alias_and_reordered_columns_are_compatible(tmp_path: Path):
+    f = write_csv(tmp_path / "a.csv", "VEHICLE TYPE,EXTRA,id\nSedan,x,1\nBike,y,2\n")
+    stored = SchemaFingerprint(("ID", "TYPE"), {"ID": "integer", "TYPE": "text"})
+
+    drift = check_schema(f, KINDS, ALIASES, stored)
+
+    assert drift.level == COMPATIBLE
+    assert "ID read from 'id'" in drift.changes
+    assert "new columns ['VEHICLE TYPE', 'EXTRA', 'id']" in drift.changes
+    assert drift.fingerprint == SchemaFingerprint(("VEHICLE TYPE", "EXTRA", "id"), {"ID": "integer", "TYPE": "text"})
+    drift.raise_if_blocking()
+
+
+def test_column_renamed_in_case_or_spacing_requires_mapping(tmp_path: Path):
+    f = write_csv(tmp_path / "a.csv", "Id,Vehicle-Type\n1,Sedan\n")
+
+    drift = check_schema(f, KINDS, ALIASES)
+
+    assert drift.level == REQUIRES_MAPPING
+    assert drift.unresolved == ("ID", "TYPE")
+    with pytest.raises(KeyError, match="requires-mapping schema drift in a.csv: ID looks renamed to 'Id'"):
+        drift.raise_if_blocking()
+
+
+def test_missing_column_is_breaking(tmp_path: Path):
+    f = write_csv(tmp_path / "a.csv", "ID,COLOR\n1,red\n")
+
+    drift = check_schema(f, KINDS, ALIASES)
+
+    assert drift.level == BREAKING
+    with pytest.raises(KeyError, match="missing column TYPE"):
+        drift.raise_if_blocking()
+
+
+def test_integer_column_holding_text_is_breaking(tmp_path: Path):
+    f = write_csv(tmp_path / "a.csv", "ID,TYPE\nabc,Sedan\ndef,Bike\n7,Sedan\n")
+
+    drift = check_schema(f, KINDS, ALIASES)
+
+    assert drift.level == BREAKING
+    with pytest.raises(ValueError, match="ID no longer holds integers"):
+        drift.raise_if_blocking()
+
+
+def test_a_few_bad_integers_are_left_to_dq(tmp_path: Path):
+    f = write_csv(tmp_path / "a.csv", "ID,TYPE\n1,Sedan\n2,Bike\n,Sedan\nx,Van\n")
+
+    assert check_schema(f, KINDS, ALIASES).level == COMPATIBLE
+
+
+def test_fingerprint_round_trips(tmp_path: Path):
+    fingerprint = SchemaFingerprint(("ID", "TYPE"), {"ID": "integer", "TYPE": "text"})
+    fingerprint.save(tmp_path / "schema.json")
+
+    assert SchemaFingerprint.load(tmp_path / "schema.json") == fingerprint
+    assert SchemaFingerprint.load(tmp_path / "missing.json") is None
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pandas as pd
+
+from src.utils.vocabulary import Vocabulary, normalize_key
+
+
+def test_normalize_key_casefolds_and_collapses_whitespace():
+    assert normalize_key("  Pick-up   TRUCK ") == "pick-up truck"
+
+
+def test_canonicalize_returns_categories_and_new_keys(tmp_path: Path):
+    vocab = Vocabulary(tmp_path / "vocabulary.json", {"vehicle_type": {"4 dr sedan": "sedan"}})
+    s = pd.Series(["Sedan", "SEDAN", None, "4 Dr  Sedan", "Bike"], dtype="string")
+
+    out, new_keys = vocab.canonicalize(s, "vehicle_type")
+
+    assert out.dtype == "category"
+    assert out.tolist()[:2] == ["sedan", "sedan"]
+    assert pd.isna(out.iloc[2])
+    assert out.tolist()[3:] == ["sedan", "bike"]
+    assert list(out.cat.categories) == ["bike", "sedan"]
+    assert new_keys == ["bike", "sedan"]
+
+
+def test_canonicalize_all_missing(tmp_path: Path):
+    out, new_keys = Vocabulary(tmp_path / "v.json").canonicalize(pd.Series([None, None], dtype="string"), "c")
+
+    assert out.isna().all()
+    assert new_keys == []
+
+
+def test_update_and_save_round_trip(tmp_path: Path):
+    vocab = Vocabulary.load(tmp_path / "vocabulary.json")
+    vocab.update({"vehicle_make": ["ford", "toyota"]})
+    vocab.save()
+
+    reloaded = Vocabulary.load(tmp_path / "vocabulary.json")
+    assert reloaded.columns == {"vehicle_make": {"ford": "ford", "toyota": "toyota"}}
+    _, new_keys = reloaded.canonicalize(pd.Series(["FORD", "Honda"], dtype="string"), "vehicle_make")
+    assert new_keys == ["honda"]